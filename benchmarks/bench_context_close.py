@@ -0,0 +1,40 @@
+"""
+Time closing an assumptions context with many assumptions and many
+conclusions, nested inside a context that shares its assumptions.
+
+Run with `python benchmarks/bench_context_close.py [assumptions] [conclusions]`.
+"""
+
+import sys
+import time
+
+from pylogic.assumptions_context import AssumptionsContext, conclude
+from pylogic.proposition.proposition import Proposition
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    m = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    outer_props = [Proposition(f"P{i}") for i in range(n)]
+    inner_props = [Proposition(f"Q{i}") for i in range(n)]
+    with AssumptionsContext() as outer:
+        outer_assumed = [p.assume() for p in outer_props]
+        with AssumptionsContext() as inner:
+            for p in inner_props:
+                p.assume()
+            # assumptions of the outer context assumed again inside
+            for p in outer_assumed:
+                p.assume()
+            for p in outer_assumed[:m]:
+                conclude(p)
+            start = time.perf_counter()
+        print(
+            f"close context with {2 * n} assumptions and {m} conclusions: "
+            f"{time.perf_counter() - start:.4f}s"
+        )
+        assert all(p.is_assumption for p in outer_assumed)
+        assert len(inner.get_proven()) == m
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Time the methods that traverse formulas (`__str__`, `_latex`, `as_text`,
+`__hash__`, `__eq__`, `replace`, `unify` and `has_as_subproposition`) on
+formulas nested 10^4 levels deep, which used to hit the recursion limit.
+
+Run with `python benchmarks/bench_deep_formulas.py [depth]`.
+"""
+
+import sys
+import time
+
+from pylogic.proposition.and_ import And
+from pylogic.proposition.implies import Implies
+from pylogic.proposition.proposition import Proposition
+from pylogic.variable import Variable
+
+
+def nested(depth: int, x: Variable) -> Proposition:
+    # alternating conjunctions and implications, nested to the right
+    formula = Proposition("P", args=[x])
+    for i in range(depth - 1, -1, -1):
+        p = Proposition(f"P{i}", args=[x])
+        formula = Implies(p, formula) if i % 2 else And(p, formula)
+    return formula
+
+
+def bench(name: str, func, repeat: int = 3) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<28}{best:>10.4f}s")
+
+
+def main() -> None:
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    x, y = Variable("x"), Variable("y")
+    start = time.perf_counter()
+    formula = nested(depth, x)
+    other = nested(depth, y)
+    print(f"build 2 formulas of depth {depth}: {time.perf_counter() - start:.4f}s")
+
+    bench("str", lambda: str(formula))
+    bench("_latex", lambda: formula._latex())
+    bench("hash", lambda: hash(formula))
+    bench("== (equal copy)", lambda: formula == formula.copy())
+    bench("== (different)", lambda: formula == other)
+    bench("replace", lambda: formula.replace({x: y}), repeat=1)
+    bench("unify", lambda: formula.unify(other))
+    innermost = Proposition("P", args=[x])
+    bench("has_as_subproposition", lambda: formula.has_as_subproposition(innermost))
+    # the text has one line per subformula, indented by its depth, so its
+    # size is quadratic in the depth
+    shallow = nested(depth // 10, x)
+    bench(f"as_text (depth {depth // 10})", lambda: shallow.as_text())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Find the lemmas of a knowledge base that can prove a goal, with a
+`LemmaIndex` and by unifying the goal with every lemma.
+
+Run with `python benchmarks/bench_discrimination_tree.py [lemmas] [goals]`.
+"""
+
+import sys
+import time
+
+from pylogic.constant import Constant
+from pylogic.discrimination_tree import LemmaIndex, match, universal_prefix
+from pylogic.proposition.proposition import Proposition
+from pylogic.proposition.quantified.forall import ForallInSet
+from pylogic.theories.natural_numbers import Naturals
+from pylogic.variable import Variable
+
+
+def knowledge_base(size: int) -> list:
+    kb = []
+    for i in range(size):
+        x = Variable(f"x{i}")
+        p = Proposition(f"P{i % 100}", args=[x])
+        q = Proposition(f"Q{i % 500}", args=[x + i])
+        kb.append(ForallInSet(x, Naturals, p.implies(q)))
+    return kb
+
+
+def scan(kb: list, goal: Proposition) -> list:
+    found = []
+    for lemma in kb:
+        variables, body = universal_prefix(lemma)
+        if match(body.consequent, goal, variables) is not None:
+            found.append(lemma)
+    return found
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    kb = knowledge_base(size)
+    goals = [
+        Proposition(f"Q{i % 500}", args=[Constant(7) + i]) for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    index = LemmaIndex(kb)
+    print(f"index {size} lemmas: {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    indexed = [len(list(index.candidates(goal))) for goal in goals]
+    print(f"{count} goals with the index: {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    scanned = [len(scan(kb, goal)) for goal in goals]
+    print(f"{count} goals by scanning: {time.perf_counter() - start:.2f}s")
+    assert indexed == scanned, (indexed, scanned)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Share a knowledge base with a process pool through a `SharedFormulaTable`,
+and compare with pickling the knowledge base to each worker.
+
+Each job decodes a few formulas of the knowledge base. With the shared
+table, workers attach to the same memory and only decode the formulas they
+read; with pickling, every worker receives and rebuilds the whole knowledge
+base.
+
+Run with `python benchmarks/bench_formula_table.py [formulas] [processes]`.
+"""
+
+import os
+import pickle
+import sys
+import time
+from multiprocessing import Pool
+
+from pylogic.formula_table import SharedFormulaTable, init_worker, pack_formulas, worker_table
+from pylogic.proposition.proposition import Proposition
+from pylogic.proposition.quantified.forall import ForallInSet
+from pylogic.theories.natural_numbers import Naturals
+from pylogic.variable import Variable
+
+_worker_kb: list = []
+
+
+def knowledge_base(size: int) -> list[Proposition]:
+    kb: list[Proposition] = []
+    for i in range(size):
+        x = Variable(f"x{i}")
+        p = Proposition(f"P{i % 1000}", args=[x])
+        q = Proposition(f"Q{i}", args=[x + i])
+        kb.append(ForallInSet(x, Naturals, p.implies(q)))
+    return kb
+
+
+def _init_pickled(data: bytes) -> None:
+    global _worker_kb
+    _worker_kb = pickle.loads(data)
+
+
+def _job_shared(indices: list[int]) -> int:
+    table = worker_table()
+    return sum(len(str(table[i])) for i in indices)
+
+
+def _job_pickled(indices: list[int]) -> int:
+    return sum(len(str(_worker_kb[i])) for i in indices)
+
+
+def main() -> None:
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    start = time.perf_counter()
+    kb = knowledge_base(size)
+    print(f"build {size} formulas: {time.perf_counter() - start:.2f}s")
+    jobs = [[(j * 7919 + k) % size for k in range(10)] for j in range(4 * processes)]
+
+    start = time.perf_counter()
+    data = pack_formulas(kb)
+    print(f"pack: {time.perf_counter() - start:.2f}s, {len(data) / 1e6:.1f} MB")
+    start = time.perf_counter()
+    with SharedFormulaTable.create(kb) as table:
+        with Pool(processes, initializer=init_worker, initargs=(table.name,)) as pool:
+            pool.map(_job_shared, jobs)
+    print(f"shared table, {processes} workers: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    data = pickle.dumps(kb, protocol=pickle.HIGHEST_PROTOCOL)
+    with Pool(processes, initializer=_init_pickled, initargs=(data,)) as pool:
+        pool.map(_job_pickled, jobs)
+    print(
+        f"pickled knowledge base ({len(data) / 1e6:.1f} MB per worker): "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
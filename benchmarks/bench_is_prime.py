@@ -0,0 +1,73 @@
+"""
+Compare `pylogic.number_theory.is_prime` with the trial-division test that
+`pylogic.helpers.is_prime` used before.
+
+Run with `python benchmarks/bench_is_prime.py`.
+"""
+
+import random
+import time
+
+from pylogic.number_theory import factorize, is_prime
+
+
+def trial_division_is_prime(num: int) -> bool:
+    # the previous implementation of helpers.is_prime
+    if num <= 1:
+        return False
+    if num == 2:
+        return True
+    if num % 2 == 0:
+        return False
+    i = 3
+    while i < num**0.5 + 1:
+        if num % i == 0:
+            return False
+        i += 2
+    return True
+
+
+def bench(func, nums, repeat=3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for n in nums:
+            func(n)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    rng = random.Random(0)
+    cases = {
+        "n < 10^4 (10^4 numbers)": list(range(10_000)),
+        "random 32-bit (10^3 numbers)": [rng.getrandbits(32) for _ in range(1000)],
+        # trial division is too slow for these, so only a few primes are used
+        "primes near 10^12 (5 numbers)": [
+            999999999989,
+            1000000000039,
+            1000000000061,
+            1000000000063,
+            1000000000091,
+        ],
+    }
+    print(f"{'case':<32}{'trial division':>16}{'pylogic':>12}")
+    for name, nums in cases.items():
+        old = bench(trial_division_is_prime, nums, repeat=1)
+        new = bench(is_prime, nums)
+        print(f"{name:<32}{old:>15.4f}s{new:>11.4f}s")
+
+    big = [10**19 + 51, 2**64 - 59, 10**20 + 39]
+    start = time.perf_counter()
+    for n in big:
+        is_prime(n)
+    print(f"20-digit primality (3 numbers): {time.perf_counter() - start:.6f}s")
+
+    start = time.perf_counter()
+    factorize((2**31 - 1) * (2**61 - 1))
+    factorize(2**64 - 1)
+    print(f"factor two 64-92 bit composites: {time.perf_counter() - start:.6f}s")
+
+
+if __name__ == "__main__":
+    main()
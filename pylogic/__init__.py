@@ -140,8 +140,16 @@ from pylogic.structures.set_ import (
     sets,
 )
 from pylogic.syntax_helpers.if_ import If, if_
-from pylogic.theories.natural_numbers import Prime
-from pylogic.theories.numbers import Integers, Naturals, Rationals, Reals, one, zero
+from pylogic.theories.natural_numbers import Prime, one, zero
+from pylogic.theories.snapshot import load_theory_library
+
+# builds the theorems of the number sets, or loads them from a snapshot
+load_theory_library()
+
+from pylogic.theories.integers import Integers
+from pylogic.theories.natural_numbers import Naturals
+from pylogic.theories.rational_numbers import Rationals
+from pylogic.theories.real_numbers import Reals
 from pylogic.theories.real_numbers import Interval, interval
 from pylogic.variable import Variable, unbind, variables
 
@@ -1,6 +1,18 @@
+"""
+Assumptions contexts and the target to prove.
+
+The stack of open contexts and the target set with `to_prove` are stored in
+context variables (see `contextvars`), so each thread and each asyncio task
+has its own: proofs can be built concurrently in one process. A new thread
+starts with no open context and no target; an asyncio task starts with a copy
+of those of the code that created it, and contexts it opens are not seen
+outside it.
+"""
+
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, overload
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, overload
 
 if TYPE_CHECKING:
     from pylogic.proposition.proposition import Proposition
@@ -20,7 +32,10 @@ class AssumptionsContext:
         # the implications true outside the context
         self.proven_propositions: list[Proposition] = []
         self.exited = False
-        assumptions_contexts.append(self)
+        # see _assumes
+        self._assumption_ids: set[int] = set()
+        self._assumption_order: list[Proposition | Variable] = []
+        _context_stack.set(_context_stack.get() + (self,))
 
     def __repr__(self):
         return f"AssumptionsContext({self.name})" if self.name else super().__repr__()
@@ -52,83 +67,103 @@ class AssumptionsContext:
     def vars(self, *names: str, **kwargs) -> Variable | tuple[Variable]:
         return self.variables(*names, **kwargs)
 
-    def _build_proven(self, conclusion: Proposition) -> Proposition:
+    def _scopes(self) -> list[tuple[str, Any, Any]]:
         """
-        Build the proven implication or Forall proposition that is proven by closing
-        all scopes introduced in this context.
+        The scopes introduced in this context, innermost first, computed in
+        one pass over self.assumptions and shared by all conclusions.
         For example, if self.assumptions is
-        `[x, x in S, y, P(y), y in T]`, we return
-        `forall x in S: forall y: (P(y) and y in T) => conclusion`
+        `[x, x in S, y, P(y), y in T]`, the scopes are
+        `[("implies", [P(y), y in T]), ("forall", y), ("forall_in_set", x, S)]`,
+        which `_build_proven` closes around a conclusion to get
+        `forall x in S: forall y: (P(y) and y in T) => conclusion`.
 
-        self.assumptions is reversed before calling this method.
-        So we essentially loop through self.assumptions in reverse, and at each index:
+        We loop through self.assumptions in reverse, and at each index:
 
         - if the item is an IsContainedIn, check if the previous item is the corresponding
-        free variable, in which case we build a ForallInSet
+        free variable, in which case we close it with a ForallInSet
         - if the item is a proposition, use that and all propositions before the next
-        IsContainedIn/Variable to build an implication
-        - if the item is a free variable, build a Forall
+        IsContainedIn/Variable as the antecedents of an implication
+        - if the item is a free variable, close it with a Forall
         """
-        from pylogic.inference import Inference
-        from pylogic.proposition.and_ import And
-        from pylogic.proposition.contradiction import Contradiction
-        from pylogic.proposition.implies import Implies
-        from pylogic.proposition.not_ import neg
-        from pylogic.proposition.proposition import Proposition, get_assumptions
-        from pylogic.proposition.quantified.forall import Forall, ForallInSet
+        from pylogic.proposition.proposition import Proposition
         from pylogic.proposition.relation.contains import IsContainedIn
         from pylogic.variable import Variable
 
-        conclusion._set_is_proven(False)
-
+        assumptions = self.assumptions[::-1]
+        scopes: list[tuple[str, Any, Any]] = []
         i = 0
-        cons = conclusion
-
-        # for if we are building an And(...) => cons
-        current_ante: list[Proposition] = []
-
-        while i < len(self.assumptions):
-            a = self.assumptions[i]
+        while i < len(assumptions):
+            a = assumptions[i]
             if (
-                i + 1 < len(self.assumptions)
+                i + 1 < len(assumptions)
                 and (isinstance(a, IsContainedIn))
-                and a.left == self.assumptions[i + 1]
+                and a.left == assumptions[i + 1]
                 and a.left.is_bound is False
                 and len(a.left.depends_on) == 0
             ):
-                cons = ForallInSet(a.left, a.right, cons)
+                scopes.append(("forall_in_set", a.left, a.right))
                 i += 2  # skip the variable
             elif isinstance(a, Proposition):
-                current_ante.append(a)  # type: ignore
                 j = i + 1
-                while j < len(self.assumptions) and not isinstance(
-                    self.assumptions[j], (IsContainedIn, Variable)
+                while j < len(assumptions) and not isinstance(
+                    assumptions[j], (IsContainedIn, Variable)
                 ):
-                    current_ante.append(self.assumptions[j])  # type: ignore
                     j += 1
-                if len(current_ante) == 1:
-                    if isinstance(cons, Contradiction):
-                        cons = neg(current_ante[0])
-                    else:
-                        # dont de-nest, to avoid
-                        # changing a -> (b -> c) to ((a and b) -> c)
-                        cons = current_ante[0].implies(cons, de_nest=False)
-                else:
-                    current_ante.reverse()
-                    if isinstance(cons, Contradiction):
-                        cons = neg(And(*current_ante))
-                    else:
-                        cons = And(*current_ante).implies(cons, de_nest=False)
-                current_ante = []
+                # in the order they were assumed
+                scopes.append(("implies", assumptions[i:j][::-1], None))
                 i = j
             else:
                 # a is a free Variable, and we didn't skip so use Forall
                 if a.is_bound is False and len(a.depends_on) == 0:
-                    cons = Forall(a, cons)
+                    scopes.append(("forall", a, None))
                 i += 1
+        return scopes
+
+    def _build_proven(
+        self,
+        conclusion: Proposition,
+        _scopes: list[tuple[str, Any, Any]] | None = None,
+        _assumed: set | None = None,
+    ) -> Proposition:
+        """
+        Build the proven implication or Forall proposition that is proven by closing
+        all scopes introduced in this context (see `_scopes`).
+
+        `_scopes` and `_assumed` (the set of assumptions) can be passed to
+        avoid computing them again for each conclusion.
+        """
+        from pylogic.inference import Inference
+        from pylogic.proposition.and_ import And
+        from pylogic.proposition.contradiction import Contradiction
+        from pylogic.proposition.not_ import neg
+        from pylogic.proposition.proposition import get_assumptions
+        from pylogic.proposition.quantified.forall import Forall, ForallInSet
+
+        if _scopes is None:
+            _scopes = self._scopes()
+        conclusion._set_is_proven(False)
+
+        cons = conclusion
+        for kind, a, b in _scopes:
+            if kind == "forall_in_set":
+                cons = ForallInSet(a, b, cons)
+            elif kind == "forall":
+                cons = Forall(a, cons)
+            elif len(a) == 1:
+                if isinstance(cons, Contradiction):
+                    cons = neg(a[0])
+                else:
+                    # dont de-nest, to avoid
+                    # changing a -> (b -> c) to ((a and b) -> c)
+                    cons = a[0].implies(cons, de_nest=False)
+            elif isinstance(cons, Contradiction):
+                cons = neg(And(*a))
+            else:
+                cons = And(*a).implies(cons, de_nest=False)
+        stack = _context_stack.get()
         cons._set_is_proven(
             True,
-            context=assumptions_contexts[-2] if len(assumptions_contexts) > 1 else None,
+            context=stack[-2] if len(stack) > 1 else None,
         )
         cons.deduced_from = Inference(
             None,
@@ -137,9 +172,23 @@ class AssumptionsContext:
             inner_contexts=[self],
         )
 
-        cons.from_assumptions = get_assumptions(conclusion).difference(self.assumptions)
+        if _assumed is None:
+            _assumed = set(self.assumptions)
+        cons.from_assumptions = get_assumptions(conclusion).difference(_assumed)
         return cons
 
+    def _assumes(self, obj: Any) -> bool:
+        """
+        Whether `obj` (compared by identity) is one of self.assumptions.
+        The index is extended with the assumptions added since the last
+        call, so checking many objects over the life of the context is
+        linear in the number of assumptions.
+        """
+        for a in self.assumptions[len(self._assumption_order) :]:
+            self._assumption_ids.add(id(a))
+            self._assumption_order.append(a)
+        return id(obj) in self._assumption_ids
+
     def open(self):
         return self.__enter__()
 
@@ -156,8 +205,9 @@ class AssumptionsContext:
             return
         from pylogic.proposition.proposition import Proposition
 
+        stack = _context_stack.get()
         assert (
-            self == assumptions_contexts[-1]
+            stack and stack[-1] is self
         ), "Cannot exit context because a nested (inner) context is still open"
 
         # these proven props were only true inside the context
@@ -172,33 +222,30 @@ class AssumptionsContext:
         for p in self._proven:
             p._is_proven = False
 
-        self.assumptions.reverse()
+        reset: list[Proposition] = []
         for a in self.assumptions:
             if isinstance(a, Proposition):
                 a._set_is_assumption(False)
+                reset.append(a)
 
         # remove need to call conclude
-        if (
-            self.auto_conclude
-            and len(self._interesting_conclusions) == 0
-            and len(self._proven) > 0
-        ):
-            self.proven_propositions.append(self._build_proven(self._proven[-1]))
-
-        for p in self._interesting_conclusions:
-            self.proven_propositions.append(self._build_proven(p))
-
-        # reset all assumptions of the previous context to be true
-        # we need to do this because we has reset all of self's assumptions
-        # to be false, but self.assumptions may contain references to
-        # assumptions in the previous context
-        if assumptions_contexts[-2] is not None:
-            for a in assumptions_contexts[-2].assumptions:
-                if isinstance(a, Proposition):
-                    a._set_is_assumption(True)
-
-        del assumptions_contexts[-1]
-        self.assumptions.reverse()
+        conclusions = self._interesting_conclusions
+        if self.auto_conclude and len(conclusions) == 0 and len(self._proven) > 0:
+            conclusions = [self._proven[-1]]
+        if conclusions:
+            scopes = self._scopes()
+            assumed = set(self.assumptions)
+            for p in conclusions:
+                self.proven_propositions.append(self._build_proven(p, scopes, assumed))
+
+        # we reset all of self's assumptions to be false, but some of them
+        # may also be assumptions of an outer context, which are still true
+        outer = stack[:-1]
+        for a in reset:
+            if any(c._assumes(a) for c in reversed(outer)):
+                a._set_is_assumption(True, add_to_context=False)
+
+        _context_stack.set(outer)
         self.exited = True
 
     def get_proven(self):
@@ -246,14 +293,14 @@ def conclude(conclusion: Proposition) -> Proposition:
     """
     assert conclusion.is_proven, f"{conclusion} is not proven"
 
-    if assumptions_contexts[-1] is not None:
-        assumptions_contexts[-1]._interesting_conclusions.append(conclusion)
+    context = current_context()
+    if context is not None:
+        context._interesting_conclusions.append(conclusion)
 
     # check if conclusion is an assumption so we can update target if needed
     # for eg in proving p -> (q -> p)
-    global _target_to_prove
-    if conclusion.is_assumption and conclusion == _target_to_prove:
-        _target_to_prove = None
+    if conclusion.is_assumption and conclusion == _target.get():
+        _target.set(None)
 
     return conclusion
 
@@ -261,7 +308,7 @@ def conclude(conclusion: Proposition) -> Proposition:
 def context_variable(*args, **kwargs) -> Variable:
     from pylogic.variable import Variable
 
-    return Variable(*args, context=assumptions_contexts[-1], **kwargs)
+    return Variable(*args, context=current_context(), **kwargs)
 
 
 def ctx_var(*args, **kwargs) -> Variable:
@@ -292,14 +339,43 @@ def to_prove(*target: Proposition) -> Proposition | None:
 
     When called with no arguments, it returns the current target proposition.
     """
-    global _target_to_prove
     if len(target) == 0:
-        return _target_to_prove
+        return _target.get()
     if len(target) == 1:
-        _target_to_prove = target[0]
+        _target.set(target[0])
         return target[0]
     raise ValueError("to_prove() accepts zero or one argument")
 
 
-assumptions_contexts: list[AssumptionsContext | None] = [None]
-_target_to_prove: Proposition | None = None
+# the open contexts of the current thread or task, innermost last
+_context_stack: ContextVar[tuple[AssumptionsContext, ...]] = ContextVar(
+    "pylogic_assumptions_contexts", default=()
+)
+# the target set with to_prove
+_target: ContextVar[Proposition | None] = ContextVar(
+    "pylogic_target_to_prove", default=None
+)
+
+
+def current_context() -> AssumptionsContext | None:
+    """
+    The innermost open context of the current thread or task, or None.
+    """
+    stack = _context_stack.get()
+    return stack[-1] if stack else None
+
+
+def open_contexts() -> tuple[AssumptionsContext, ...]:
+    """
+    The open contexts of the current thread or task, innermost last.
+    """
+    return _context_stack.get()
+
+
+def __getattr__(name: str) -> Any:
+    # read-only views of the former module globals
+    if name == "assumptions_contexts":
+        return [None, *_context_stack.get()]
+    if name == "_target_to_prove":
+        return _target.get()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
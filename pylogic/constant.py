@@ -11,6 +11,7 @@ from pylogic.helpers import (
     is_python_real_numeric,
     type_check,
 )
+from pylogic.session import journal_add
 from pylogic.symbol import Symbol
 
 if TYPE_CHECKING:
@@ -124,7 +125,8 @@ class Constant(Symbol, Generic[T]):
             from pylogic.inference import Inference
             from pylogic.theories.natural_numbers import Naturals
 
-            self.knowledge_base.add(
+            journal_add(
+                self.knowledge_base,
                 Naturals.prime(
                     self,
                     _is_proven=True,
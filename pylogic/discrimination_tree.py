@@ -0,0 +1,391 @@
+"""
+Discrimination trees: indexes of propositions and terms for retrieval by
+unification.
+
+`unify` compares two formulas. To find all the formulas of a knowledge base
+that unify with a goal, every formula would have to be compared with it. A
+discrimination tree stores formulas by their flattened structure (the
+sequence of their symbols in preorder, see `term_keys`), so one walk of the
+tree finds
+
+- the generalizations of a query (stored formulas that become the query
+  when their variables are instantiated),
+- the instances of a query,
+- the formulas that unify with a query.
+
+Variables are stored as wildcards. A wildcard stands for a whole subterm,
+and the tree does not check that the occurrences of the same variable are
+instantiated to the same subterm, so retrieval returns candidates: a
+superset of the formulas that match, which must then be checked with
+`unify`. Parts of formulas whose equality does not follow their structure
+(conjunctions are compared as sets, quantified propositions up to their
+variable) are stored as a single symbol.
+
+`LemmaIndex` indexes proven universal statements by their conclusions. It is
+used by the backward prover (see `pylogic.proposition.proof_search`) to find
+the lemmas that can prove a goal.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Collection, Generic, Iterable, Iterator, TypeVar
+
+if TYPE_CHECKING:
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.proposition.quantified.forall import Forall
+    from pylogic.typing import Term
+    from pylogic.unification import Unification
+    from pylogic.variable import Variable
+
+V = TypeVar("V")
+
+# every key ends with the number of subterms that follow it
+Key = tuple
+WILDCARD: Key = ("*", 0)
+
+
+def term_keys(
+    obj: Proposition | Term, variables: Collection[Variable] | None = None
+) -> tuple[Key, ...]:
+    """
+    The keys of `obj` in preorder.
+
+    Parameters
+    ----------
+    obj: Proposition | Term
+        The formula to flatten.
+    variables: Collection[Variable] | None
+        The variables that become wildcards. By default, all of them (as in
+        `pylogic.helpers.unify`). Other variables are compared like symbols.
+    """
+    keys: list[Key] = []
+    _flatten(obj, variables, keys)
+    return tuple(keys)
+
+
+def _flatten(obj: Any, variables: Collection[Variable] | None, keys: list[Key]) -> None:
+    from pylogic.constant import Constant
+    from pylogic.expressions.expr import CustomExpr, Expr
+    from pylogic.helpers import is_python_numeric
+    from pylogic.proposition._junction import _Junction
+    from pylogic.proposition.iff import Iff
+    from pylogic.proposition.implies import Implies
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.proposition.quantified.quantified import _Quantified
+    from pylogic.variable import Variable
+
+    if isinstance(obj, Proposition):
+        cls = obj.__class__
+        if isinstance(obj, Implies):
+            # includes Not, which is an implication of a contradiction
+            keys.append(("Implies", 2))
+            _flatten(obj.antecedent, variables, keys)
+            _flatten(obj.consequent, variables, keys)
+        elif isinstance(obj, Iff):
+            keys.append(("Iff", 2))
+            _flatten(obj.left, variables, keys)
+            _flatten(obj.right, variables, keys)
+        elif isinstance(obj, (_Junction, _Quantified)):
+            keys.append((cls.__name__ if isinstance(obj, _Junction) else "_Quantified", 0))
+        elif cls.__eq__ is Proposition.__eq__:
+            keys.append(("Proposition", obj.name, len(obj.args)))
+            for arg in obj.args:
+                _flatten(arg, variables, keys)
+        else:
+            keys.append((cls.__name__, 0))
+    elif isinstance(obj, Variable) and (variables is None or obj in variables):
+        keys.append(WILDCARD)
+    elif isinstance(obj, Expr):
+        eq = obj.__class__.__eq__
+        if eq is CustomExpr.__eq__:
+            keys.append(("CustomExpr", obj.name, len(obj.args)))
+        elif eq is Expr.__eq__:
+            keys.append((obj.__class__.__name__, len(obj.args)))
+        else:
+            keys.append((obj.__class__.__name__, 0))
+            return
+        for arg in obj.args:
+            _flatten(arg, variables, keys)
+    elif isinstance(obj, Constant) or is_python_numeric(obj):
+        # Constant(2) == 2
+        value = obj.value if isinstance(obj, Constant) else obj
+        keys.append(_atom_key(value, "Constant"))
+    else:
+        keys.append(_atom_key(obj, obj.__class__.__name__))
+
+
+def _atom_key(value: Any, label: str) -> Key:
+    try:
+        hash(value)
+    except TypeError:
+        return (label, 0)
+    return ("=", value, 0)
+
+
+def _subterm_ends(keys: tuple[Key, ...]) -> list[int]:
+    # ends[i] is the index after the subterm that starts at i
+    ends = [0] * len(keys)
+    stack: list[list[int]] = []
+    for i, key in enumerate(keys):
+        stack.append([i, key[-1]])
+        while stack and stack[-1][1] == 0:
+            start, _ = stack.pop()
+            ends[start] = i + 1
+            if stack:
+                stack[-1][1] -= 1
+    return ends
+
+
+class _Node:
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        self.children: dict[Key, _Node] = {}
+        self.values: list = []
+
+
+class DiscriminationTree(Generic[V]):
+    """
+    An index of formulas, see the module docstring.
+
+    Values are stored under the keys of a formula (see `term_keys`), and
+    retrieved with `generalizations`, `instances` and `unifiable`.
+    """
+
+    def __init__(self) -> None:
+        self._root = _Node()
+        self._entries: list[tuple[tuple[Key, ...], V]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[V]:
+        return (value for _, value in self._entries)
+
+    def copy(self) -> DiscriminationTree[V]:
+        new = self.__class__.__new__(self.__class__)
+        DiscriminationTree.__init__(new)
+        for keys, value in self._entries:
+            new.insert_keys(keys, value)
+        return new
+
+    def insert(
+        self,
+        obj: Proposition | Term,
+        value: V,
+        variables: Collection[Variable] | None = None,
+    ) -> None:
+        """
+        Store `value` under the formula `obj`, whose `variables` (by default,
+        all) are wildcards.
+        """
+        self.insert_keys(term_keys(obj, variables), value)
+
+    def insert_keys(self, keys: tuple[Key, ...], value: V) -> None:
+        node = self._root
+        for key in keys:
+            child = node.children.get(key)
+            if child is None:
+                child = node.children[key] = _Node()
+            node = child
+        node.values.append(value)
+        self._entries.append((keys, value))
+
+    def remove(
+        self,
+        obj: Proposition | Term,
+        value: V,
+        variables: Collection[Variable] | None = None,
+    ) -> None:
+        """
+        Remove `value` (compared by identity), stored under `obj`.
+        Raises KeyError if it is not in the tree.
+        """
+        keys = term_keys(obj, variables)
+        path = [self._root]
+        for key in keys:
+            child = path[-1].children.get(key)
+            if child is None:
+                raise KeyError(obj)
+            path.append(child)
+        values = path[-1].values
+        for i, stored in enumerate(values):
+            if stored is value:
+                del values[i]
+                break
+        else:
+            raise KeyError(obj)
+        for i, (stored_keys, stored) in enumerate(self._entries):
+            if stored is value and stored_keys == keys:
+                del self._entries[i]
+                break
+        # prune empty branches
+        for depth in range(len(keys), 0, -1):
+            node = path[depth]
+            if node.children or node.values:
+                break
+            del path[depth - 1].children[keys[depth - 1]]
+
+    def generalizations(
+        self, query: Proposition | Term, variables: Collection[Variable] | None = ()
+    ) -> list[V]:
+        """
+        Candidate values stored under formulas of which `query` is an instance.
+        By default, the variables of `query` are compared like symbols.
+        """
+        return self._retrieve(query, variables, "generalizations")
+
+    def instances(
+        self, query: Proposition | Term, variables: Collection[Variable] | None = None
+    ) -> list[V]:
+        """
+        Candidate values stored under instances of `query`.
+        """
+        return self._retrieve(query, variables, "instances")
+
+    def unifiable(
+        self, query: Proposition | Term, variables: Collection[Variable] | None = None
+    ) -> list[V]:
+        """
+        Candidate values stored under formulas that unify with `query`.
+        """
+        return self._retrieve(query, variables, "unifiable")
+
+    def _retrieve(
+        self, query: Any, variables: Collection[Variable] | None, mode: str
+    ) -> list[V]:
+        keys = term_keys(query, variables)
+        ends = _subterm_ends(keys)
+        found: list[V] = []
+        self._walk(self._root, keys, ends, 0, mode, found)
+        return found
+
+    def _walk(
+        self,
+        node: _Node,
+        keys: tuple[Key, ...],
+        ends: list[int],
+        i: int,
+        mode: str,
+        found: list[V],
+    ) -> None:
+        if i == len(keys):
+            found.extend(node.values)
+            return
+        key = keys[i]
+        if key == WILDCARD and mode != "generalizations":
+            # a variable of the query matches any stored subterm
+            for after in _skip(node, 1):
+                self._walk(after, keys, ends, i + 1, mode, found)
+            return
+        child = node.children.get(key)
+        if child is not None:
+            self._walk(child, keys, ends, i + 1, mode, found)
+        if key != WILDCARD and mode != "instances":
+            # a stored variable matches any subterm of the query
+            child = node.children.get(WILDCARD)
+            if child is not None:
+                self._walk(child, keys, ends, ends[i], mode, found)
+
+
+def _skip(node: _Node, pending: int) -> Iterator[_Node]:
+    # the nodes reached after `pending` whole subterms below `node`
+    if pending == 0:
+        yield node
+        return
+    for key, child in node.children.items():
+        yield from _skip(child, pending - 1 + key[-1])
+
+
+def universal_prefix(prop: Proposition) -> tuple[list[Variable], Proposition]:
+    """
+    The variables of the universal quantifiers in front of `prop`, and the
+    proposition they quantify. For `forall x in S` quantifiers the set
+    condition is left out.
+
+    Examples
+    --------
+    >>> universal_prefix(ForallInSet(x, Naturals, Forall(y, P(x, y))))
+    ([x, y], P(x, y))
+    """
+    from pylogic.proposition.quantified.forall import Forall
+
+    variables: list[Variable] = []
+    while isinstance(prop, Forall):
+        variables.append(prop.variable)
+        prop = getattr(prop, prop._innermost_prop_attr)
+    return variables, prop
+
+
+def match(
+    pattern: Proposition | Term,
+    target: Proposition | Term,
+    variables: Collection[Variable],
+) -> Unification | None:
+    """
+    Values for `variables` that make `pattern` equal to `target`, or None.
+    See `pylogic.unification.match`.
+    """
+    from pylogic.unification import match as _match
+
+    return _match(pattern, target, variables)
+
+
+class LemmaIndex(DiscriminationTree[tuple]):
+    """
+    An index of universal statements, `forall x1 ... xn: A -> B` or
+    `forall x1 ... xn: B`, by their conclusion `B` (and by `A -> B`), with
+    `x1 ... xn` as wildcards. `candidates` returns the lemmas that may prove
+    a goal.
+    """
+
+    def __init__(self, lemmas: Iterable[Forall] = ()) -> None:
+        super().__init__()
+        self._ids: set[int] = set()
+        for lemma in lemmas:
+            self.add(lemma)
+
+    def __contains__(self, lemma: object) -> bool:
+        return id(lemma) in self._ids
+
+    def copy(self) -> LemmaIndex:
+        new = super().copy()
+        new._ids = self._ids.copy()
+        return new  # type: ignore
+
+    def add(self, lemma: Forall) -> None:
+        """
+        Index `lemma`.
+        """
+        from pylogic.proposition.implies import Implies
+        from pylogic.proposition.not_ import Not
+
+        if id(lemma) in self._ids:
+            return
+        self._ids.add(id(lemma))
+        variables, body = universal_prefix(lemma)
+        self.insert(body, (lemma, variables, False), variables)
+        if isinstance(body, Implies) and not isinstance(body, Not):
+            self.insert(body.consequent, (lemma, variables, True), variables)
+
+    def candidates(
+        self, goal: Proposition
+    ) -> Iterator[tuple[Forall, Unification, bool]]:
+        """
+        The lemmas whose conclusion (if the third element is True) or body
+        may become `goal`, with the values of their variables. A variable
+        that is not in the values stands for itself.
+        """
+        from pylogic.helpers import get_vars
+
+        for lemma, variables, hypothesis in self.generalizations(goal):
+            _, body = universal_prefix(lemma)
+            pattern = body.consequent if hypothesis else body  # type: ignore
+            values = match(pattern, goal, variables)
+            if values is None:
+                continue
+            # variables that only occur in the hypothesis are not determined
+            occurring = get_vars(pattern)
+            if any(v not in values and v not in occurring for v in variables):
+                continue
+            yield lemma, values, hypothesis
@@ -0,0 +1,446 @@
+"""
+Export of propositions to TPTP FOF and SMT-LIB v2, so that results can be
+cross-checked with external provers.
+
+Problems are written one formula at a time through generators, so a
+knowledge base of any size is exported without building the whole text in
+memory. Only the symbols that have been declared are remembered.
+
+Encoding
+--------
+- All terms have one sort (`U` in SMT-LIB). Variables, constants, sets and
+  sequences are constants named after them, except variables bound by a
+  quantifier, which become variables of the output.
+- Numbers are uninterpreted but pairwise distinct: in TPTP they are distinct
+  objects (`"2"`), in SMT-LIB they are constants (`|2|`) and the script
+  asserts that all of them are `distinct`. There is no arithmetic; `+`, `*` and
+  `^` are the binary functions `add`, `mul` and `pow`, and other
+  expressions are functions named after their class or name.
+- Set membership `x in S` is the binary predicate `in(x, S)`, and
+  `A subset B` is `subset(A, B)`. `Forall x in S: P` is encoded as
+  `forall x: in(x, S) -> P` and `Exists x in S: P` as
+  `exists x: in(x, S) /\\ P`, as pylogic defines them.
+- `=` is equality. The orderings are the predicates `less`, `lesseq`,
+  `greater` and `greatereq`; other relations are predicates named after
+  them, and atomic propositions are nullary predicates.
+- `ExOr` (exactly one) is expanded into a disjunction of conjunctions.
+"""
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, TextIO
+
+if TYPE_CHECKING:
+    from pylogic.assumptions_context import AssumptionsContext
+    from pylogic.proposition.proposition import Proposition
+
+_RELATION_NAMES = {
+    "IsContainedIn": "in",
+    "IsSubsetOf": "subset",
+    "LessThan": "less",
+    "LessOrEqual": "lesseq",
+    "GreaterThan": "greater",
+    "GreaterOrEqual": "greatereq",
+}
+_EXPR_NAMES = {"Add": "add", "Mul": "mul", "Pow": "pow"}
+
+
+class _Exporter(ABC):
+    """
+    Translates propositions into one output language. Subclasses define
+    the syntax.
+    """
+
+    def __init__(self) -> None:
+        # (kind, name, arity) -> output symbol
+        self.symbols: dict[tuple[str, str, int], str] = {}
+        self._used: set[str] = set()
+        self._new: list[tuple[str, str, int]] = []
+        # bound variable -> output variable, innermost last
+        self._bound: list[tuple[Any, str]] = []
+
+    ##############################################################
+    # symbols
+
+    @abstractmethod
+    def _quote(self, name: str) -> str:
+        pass
+
+    def symbol(self, kind: str, name: str, arity: int) -> str:
+        """
+        The output symbol of a function ("fun"), predicate ("pred") or
+        number ("num"). Symbols with the same name but another kind or arity
+        get a suffix.
+        """
+        key = (kind, name, arity)
+        out = self.symbols.get(key)
+        if out is not None:
+            return out
+        out = self._quote(name)
+        n = 1
+        while out in self._used:
+            n += 1
+            out = self._quote(f"{name}_{n}")
+        self._used.add(out)
+        self.symbols[key] = out
+        self._new.append(key)
+        return out
+
+    def take_new_symbols(self) -> list[tuple[str, str, int]]:
+        """
+        The symbols used since the last call, as (kind, name, arity).
+        """
+        new, self._new = self._new, []
+        return new
+
+    ##############################################################
+    # terms
+
+    def term(self, t: Any) -> str:
+        from pylogic.constant import Constant
+        from pylogic.expressions.expr import CustomExpr, Expr
+        from pylogic.expressions.sequence_term import SequenceTerm
+        from pylogic.variable import Variable
+
+        if isinstance(t, Variable):
+            for var, name in reversed(self._bound):
+                if var == t:
+                    return name
+            return self.apply("fun", t.name, [])
+        if isinstance(t, Constant):
+            value = t.value
+            if isinstance(value, (int, Fraction, float)) and not isinstance(
+                value, bool
+            ):
+                return self.number(value)
+            return self.apply("fun", str(t.name), [])
+        if isinstance(t, (int, Fraction, float)) and not isinstance(t, bool):
+            return self.number(t)
+        if isinstance(t, SequenceTerm):
+            return self.apply("fun", "seq_term", [t.sequence, t.index])
+        if isinstance(t, CustomExpr):
+            return self.apply("fun", t.name, list(t.args))
+        if isinstance(t, Expr):
+            cls_name = t.__class__.__name__
+            name = _EXPR_NAMES.get(cls_name, cls_name.lower())
+            args = list(t.args)
+            if name in ("add", "mul") and len(args) > 2:
+                # nested binary applications
+                result = self.term(args[-1])
+                for arg in reversed(args[:-1]):
+                    result = self.apply_strs(
+                        self.symbol("fun", name, 2), [self.term(arg), result]
+                    )
+                return result
+            return self.apply("fun", name, args)
+        return self.apply("fun", str(getattr(t, "name", t)), [])
+
+    def apply(self, kind: str, name: str, args: list[Any]) -> str:
+        return self.apply_strs(
+            self.symbol(kind, name, len(args)), [self.term(a) for a in args]
+        )
+
+    @abstractmethod
+    def number(self, value: int | Fraction | float) -> str:
+        pass
+
+    @abstractmethod
+    def apply_strs(self, symbol: str, args: list[str]) -> str:
+        pass
+
+    ##############################################################
+    # formulas
+
+    def formula(self, p: Proposition) -> str:
+        from pylogic.proposition.and_ import And
+        from pylogic.proposition.contradiction import Contradiction
+        from pylogic.proposition.exor import ExOr
+        from pylogic.proposition.iff import Iff
+        from pylogic.proposition.implies import Implies
+        from pylogic.proposition.not_ import Not
+        from pylogic.proposition.or_ import Or
+        from pylogic.proposition.quantified.exists import Exists
+        from pylogic.proposition.quantified.forall import Forall
+        from pylogic.proposition.relation.binaryrelation import BinaryRelation
+        from pylogic.proposition.relation.equals import Equals
+
+        if isinstance(p, Not):
+            return self.negation(self.formula(p.negated))
+        if isinstance(p, Implies):
+            return self.binary("=>", self.formula(p.left), self.formula(p.right))
+        if isinstance(p, Iff):
+            return self.binary("<=>", self.formula(p.left), self.formula(p.right))
+        if isinstance(p, ExOr):
+            parts = [self.formula(q) for q in p.propositions]
+            return self.junction(
+                "|",
+                [
+                    self.junction(
+                        "&",
+                        [
+                            part if i == j else self.negation(other)
+                            for j, other in enumerate(parts)
+                        ],
+                    )
+                    for i, part in enumerate(parts)
+                ],
+            )
+        if isinstance(p, And):
+            return self.junction("&", [self.formula(q) for q in p.propositions])
+        if isinstance(p, Or):
+            return self.junction("|", [self.formula(q) for q in p.propositions])
+        if isinstance(p, (Forall, Exists)):
+            name = self.bound_variable(p.variable)
+            self._bound.append((p.variable, name))
+            try:
+                inner = self.formula(p.inner_proposition)
+            finally:
+                self._bound.pop()
+            return self.quantified(isinstance(p, Forall), name, inner)
+        if isinstance(p, Contradiction):
+            return self.false()
+        if isinstance(p, Equals):
+            return self.equals(self.term(p.left), self.term(p.right))
+        if isinstance(p, BinaryRelation):
+            name = _RELATION_NAMES.get(p.__class__.__name__, p.name)
+            return self.apply("pred", name, [p.left, p.right])
+        return self.apply("pred", p.name, list(p.args))
+
+    @abstractmethod
+    def bound_variable(self, var: Any) -> str:
+        pass
+
+    @abstractmethod
+    def negation(self, s: str) -> str:
+        pass
+
+    @abstractmethod
+    def binary(self, op: str, left: str, right: str) -> str:
+        pass
+
+    @abstractmethod
+    def junction(self, op: str, parts: list[str]) -> str:
+        pass
+
+    @abstractmethod
+    def quantified(self, forall: bool, var: str, inner: str) -> str:
+        pass
+
+    @abstractmethod
+    def false(self) -> str:
+        pass
+
+    @abstractmethod
+    def equals(self, left: str, right: str) -> str:
+        pass
+
+
+class TPTPExporter(_Exporter):
+    """
+    Translates propositions into TPTP first-order formulas (FOF).
+    """
+
+    _LOWER_WORD = re.compile(r"[a-z][A-Za-z0-9_]*")
+    _OPS = {"=>": "=>", "<=>": "<=>", "&": "&", "|": "|"}
+
+    def _quote(self, name: str) -> str:
+        if self._LOWER_WORD.fullmatch(name):
+            return name
+        return "'" + name.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    def number(self, value: int | Fraction | float) -> str:
+        # distinct objects: different numbers are different
+        return f'"{value}"'
+
+    def apply_strs(self, symbol: str, args: list[str]) -> str:
+        return f"{symbol}({', '.join(args)})" if args else symbol
+
+    def bound_variable(self, var: Any) -> str:
+        suffix = re.sub(r"\W", "", str(var.name))
+        return f"X{len(self._bound)}_{suffix}" if suffix else f"X{len(self._bound)}"
+
+    def negation(self, s: str) -> str:
+        return f"~ ({s})"
+
+    def binary(self, op: str, left: str, right: str) -> str:
+        return f"({left} {self._OPS[op]} {right})"
+
+    def junction(self, op: str, parts: list[str]) -> str:
+        if len(parts) == 1:
+            return parts[0]
+        return "(" + f" {op} ".join(parts) + ")"
+
+    def quantified(self, forall: bool, var: str, inner: str) -> str:
+        return f"({'!' if forall else '?'} [{var}] : {inner})"
+
+    def false(self) -> str:
+        return "$false"
+
+    def equals(self, left: str, right: str) -> str:
+        return f"({left} = {right})"
+
+    def lines(
+        self, premises: Iterable[Proposition], conjecture: Proposition | None = None
+    ) -> Iterator[str]:
+        """
+        The lines of a TPTP problem, one formula per line.
+        """
+        yield "% exported by pylogic"
+        for i, p in enumerate(premises, 1):
+            yield f"fof(premise_{i}, axiom, {self.formula(p)})."
+        if conjecture is not None:
+            yield f"fof(goal, conjecture, {self.formula(conjecture)})."
+
+
+class SMTLIBExporter(_Exporter):
+    """
+    Translates propositions into SMT-LIB v2 assertions, with one
+    uninterpreted sort `U` for terms.
+    """
+
+    _OPS = {"=>": "=>", "<=>": "=", "&": "and", "|": "or"}
+
+    def _quote(self, name: str) -> str:
+        return "|" + name.replace("|", "!").replace("\\", "/") + "|"
+
+    def number(self, value: int | Fraction | float) -> str:
+        return self.apply_strs(self.symbol("num", str(value), 0), [])
+
+    def apply_strs(self, symbol: str, args: list[str]) -> str:
+        return f"({symbol} {' '.join(args)})" if args else symbol
+
+    def bound_variable(self, var: Any) -> str:
+        return self._quote(f"{var.name}!{len(self._bound)}")
+
+    def negation(self, s: str) -> str:
+        return f"(not {s})"
+
+    def binary(self, op: str, left: str, right: str) -> str:
+        return f"({self._OPS[op]} {left} {right})"
+
+    def junction(self, op: str, parts: list[str]) -> str:
+        if len(parts) == 1:
+            return parts[0]
+        return f"({self._OPS[op]} {' '.join(parts)})"
+
+    def quantified(self, forall: bool, var: str, inner: str) -> str:
+        return f"({'forall' if forall else 'exists'} (({var} U)) {inner})"
+
+    def false(self) -> str:
+        return "false"
+
+    def equals(self, left: str, right: str) -> str:
+        return f"(= {left} {right})"
+
+    def declarations(self) -> Iterator[str]:
+        for key in self.take_new_symbols():
+            kind, _, arity = key
+            symbol = self.symbols[key]
+            sort = "Bool" if kind == "pred" else "U"
+            yield f"(declare-fun {symbol} ({' '.join(['U'] * arity)}) {sort})"
+
+    def lines(
+        self, premises: Iterable[Proposition], conjecture: Proposition | None = None
+    ) -> Iterator[str]:
+        """
+        The lines of an SMT-LIB script. The conjecture is negated, so the
+        script is unsatisfiable if the conjecture follows from the premises.
+        The numbers are asserted to be distinct at the end, like TPTP's
+        distinct objects.
+        """
+        yield "; exported by pylogic"
+        yield "(set-logic UF)"
+        yield "(declare-sort U 0)"
+        for i, p in enumerate(premises, 1):
+            assertion = f"(assert (! {self.formula(p)} :named premise_{i}))"
+            yield from self.declarations()
+            yield assertion
+        if conjecture is not None:
+            assertion = f"(assert (! (not {self.formula(conjecture)}) :named goal))"
+            yield from self.declarations()
+            yield assertion
+        numbers = [out for (kind, _, _), out in self.symbols.items() if kind == "num"]
+        if len(numbers) > 1:
+            yield f"(assert (distinct {' '.join(numbers)}))"
+        yield "(check-sat)"
+
+
+_EXPORTERS = {"tptp": TPTPExporter, "smtlib": SMTLIBExporter}
+
+
+def export_lines(
+    premises: Iterable[Proposition],
+    conjecture: Proposition | None = None,
+    format: str = "tptp",
+) -> Iterator[str]:
+    """
+    The lines of a problem in `format` ("tptp" or "smtlib"), generated one
+    formula at a time.
+    """
+    if format not in _EXPORTERS:
+        raise ValueError(f"Unknown format {format!r}, expected one of {list(_EXPORTERS)}")
+    return _EXPORTERS[format]().lines(premises, conjecture)
+
+
+def write_problem(
+    file: str | TextIO,
+    premises: Iterable[Proposition],
+    conjecture: Proposition | None = None,
+    format: str = "tptp",
+) -> int:
+    """
+    Write a problem to `file` (a path or a text file), line by line.
+    Returns the number of lines written.
+    """
+    if isinstance(file, str):
+        with open(file, "w", encoding="utf-8") as f:
+            return write_problem(f, premises, conjecture, format)
+    count = 0
+    for line in export_lines(premises, conjecture, format):
+        file.write(line)
+        file.write("\n")
+        count += 1
+    return count
+
+
+def export_proposition(
+    file: str | TextIO,
+    prop: Proposition,
+    premises: Iterable[Proposition] | None = None,
+    format: str = "tptp",
+) -> int:
+    """
+    Write `prop` as the conjecture of a problem whose premises are
+    `premises` (default: the assumptions it was proven from).
+    """
+    from pylogic.proposition.proposition import get_assumptions
+
+    if premises is None:
+        premises = sorted(get_assumptions(prop) - {prop}, key=str)
+    return write_problem(file, premises, prop, format)
+
+
+def export_context(
+    file: str | TextIO, context: AssumptionsContext, format: str = "tptp"
+) -> int:
+    """
+    Write the problem of an assumptions context: its assumed propositions
+    are the premises, and the conjunction of its conclusions is the
+    conjecture. Variables assumed in the context are constants.
+    """
+    from pylogic.proofs.archive import context_conclusions
+    from pylogic.proposition.and_ import And
+    from pylogic.proposition.proposition import Proposition
+
+    premises = [a for a in context.assumptions if isinstance(a, Proposition)]
+    conclusions = context_conclusions(context)
+    if len(conclusions) == 0:
+        conjecture = None
+    elif len(conclusions) == 1:
+        conjecture = conclusions[0]
+    else:
+        conjecture = And(*conclusions)
+    return write_problem(file, premises, conjecture, format)
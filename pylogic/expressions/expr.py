@@ -16,6 +16,7 @@ from typing import (
 import sympy as sp
 
 from pylogic.enviroment_settings.settings import settings
+from pylogic.traversal import wrap_traversal_methods
 from pylogic.typing import PBasic, PythonNumeric, Term, Unification
 
 if TYPE_CHECKING:
@@ -75,6 +76,11 @@ class Expr(ABC):
     # Function MinElement Abs/Gcd SequenceTerm Pow Mul Mod/Prod Sum Add Binary_Expr
     # Custom_Expr Piecewise Relation(eg <, subset)
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # __str__, __eq__, replace etc. are evaluated without recursion
+        wrap_traversal_methods(cls, "expression")
+
     def __init__(self, *args, **kwargs):
         # _internal only: used when copying an expr
         _is_copy = kwargs.get("_is_copy", False)
@@ -576,6 +582,12 @@ class Expr(ABC):
     def __hash__(self) -> int:
         return hash((self.__class__.__name__, self.args))
 
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        # symbols refer back to the expressions that contain them
+        from pylogic.serialize import reduce_with_state
+
+        return reduce_with_state(self)
+
     def replace(
         self,
         replace_dict: dict,
@@ -641,25 +653,12 @@ class Expr(ABC):
         return True.
         Otherwise (unification fails), return None.
         """
-        if self.__class__ != other.__class__ or len(self.args) != len(other.args):
-            return None
-        from pylogic.helpers import unify as term_unify
-
-        d: Unification = {}
-        for s_arg, o_arg in zip(self.args, other.args):
-            res = term_unify(s_arg, o_arg)
-            if isinstance(res, dict):
-                for k in res:
-                    if k in d and d[k] != res[k]:
-                        return None
-                    d[k] = res[k]
-            elif res is None:
-                return None
-        if len(d) == 0:
-            return True
-        else:
-            return d
+        from pylogic.helpers import unify
+
+        return unify(self, other)
+
 
+wrap_traversal_methods(Expr, "expression")
 
 U = TypeVar("U", bound=Term)
 
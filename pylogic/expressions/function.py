@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING, Callable, Self, TypeVar, TypeVarTuple, overloa
 import sympy as sp
 
 from pylogic.expressions.expr import Expr, to_sympy
+from pylogic.session import journal_add
 from pylogic.typing import Term
 
 if TYPE_CHECKING:
@@ -277,7 +278,7 @@ class Function(Expr):
                 )
             self.proposition: Forall = cur_prop
         self.proposition.is_assumption = True
-        self.knowledge_base.add(self.proposition)
+        journal_add(self.knowledge_base, self.proposition)
 
     def evaluate(self, **kwargs) -> Self:
         return self
@@ -447,7 +448,8 @@ class CalledFunction(Expr):
             )
         )
         if all_args_in_domain and self.function.codomain != UniversalSet:
-            self.knowledge_base.add(
+            journal_add(
+                self.knowledge_base,
                 IsContainedIn(
                     self,
                     self.function.codomain,
@@ -476,7 +478,8 @@ class CalledFunction(Expr):
             return self
         res = self.function.definition.replace(self.replace_dict)
         if res is not self and self.add_result_to_codomain:
-            res.knowledge_base.add(
+            journal_add(
+                res.knowledge_base,
                 IsContainedIn(
                     res,
                     self.function.codomain,
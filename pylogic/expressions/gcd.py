@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING
 import sympy as sp
 
 from pylogic.expressions.expr import Expr, to_sympy
+from pylogic.session import journal_add
 from pylogic.typing import PBasic, PythonNumeric, Term
 
 if TYPE_CHECKING:
@@ -32,7 +33,8 @@ class Gcd(Expr):
         self.update_properties()
 
         for arg in self.args:
-            self.knowledge_base.add(
+            journal_add(
+                self.knowledge_base,
                 Integers.divides(
                     self,
                     arg,
@@ -43,12 +45,25 @@ class Gcd(Expr):
             )
 
     def evaluate(self, **kwargs) -> Term:
+        from pylogic.constant import Constant
+        from pylogic.helpers import is_integer_numeric
+        from pylogic.number_theory import gcd
         from pylogic.sympy_helpers import FromSympyError, sympy_to_pylogic
 
+        args = [expr.evaluate() for expr in self.args]
+        numeric = [arg for arg in args if is_integer_numeric(arg)]
+        if len(numeric) == len(args):
+            return Constant(gcd(*(arg.value for arg in numeric)))
+        if numeric:
+            # combine the integer arguments natively; sympy would treat
+            # the other arguments as polynomials and return 1
+            g = gcd(*(arg.value for arg in numeric))
+            if g == 1:
+                return Constant(1)
+            rest = [arg for arg in args if not is_integer_numeric(arg)]
+            return Gcd(g, *rest)
         try:
-            return sympy_to_pylogic(
-                sp.gcd(*[to_sympy(expr.evaluate()) for expr in self.args])
-            )
+            return sympy_to_pylogic(sp.gcd(*[to_sympy(expr) for expr in args]))
         except FromSympyError:
             return self
 
@@ -8,6 +8,7 @@ import sympy as sp
 from pylogic.expressions.expr import Expr, distance, to_sympy
 from pylogic.proposition.quantified.exists import ExistsInSet
 from pylogic.proposition.quantified.forall import ForallInSet
+from pylogic.session import journal_add
 from pylogic.typing import Term
 from pylogic.variable import Variable
 
@@ -81,7 +82,7 @@ class Limit(Expr):
             _assumptions=set(),
             _inference=Inference(None, rule="by_definition"),
         )
-        self.knowledge_base.add(self.epsilon_N_definition)
+        journal_add(self.knowledge_base, self.epsilon_N_definition)
 
     def evaluate(self, **kwargs) -> Limit | Constant:
         n = Variable("n")
@@ -3,6 +3,7 @@ from __future__ import annotations
 import sympy as sp
 
 from pylogic.expressions.expr import Expr
+from pylogic.session import journal_update
 from pylogic.typing import Term
 
 
@@ -89,9 +90,7 @@ class Max(Expr):
         self.geq = geq
         self.geq_a = geq_a
         self.geq_b = geq_b
-        self.knowledge_base.add(self.geq)
-        self.knowledge_base.add(self.geq_a)
-        self.knowledge_base.add(self.geq_b)
+        journal_update(self.knowledge_base, (self.geq, self.geq_a, self.geq_b))
 
     def update_properties(self) -> None:
         # self.a and self.b might not be set yet
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from fractions import Fraction
 from typing import TYPE_CHECKING
 
 import sympy as sp
 
 from pylogic.expressions.expr import Expr, to_sympy
+from pylogic.session import journal_setitem
 from pylogic.typing import Term
 
 if TYPE_CHECKING:
@@ -85,19 +87,10 @@ class Mod(Expr):
         self.expr_gt_modulus: bool | None = expr_gt_modulus
 
     def evaluate(self, **kwargs) -> Term:
-        # TODO: fix this to evaluate correctly something like
-        # Mod(x+y+z, x+y) -> Mod(z, x+y)
-        # Mod(x*y*z, x*y) -> 0
         from pylogic.constant import Constant
-        from pylogic.expressions.expr import Add, Mul, Pow
-        from pylogic.expressions.prod import Prod
-        from pylogic.expressions.sequence_term import SequenceTerm
-        from pylogic.expressions.sum import Sum, _Aggregate
+        from pylogic.expressions.sum import _Aggregate
         from pylogic.helpers import is_integer_numeric
-        from pylogic.sympy_helpers import sympy_to_pylogic
-        from pylogic.variable import Variable
 
-        # TODO: feature: add is_polynomial for easy check add, mul, pow
         # base cases
         if self.expr == self.modulus:
             return Constant(0)
@@ -106,128 +99,71 @@ class Mod(Expr):
         if is_integer_numeric(self.expr) and is_integer_numeric(self.modulus):
             return Constant(self.expr.value % self.modulus.value)
 
-        possible_ret_vals = []
-        if isinstance(self.expr, Mod) and self.expr.modulus == self.modulus:
-            possible_ret_vals.append(Mod(self.expr.expr, self.modulus).evaluate())
-
-        if not isinstance(self.expr, _Aggregate):
-            try:
-                possible_ret_vals.append(sympy_to_pylogic(self.to_sympy().doit()))
-            except Exception as e:  # see Add.evaluate
-                pass
-
-        # (x+y+z) mod (x+y) -> z mod (x+y)
-        new_expr1 = (self.expr - self.modulus).evaluate()
-        new_expr2 = (self.expr + self.modulus).evaluate()
-        new_expr = new_expr1 if len(str(new_expr1)) < len(str(new_expr2)) else new_expr2
-        if len(str(new_expr)) < len(str(self.expr)):
-            possible_ret_vals.append(Mod(new_expr, self.modulus).evaluate())
-
-        expr_eval = self.expr.evaluate()
-        mod_eval = self.modulus.evaluate()
-        if expr_eval != self.expr:
-            possible_ret_vals.append(Mod(expr_eval, self.modulus).evaluate())
-        if mod_eval != self.modulus:
-            possible_ret_vals.append(Mod(self.expr, mod_eval).evaluate())
-
-            if expr_eval != self.expr:
-                possible_ret_vals.append(Mod(expr_eval, mod_eval).evaluate())
-
-        if isinstance(self.expr, Pow):
-            # self.expr.exp must be a natural number
-            # since self.expr.is_integer is True
-            if self.expr.base == self.modulus:
-                return Constant(0)
-            new_base = Mod(self.expr.base, self.modulus).evaluate()
-            if isinstance(new_base, Mod) and new_base.modulus == self.modulus:
-                new_base = new_base.expr
-            if new_base == Constant(0):
-                return Constant(0)
-            new_expr = Pow(new_base, self.expr.exp).evaluate()
-            if self.expr_lt_modulus:
-                possible_ret_vals.append(new_expr)
-            possible_ret_vals.append(Mod(new_expr, self.modulus))
-
-        if isinstance(self.expr, (Mul, Add)):
-            cls = self.expr.__class__
-            new_expr_args = []
-            for t in self.expr.args:
-                new_t_expr = Mod(t, self.modulus).evaluate()
-
-                # TODO: new_t_expr.modulus == self.modulus should be True,
-                # but verifying here
-                if isinstance(new_t_expr, Mod) and new_t_expr.modulus == self.modulus:
-                    new_t_expr = new_t_expr.expr
-                if new_t_expr == Constant(0) and cls is Mul:
-                    return Constant(0)
-                new_expr_args.append(new_t_expr)
-            new_expr = cls(*new_expr_args).evaluate()
-            if self.expr_lt_modulus:
-                possible_ret_vals.append(new_expr)
-            # no evaluate here, base case since all sub mods should
-            # have been fully evaluated
-            possible_ret_vals.append(Mod(new_expr, self.modulus))
-
-        if isinstance(self.expr, (Sum, Prod)):
-            if not self.expr.sequence.is_finite:  # has length
-                return self
-            if (
-                isinstance(self.expr, Prod)
-                and isinstance(self.modulus, SequenceTerm)
-                and self.modulus.sequence == self.expr.sequence
-            ):
-                return Constant(0)
-
-            from pylogic.proposition.relation.contains import IsContainedIn
-            from pylogic.structures.set_ import SeqSet
-
-            if (
-                isinstance(self.expr, Prod)
-                and IsContainedIn(self.modulus, SeqSet(self.expr.sequence))
-                in self.modulus.knowledge_base
-            ):
-                return Constant(0)
-
-            if self.expr.sequence.nth_term is not None:
-                n = Variable("mod_dummy_var", integer=True)
-                new_nth_term = Mod(
-                    self.expr.sequence.nth_term(n), self.modulus
-                ).evaluate()
-
-                # TODO: new_t_expr.modulus == self.modulus should be True,
-                # but verifying here
-                if (
-                    isinstance(new_nth_term, Mod)
-                    and new_nth_term.modulus == self.modulus
-                ):
-                    new_nth_term = new_nth_term.expr
-                if new_nth_term == Constant(0):  # true for Sum and Prod
-                    return Constant(0)
-                new_sequence = self.expr.sequence.__class__(
-                    name=f"{self.expr.sequence.name} mod {self.modulus}",
-                    nth_term=lambda ind: new_nth_term.replace({n: ind}),
-                    integer=True,
-                    length=self.expr.sequence.length,
-                )
-                if self.expr_lt_modulus:
-                    possible_ret_vals.append(self.expr.__class__(new_sequence))
-                possible_ret_vals.append(
-                    Mod(self.expr.__class__(new_sequence), self.modulus)
-                )
-
-        # if not returned at this point
-        if len(possible_ret_vals) == 0 and self.expr_lt_modulus:
+        if isinstance(self.expr, _Aggregate):
+            return self._evaluate_aggregate()
+
+        # only the reduction is cached: the rest depends on what is known
+        # about expr and modulus
+        key = (self.expr, self.modulus)
+        try:
+            reduced = _mod_cache[key]
+            _mod_cache.move_to_end(key)
+        except (KeyError, TypeError):
+            reduced = reduce_mod(self.expr, self.modulus)
+            _cache_result(key, reduced)
+
+        if reduced is None:
+            # not in the polynomial fragment
+            return self.expr if self.expr_lt_modulus else self
+        if reduced == Constant(0):
+            return reduced
+        if reduced == self.expr and self.expr_lt_modulus:
             return self.expr
-        if len(possible_ret_vals) == 0 and not self.expr_lt_modulus:
-            return self
+        if isinstance(reduced, Constant) and is_integer_numeric(self.modulus):
+            return reduced
+        return Mod(reduced, self.modulus)
+
+    def _evaluate_aggregate(self) -> Term:
+        """
+        Evaluate `Sum(...) mod m` and `Prod(...) mod m` by reducing the
+        terms of the sequence modulo m.
+        """
+        from pylogic.constant import Constant
+        from pylogic.expressions.prod import Prod
+        from pylogic.expressions.sequence_term import SequenceTerm
+        from pylogic.proposition.relation.contains import IsContainedIn
+        from pylogic.structures.set_ import SeqSet
+        from pylogic.variable import Variable
 
-        # looks funny, but we return the value with the shortest string representation
-        possible_ret_vals.append(self)
-        ret_val = min(possible_ret_vals, key=lambda x: len(str(x)))
-        if isinstance(ret_val, Mod) and ret_val.expr != self.expr:
-            # hopefuly this does not cause infinite recursion
-            return ret_val.evaluate()
-        return ret_val
+        if not self.expr.sequence.is_finite:  # has length
+            return self
+        if isinstance(self.expr, Prod) and (
+            (
+                isinstance(self.modulus, SequenceTerm)
+                and self.modulus.sequence == self.expr.sequence
+            )
+            or IsContainedIn(self.modulus, SeqSet(self.expr.sequence))
+            in self.modulus.knowledge_base
+        ):
+            return Constant(0)
+        if self.expr.sequence.nth_term is None:
+            return self.expr if self.expr_lt_modulus else self
+
+        n = Variable("mod_dummy_var", integer=True)
+        new_nth_term = Mod(self.expr.sequence.nth_term(n), self.modulus).evaluate()
+        if isinstance(new_nth_term, Mod) and new_nth_term.modulus == self.modulus:
+            new_nth_term = new_nth_term.expr
+        if new_nth_term == Constant(0):  # true for Sum and Prod
+            return Constant(0)
+        new_sequence = self.expr.sequence.__class__(
+            name=f"{self.expr.sequence.name} mod {self.modulus}",
+            nth_term=lambda ind: new_nth_term.replace({n: ind}),
+            integer=True,
+            length=self.expr.sequence.length,
+        )
+        if self.expr_lt_modulus:
+            return self.expr.__class__(new_sequence)
+        return Mod(self.expr.__class__(new_sequence), self.modulus)
 
     def to_sympy(self) -> sp.Basic:
         return sp.Mod(self.expr.to_sympy(), self.modulus.to_sympy())
@@ -263,3 +199,209 @@ class Mod(Expr):
                 else str(p)
             )
         return " mod ".join(map(wrap, self.args))
+
+
+# results of reduce_mod, keyed by (expr, modulus)
+MOD_CACHE_SIZE = 4096
+_mod_cache: OrderedDict[tuple[Term, Term], Term | None] = OrderedDict()
+
+# expanding (a + b)**n is skipped when the result would have more terms
+_MAX_EXPANDED_TERMS = 256
+
+# a polynomial with integer coefficients: monomial -> coefficient, where a
+# monomial is a sorted tuple of (atom index, exponent) pairs
+_Poly = dict[tuple[tuple[int, int], ...], int]
+
+
+def _cache_result(key: tuple[Term, Term], result: Term | None) -> None:
+    try:
+        journal_setitem(_mod_cache, key, result)
+    except TypeError:  # unhashable
+        return
+    if len(_mod_cache) > MOD_CACHE_SIZE:
+        _mod_cache.popitem(last=False)
+
+
+class _NotPolynomial(Exception):
+    pass
+
+
+class _PolyBuilder:
+    """
+    Converts integer-valued expressions built from integer constants, `Add`,
+    `Mul` and `Pow` with natural exponents into polynomials over their
+    remaining subterms (atoms), working modulo `modulus`:
+    subterms equal to the modulus are 0 and `Mod(e, modulus)` is `e`.
+    """
+
+    def __init__(self, modulus: Term | None = None) -> None:
+        self.modulus = modulus
+        self.atoms: list[Term] = []
+        self._atom_index: dict[Term, int] = {}
+
+    def atom(self, term: Term) -> _Poly:
+        if not term.is_integer:
+            raise _NotPolynomial(term)
+        index = self._atom_index.get(term)
+        if index is None:
+            index = len(self.atoms)
+            self.atoms.append(term)
+            self._atom_index[term] = index
+        return {((index, 1),): 1}
+
+    def convert(self, term: Term) -> _Poly:
+        from fractions import Fraction
+
+        from pylogic.constant import Constant
+        from pylogic.expressions.expr import Add, Mul, Pow
+
+        if self.modulus is not None and term == self.modulus:
+            return {}
+        if isinstance(term, Constant):
+            value = term.value
+            if isinstance(value, Fraction) and value.denominator == 1:
+                value = value.numerator
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise _NotPolynomial(term)
+            return {(): value} if value else {}
+        if isinstance(term, Add):
+            result: _Poly = {}
+            for arg in term.args:
+                _add_into(result, self.convert(arg))
+            return result
+        if isinstance(term, Mul):
+            result = {(): 1}
+            for arg in term.args:
+                result = _mul(result, self.convert(arg))
+                if not result:
+                    return result
+            return result
+        if isinstance(term, Pow):
+            exp = term.exp
+            if not (isinstance(exp, Constant) and isinstance(exp.value, int)):
+                return self.atom(term)
+            if exp.value < 0:
+                raise _NotPolynomial(term)
+            base = self.convert(term.base)
+            if len(base) > 1 and len(base) ** min(exp.value, 64) > _MAX_EXPANDED_TERMS:
+                return self.atom(Pow(self.to_expr(base), exp))
+            return _pow(base, exp.value)
+        if isinstance(term, Mod) and term.modulus == self.modulus:
+            return self.convert(term.expr)
+        return self.atom(term)
+
+    def to_expr(self, poly: _Poly) -> Term:
+        from pylogic.constant import Constant
+        from pylogic.expressions.expr import Add, Mul, Pow
+
+        terms = []
+        for mono in sorted(poly, key=lambda m: (-sum(e for _, e in m), m)):
+            coeff = poly[mono]
+            factors = [
+                self.atoms[i] if e == 1 else Pow(self.atoms[i], e) for i, e in mono
+            ]
+            if coeff != 1 or not factors:
+                factors.insert(0, Constant(coeff))
+            terms.append(factors[0] if len(factors) == 1 else Mul(*factors))
+        if not terms:
+            return Constant(0)
+        return terms[0] if len(terms) == 1 else Add(*terms)
+
+
+def _add_into(result: _Poly, other: _Poly, scale: int = 1) -> None:
+    for mono, coeff in other.items():
+        new = result.get(mono, 0) + scale * coeff
+        if new:
+            result[mono] = new
+        else:
+            result.pop(mono, None)
+
+
+def _mul_monos(a: tuple, b: tuple) -> tuple:
+    exps = dict(a)
+    for i, e in b:
+        exps[i] = exps.get(i, 0) + e
+    return tuple(sorted(exps.items()))
+
+
+def _mul(a: _Poly, b: _Poly) -> _Poly:
+    result: _Poly = {}
+    for mono_a, coeff_a in a.items():
+        for mono_b, coeff_b in b.items():
+            _add_into(result, {_mul_monos(mono_a, mono_b): coeff_a * coeff_b})
+    return result
+
+
+def _pow(base: _Poly, exp: int) -> _Poly:
+    if len(base) == 1:
+        ((mono, coeff),) = base.items()
+        return {tuple((i, e * exp) for i, e in mono): coeff**exp} if exp else {(): 1}
+    result: _Poly = {(): 1}
+    while exp:
+        if exp & 1:
+            result = _mul(result, base)
+        exp >>= 1
+        if exp:
+            base = _mul(base, base)
+    return result
+
+
+def _divides_mono(a: tuple, b: tuple) -> bool:
+    """Whether monomial a divides monomial b."""
+    exps = dict(b)
+    return all(exps.get(i, 0) >= e for i, e in a)
+
+
+def _reduce_poly(poly: _Poly, modulus: _Poly) -> _Poly:
+    """
+    Reduce `poly` modulo `modulus`, assuming all atoms are integers.
+    """
+    if len(modulus) == 1:
+        # c * m: any term k * m * r is congruent to (k mod c) * m * r
+        ((mod_mono, c),) = modulus.items()
+        c = abs(c)
+        result: _Poly = {}
+        for mono, coeff in poly.items():
+            if _divides_mono(mod_mono, mono):
+                coeff %= c
+            if coeff:
+                result[mono] = coeff
+        return result
+    # (x + y + z) mod (x + y) -> z: subtract a multiple of the modulus
+    # if every term of the modulus occurs in poly with the same ratio
+    ratios = set()
+    for mono, coeff in modulus.items():
+        if mono not in poly or poly[mono] % coeff:
+            return poly
+        ratios.add(poly[mono] // coeff)
+    if len(ratios) != 1:
+        return poly
+    result = dict(poly)
+    _add_into(result, modulus, scale=-ratios.pop())
+    return result
+
+
+def reduce_mod(expr: Term, modulus: Term) -> Term | None:
+    """
+    Simplify `expr` modulo `modulus` without sympy.
+    Coefficients are reduced modulo an integer modulus, and subterms
+    (including bases of powers) equal to the modulus vanish.
+    Returns an expression congruent to `expr`, or None if `expr` or `modulus`
+    are not integer polynomials.
+    """
+    from pylogic.constant import Constant
+
+    builder = _PolyBuilder(modulus)
+    try:
+        poly = builder.convert(expr)
+        # the modulus itself is read without the "modulus is 0" rule
+        builder.modulus = None
+        modulus_poly = builder.convert(modulus)
+    except _NotPolynomial:
+        return None
+    if not modulus_poly:
+        return None
+    poly = _reduce_poly(poly, modulus_poly)
+    if not poly or list(poly) == [()]:
+        return Constant(poly.get((), 0))
+    return builder.to_expr(poly)
@@ -6,6 +6,7 @@ import sympy as sp
 from sympy.functions.elementary.piecewise import ExprCondPair
 
 from pylogic.expressions.expr import Expr
+from pylogic.session import journal_update
 from pylogic.typing import Term
 
 if TYPE_CHECKING:
@@ -71,7 +72,7 @@ class PiecewiseExpr(Expr, Generic[*Ps]):
         disj = Or(exor_conds, conjunction)
         exor.is_assumption = True
         disj.is_assumption = True
-        self.knowledge_base.update({exor, disj})
+        journal_update(self.knowledge_base, (exor, disj))
         if self.branches is None:
             self.branches: tuple[*Ps] = branches
 
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import math
+from typing import TYPE_CHECKING
+
 from sympy.concrete.products import Product
 from sympy.core.mul import Mul
 
-from pylogic.expressions.sum import _Aggregate
+from pylogic.expressions.sum import _Aggregate, _ExpPoly
 from pylogic.structures.sequence import Sequence
 
+if TYPE_CHECKING:
+    from pylogic.typing import PythonNumeric
+
 
 class Prod(_Aggregate):
     """
@@ -41,6 +47,18 @@ class Prod(_Aggregate):
             sequence.is_nonpositive,
         )
 
+    def _fold(self, values: list[PythonNumeric]) -> PythonNumeric:
+        return math.prod(values)
+
+    def _closed_form(self, terms: _ExpPoly, length: int) -> PythonNumeric | None:
+        # only a single term c * n**k * r**n has a simple closed form
+        if len(terms) != 1:
+            return None
+        ((k, r), c), = terms.items()
+        if k > 0 and length > 0:
+            return 0  # the term for n = 0 is 0
+        return c**length * r ** (length * (length - 1) // 2)
+
     def to_sympy(self) -> Product | Mul:
         return super().to_sympy(_finite_class=Mul, _infinite_class=Product)  # type: ignore
 
@@ -91,14 +91,14 @@ class SequenceTerm(Expr, Generic[T]):
         from pylogic.constant import Constant
 
         indx = self.index.evaluate()
-        if indx in self.sequence.terms:
-            return self.sequence.terms[indx]
+        if isinstance(indx, Constant) and isinstance(indx.value, int):
+            # cached in self.sequence.terms
+            res = self.sequence.term(indx.value)
         elif self.sequence.nth_term and indx.is_natural:
-            if isinstance(indx, Constant) and isinstance(indx.value, int):
-                self.sequence.terms[indx] = self.sequence.nth_term(indx)
-                res = self.sequence.terms[indx]
-            else:
-                res = self.sequence.nth_term(indx)
+            res = self.sequence.nth_term(indx)
+        else:
+            res = None
+        if res is not None:
             if getattr(res, "is_set", False):
                 self._is_set = True
                 self.is_cartes_power = res.is_cartes_power
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import math
+from fractions import Fraction
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable
 
 import sympy as sp
 
@@ -9,6 +12,8 @@ from pylogic.typing import Term
 
 if TYPE_CHECKING:
     from pylogic.structures.sequence import Sequence
+    from pylogic.typing import PythonNumeric
+    from pylogic.variable import Variable
 
 
 class _Aggregate(Expr):
@@ -36,12 +41,81 @@ class _Aggregate(Expr):
         self.is_odd = sequence.is_odd
 
     def evaluate(self, **kwargs) -> Term:
+        from pylogic.constant import Constant
         from pylogic.sympy_helpers import sympy_to_pylogic
 
+        value = self._evaluate_natively()
+        if value is not None:
+            if isinstance(value, Fraction) and value.denominator == 1:
+                value = value.numerator
+            return Constant(value)
         try:
-            return sympy_to_pylogic(self.to_sympy().doit())
+            result = self.to_sympy().doit()
         except ValueError:
             return self
+        if result.has(sp.zoo, sp.nan):
+            # a term is undefined, eg 0**-1
+            return self
+        return sympy_to_pylogic(result)
+
+    def _evaluate_natively(self) -> PythonNumeric | None:
+        """
+        Evaluate a finite aggregate of concrete numbers without sympy.
+        Uses a closed form when the nth term is a polynomial or geometric
+        in n, and otherwise folds the terms. Returns None if the terms are
+        not concrete numbers or the length is not known.
+        """
+        from pylogic.constant import Constant
+        from pylogic.helpers import python_to_pylogic
+        from pylogic.structures.sequence import FiniteSequence
+        from pylogic.variable import Variable
+
+        sequence = self.sequence
+        if not isinstance(sequence, FiniteSequence):
+            return None
+        length = sequence.length
+        if not (isinstance(length, Constant) and isinstance(length.value, int)):
+            return None
+        length = length.value
+
+        initial = sequence.initial_terms
+        if sequence.nth_term is None:
+            if len(initial) != length:
+                return None
+            values = [_number(term) for term in initial]
+            if any(v is None for v in values):
+                return None
+            return self._fold(values)
+
+        func = None
+        if not sequence.recursive:
+            n = Variable("_aggregate_index", natural=True)
+            nth_term_expr = python_to_pylogic(sequence.nth_term(n))
+            closed = None if initial else _exp_poly(nth_term_expr, n)
+            if closed is not None:
+                value = self._closed_form(closed, length)
+                if value is not None:
+                    return value
+            func = _compile(nth_term_expr, n)
+        if func is None:
+            # terms are cached in sequence.terms
+            values = [_number(term) for term in sequence.terms_range(0, length)]
+        else:
+            values = [_number(term) for term in initial]
+            try:
+                values.extend(func(i) for i in range(len(initial), length))
+            except ZeroDivisionError:
+                # eg 0**-1, left to sympy
+                return None
+        if any(v is None for v in values):
+            return None
+        return self._fold(values)
+
+    def _fold(self, values: list[PythonNumeric]) -> PythonNumeric:
+        raise NotImplementedError
+
+    def _closed_form(self, terms: _ExpPoly, length: int) -> PythonNumeric | None:
+        return None
 
     def to_sympy(self, _finite_class=sp.Add, _infinite_class=sp.Sum) -> sp.Basic:
         from pylogic.structures.sequence import FiniteSequence
@@ -97,6 +171,15 @@ class Sum(_Aggregate):
         self._is_nonnegative = sequence.is_nonnegative
         self._is_nonpositive = sequence.is_nonpositive
 
+    def _fold(self, values: list[PythonNumeric]) -> PythonNumeric:
+        return sum(values)
+
+    def _closed_form(self, terms: _ExpPoly, length: int) -> PythonNumeric | None:
+        total = 0
+        for (k, r), coeff in terms.items():
+            total += coeff * _power_sum(k, r, length)
+        return total
+
     def _latex(self) -> str:
         return rf"\sum {self.sequence._latex()}"
 
@@ -105,3 +188,172 @@ class Sum(_Aggregate):
 
     def __str__(self) -> str:
         return f"Sum({self.sequence})"
+
+
+# c * n**k * r**n is stored as {(k, r): c}
+_ExpPoly = dict[tuple[int, int | Fraction], int | Fraction]
+
+# polynomials of higher degree are folded term by term
+_MAX_DEGREE = 64
+
+
+def _number(term: Term) -> PythonNumeric | None:
+    from pylogic.constant import Constant
+    from pylogic.helpers import is_python_numeric
+
+    if isinstance(term, Constant) and is_python_numeric(term.value):
+        if isinstance(term.value, bool):
+            return None
+        return term.value
+    return None
+
+
+def _exact(term: Term) -> int | Fraction | None:
+    value = _number(term)
+    if isinstance(value, (int, Fraction)):
+        return value
+    return None
+
+
+def _exp_poly(expr: Term, n: Variable) -> _ExpPoly | None:
+    """
+    Write `expr` as a sum of c * n**k * r**n with exact rational c and r,
+    or return None.
+    """
+    from pylogic.expressions.expr import Add, Mul, Pow
+
+    if expr == n:
+        return {(1, 1): 1}
+    value = _exact(expr)
+    if value is not None:
+        return {(0, 1): value} if value else {}
+    if isinstance(expr, Add):
+        result: _ExpPoly = {}
+        for arg in expr.args:
+            part = _exp_poly(arg, n)
+            if part is None:
+                return None
+            for key, c in part.items():
+                result[key] = result.get(key, 0) + c
+        return {key: c for key, c in result.items() if c}
+    if isinstance(expr, Mul):
+        result = {(0, 1): 1}
+        for arg in expr.args:
+            part = _exp_poly(arg, n)
+            if part is None:
+                return None
+            product: _ExpPoly = {}
+            for (k1, r1), c1 in result.items():
+                for (k2, r2), c2 in part.items():
+                    key = (k1 + k2, r1 * r2)
+                    if key[0] > _MAX_DEGREE:
+                        return None
+                    product[key] = product.get(key, 0) + c1 * c2
+            result = {key: c for key, c in product.items() if c}
+        return result
+    if isinstance(expr, Pow):
+        base = _exact(expr.base)
+        if base is not None and base != 0:
+            # r**(a*n + b) = r**b * (r**a)**n
+            exp = _exp_poly(expr.exp, n)
+            if exp is None or not set(exp) <= {(0, 1), (1, 1)}:
+                return None
+            a, b = exp.get((1, 1), 0), exp.get((0, 1), 0)
+            if not (isinstance(a, int) and isinstance(b, int)):
+                return None
+            return {(0, Fraction(base) ** a if a < 0 else base**a): Fraction(base) ** b}
+        exp = _exact(expr.exp)
+        if isinstance(exp, int) and 0 <= exp <= _MAX_DEGREE:
+            base_poly = _exp_poly(expr.base, n)
+            if base_poly is None:
+                return None
+            result = {(0, 1): 1}
+            for _ in range(exp):
+                result = _exp_poly_mul(result, base_poly)
+                if result is None:
+                    return None
+            return result
+    return None
+
+
+def _exp_poly_mul(a: _ExpPoly, b: _ExpPoly) -> _ExpPoly | None:
+    product: _ExpPoly = {}
+    for (k1, r1), c1 in a.items():
+        for (k2, r2), c2 in b.items():
+            if k1 + k2 > _MAX_DEGREE:
+                return None
+            key = (k1 + k2, r1 * r2)
+            product[key] = product.get(key, 0) + c1 * c2
+    return {key: c for key, c in product.items() if c}
+
+
+@lru_cache(maxsize=None)
+def _bernoulli(m: int) -> Fraction:
+    """Bernoulli numbers with B_1 = -1/2."""
+    if m == 0:
+        return Fraction(1)
+    return -sum(
+        (math.comb(m + 1, j) * _bernoulli(j) for j in range(m)), Fraction(0)
+    ) / (m + 1)
+
+
+def _power_sum(k: int, r: int | Fraction, length: int) -> int | Fraction:
+    """
+    sum of n**k * r**n for n = 0, ..., length - 1, in closed form.
+    """
+    if length <= 0:
+        return 0
+    if r == 1:
+        # Faulhaber's formula
+        total = sum(
+            (
+                math.comb(k + 1, j) * _bernoulli(j) * length ** (k + 1 - j)
+                for j in range(k + 1)
+            ),
+            Fraction(0),
+        ) / (k + 1)
+        return total
+    # (1 - r) T_k = [k == 0] - (length - 1)**k r**length
+    #     + sum_{j < k} C(k, j) (-1)**(k - j + 1) (T_j - [j == 0])
+    r_len = Fraction(r) ** length
+    sums: list[Fraction] = []
+    for m in range(k + 1):
+        rhs = (1 if m == 0 else 0) - Fraction(length - 1) ** m * r_len
+        for j in range(m):
+            rhs += math.comb(m, j) * (-1) ** (m - j + 1) * (sums[j] - (j == 0))
+        sums.append(rhs / (1 - Fraction(r)))
+    return sums[k]
+
+
+def _compile(expr: Term, n: Variable) -> Callable[[int], PythonNumeric] | None:
+    """
+    Compile an arithmetic expression in `n` to a python function, or return
+    None if it contains anything other than numbers, `n`, `Add`, `Mul` and `Pow`.
+    """
+    from pylogic.expressions.expr import Add, Mul, Pow
+
+    if expr == n:
+        return lambda i: i
+    value = _number(expr)
+    if value is not None:
+        return lambda i: value
+    if isinstance(expr, (Add, Mul)):
+        funcs = [_compile(arg, n) for arg in expr.args]
+        if any(f is None for f in funcs):
+            return None
+        if isinstance(expr, Add):
+            return lambda i: sum(f(i) for f in funcs)
+        return lambda i: math.prod(f(i) for f in funcs)
+    if isinstance(expr, Pow):
+        base, exp = _compile(expr.base, n), _compile(expr.exp, n)
+        if base is None or exp is None:
+            return None
+
+        def power(i: int) -> PythonNumeric:
+            b, e = base(i), exp(i)
+            if isinstance(b, int) and isinstance(e, int) and e < 0:
+                return Fraction(b) ** e
+            return b**e
+
+        return power
+    return None
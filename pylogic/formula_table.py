@@ -0,0 +1,454 @@
+"""
+Read-only, array-backed formula tables that processes can share.
+
+A `FormulaTable` stores the node table of `pylogic.serialize` (see
+`FormulaEncoder`) as flat arrays in a single buffer:
+
+- the kind (tag) of each node,
+- the child indices of each node, with an offset array,
+- for each node, the id of its template: the node with its references to
+  other nodes removed. Templates hold the class names, symbol names and
+  other plain values, and are interned, so the nodes of a large knowledge
+  base share a small number of them. Each template is stored separately as
+  JSON (see `pylogic.serialize.dumps_data`) and only loaded when a node that
+  uses it is read,
+- the indices of the root formulas.
+
+The buffer is only read through `memoryview`s, so a table in
+`multiprocessing.shared_memory` (see `SharedFormulaTable`) or in a
+memory-mapped file (see `FormulaTable.open`) is shared by all the processes
+that attach to it, without copying. Formulas are materialized lazily: `table[k]`
+decodes only the nodes of the `k`-th formula, and the nodes can be inspected
+with `kind`, `children` and `node` without building any pylogic object.
+
+Arrays use the native byte order, which is recorded in the header.
+"""
+
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from pylogic.serialize import dumps_data, loads_data
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+    from pylogic.serialize import Node
+
+MAGIC = b"PLFT"
+FORMAT_VERSION = 2
+# magic, version, byte order, number of nodes, children, roots and
+# templates, size of the encoded templates
+_HEADER = struct.Struct("<4sHHIIIIQ")
+_BYTE_ORDER = 1 if sys.byteorder == "little" else 2
+
+TAGS = (
+    "py",
+    "name",
+    "const",
+    "var",
+    "sym",
+    "expr",
+    "seq",
+    "set_",
+    "setof",
+    "prop",
+    "atom",
+    "list",
+    "tuple",
+    "set",
+    "frozenset",
+    "dict",
+    "fn",
+)
+_TAG_CODES = {tag: code for code, tag in enumerate(TAGS)}
+
+# the fields of each kind of node, after the tag: a plain value (v), a
+# tuple of references (R), keyword arguments as (name, reference) pairs (K)
+# or dict items as (reference, reference) pairs (D); see FormulaDecoder
+_SCHEMAS: dict[str, str] = {
+    "py": "v",
+    "name": "v",
+    "const": "v",
+    "var": "vvKvR",
+    "sym": "vvKvR",
+    "expr": "vRK",
+    "seq": "vRK",
+    "set_": "vK",
+    "setof": "vR",
+    "prop": "vRv",
+    "atom": "vvRv",
+    "list": "R",
+    "tuple": "R",
+    "set": "R",
+    "frozenset": "R",
+    "dict": "D",
+    "fn": "R",
+}
+
+
+def split_node(node: Node) -> tuple[tuple, list[int]]:
+    """
+    Split a node into its template and the indices of its children.
+    """
+    tag = node[0]
+    template: list[Any] = [tag]
+    children: list[int] = []
+    for field, value in zip(_SCHEMAS[tag], node[1:]):
+        if field == "v":
+            template.append(value)
+        elif field == "R":
+            template.append(len(value))
+            children.extend(value)
+        elif field == "K":
+            template.append(tuple(k for k, _ in value))
+            children.extend(ref for _, ref in value)
+        else:
+            template.append(len(value))
+            for k, v in value:
+                children.extend((k, v))
+    return tuple(template), children
+
+
+def join_node(template: tuple, children: Iterable[int]) -> Node:
+    """
+    Inverse of `split_node`.
+    """
+    tag = template[0]
+    refs = iter(children)
+    node: list[Any] = [tag]
+    for field, value in zip(_SCHEMAS[tag], template[1:]):
+        if field == "v":
+            node.append(value)
+        elif field == "R":
+            node.append(tuple(next(refs) for _ in range(value)))
+        elif field == "K":
+            node.append(tuple((k, next(refs)) for k in value))
+        else:
+            node.append(tuple((next(refs), next(refs)) for _ in range(value)))
+    return tuple(node)
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def pack_nodes(nodes: list[Node], roots: Iterable[int]) -> bytes:
+    """
+    Pack a node table and the indices of its root formulas into the buffer
+    of a `FormulaTable`.
+    """
+    kinds = array("B")
+    template_ids = array("I")
+    offsets = array("I", [0])
+    children = array("I")
+    index: dict[tuple, int] = {}
+    blobs: list[bytes] = []
+    for node in nodes:
+        template, refs = split_node(node)
+        # include the types of the values so that eg 1 and True differ
+        key = (template, tuple(map(type, template)))
+        tid = index.get(key)
+        if tid is None:
+            tid = index[key] = len(blobs)
+            blobs.append(dumps_data(template))
+        kinds.append(_TAG_CODES[node[0]])
+        template_ids.append(tid)
+        children.extend(refs)
+        offsets.append(len(children))
+    root_array = array("I", roots)
+    blob_offsets = array("Q", [0])
+    for blob in blobs:
+        blob_offsets.append(blob_offsets[-1] + len(blob))
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        _BYTE_ORDER,
+        len(nodes),
+        len(children),
+        len(root_array),
+        len(blobs),
+        blob_offsets[-1],
+    )
+    parts = [header]
+    for part in (kinds, template_ids, offsets, children, root_array, blob_offsets):
+        data = part.tobytes()
+        parts.append(data + bytes(_align(len(data)) - len(data)))
+    parts.extend(blobs)
+    return b"".join(parts)
+
+
+def pack_formulas(formulas: Iterable[Any]) -> bytes:
+    """
+    Encode `formulas` and pack them into the buffer of a `FormulaTable`.
+    """
+    from pylogic.serialize import FormulaEncoder
+
+    encoder = FormulaEncoder()
+    roots = encoder.encode_all(formulas)
+    return pack_nodes(encoder.nodes, roots)
+
+
+class _Nodes:
+    """
+    The nodes of a table as a lazy sequence, for `FormulaDecoder`.
+    """
+
+    def __init__(self, table: FormulaTable) -> None:
+        self.table = table
+
+    def __len__(self) -> int:
+        return self.table.node_count
+
+    def __getitem__(self, index: int) -> Node:
+        return self.table.node(index)
+
+
+class FormulaTable:
+    """
+    A read-only formula table over a buffer made by `pack_formulas`. See the
+    module docstring.
+
+    Parameters
+    ----------
+    buffer: Any
+        An object supporting the buffer protocol, like `bytes`, an `mmap`
+        or the `buf` of a `SharedMemory`. It is not copied.
+
+    Attributes
+    ----------
+    node_count: int
+        Number of nodes.
+    roots: memoryview
+        Index of the node of each formula.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        from pylogic.serialize import FormulaDecoder
+
+        self._buffer = buffer
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("The buffer is too small for a formula table")
+        (
+            magic,
+            version,
+            byte_order,
+            nodes,
+            children,
+            roots,
+            templates,
+            blob_size,
+        ) = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("The buffer does not hold a formula table")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported formula table version {version}")
+        if byte_order != _BYTE_ORDER:
+            raise ValueError("The formula table was written with another byte order")
+        self.node_count = nodes
+        self._views: list[memoryview] = [view]
+        position = _HEADER.size
+
+        def take(fmt: str, count: int, itemsize: int) -> memoryview:
+            nonlocal position
+            size = count * itemsize
+            part = view[position : position + size].cast(fmt)
+            self._views.append(part)
+            position += _align(size)
+            return part
+
+        self._kinds = take("B", nodes, 1)
+        self._templates = take("I", nodes, 4)
+        self._offsets = take("I", nodes + 1, 4)
+        self._children = take("I", children, 4)
+        self.roots = take("I", roots, 4)
+        self._blob_offsets = take("Q", templates + 1, 8)
+        self._blobs = view[position : position + blob_size]
+        self._views.append(self._blobs)
+        if len(self._blobs) != blob_size:
+            raise ValueError("The formula table is truncated")
+        self._template_cache: dict[int, tuple] = {}
+        self._decoder = FormulaDecoder(_Nodes(self))  # type: ignore
+
+    @classmethod
+    def from_formulas(cls, formulas: Iterable[Any]) -> FormulaTable:
+        """
+        A table of `formulas`, in this process' memory.
+        """
+        return cls(pack_formulas(formulas))
+
+    @classmethod
+    def open(cls, path: str) -> FormulaTable:
+        """
+        Map the table in the file `path` (see `write`) into memory.
+        """
+        import mmap
+
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @staticmethod
+    def write(path: str, formulas: Iterable[Any]) -> None:
+        """
+        Write a table of `formulas` to the file `path`.
+        """
+        with open(path, "wb") as f:
+            f.write(pack_formulas(formulas))
+
+    def __len__(self) -> int:
+        return len(self.roots)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(formulas={len(self)}, nodes={self.node_count})"
+
+    def __getitem__(self, index: int) -> Any:
+        """
+        The `index`-th formula, decoded on first access.
+        """
+        return self._decoder.decode(self.roots[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __enter__(self) -> FormulaTable:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def kind(self, index: int) -> str:
+        """
+        The tag of node `index`.
+        """
+        return TAGS[self._kinds[index]]
+
+    def children(self, index: int) -> tuple[int, ...]:
+        """
+        The indices of the children of node `index`.
+        """
+        # a copy: a view of the buffer would keep it from being closed
+        return tuple(self._children[self._offsets[index] : self._offsets[index + 1]])
+
+    def template(self, index: int) -> tuple:
+        """
+        The template of node `index` (see `split_node`).
+        """
+        tid = self._templates[index]
+        template = self._template_cache.get(tid)
+        if template is None:
+            start, end = self._blob_offsets[tid], self._blob_offsets[tid + 1]
+            template = self._template_cache[tid] = loads_data(self._blobs[start:end])
+        return template
+
+    def node(self, index: int) -> Node:
+        """
+        Node `index`, as in the node table of `FormulaEncoder`.
+        """
+        return join_node(self.template(index), self.children(index))
+
+    def decode(self, index: int) -> Any:
+        """
+        The object of node `index`. Objects are decoded once per table.
+        """
+        return self._decoder.decode(index)
+
+    def build(self, index: int) -> Any:
+        """
+        A new object for node `index`, see `FormulaDecoder.build`.
+        """
+        return self._decoder.build(index)
+
+    def close(self) -> None:
+        """
+        Release the views of the buffer, so that it can be closed.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        close = getattr(self._buffer, "close", None)
+        if close is not None:
+            close()
+
+
+class SharedFormulaTable(FormulaTable):
+    """
+    A `FormulaTable` in shared memory. The process that creates it (with
+    `create`) owns the memory and unlinks it when the table is closed; other
+    processes `attach` to it by name.
+
+    Attributes
+    ----------
+    name: str
+        The name of the shared memory block.
+    """
+
+    def __init__(self, shm: SharedMemory, owner: bool = False) -> None:
+        self._shm = shm
+        self._owner = owner
+        self.name = shm.name
+        super().__init__(shm.buf)
+
+    @classmethod
+    def create(cls, formulas: Iterable[Any]) -> SharedFormulaTable:
+        """
+        Pack `formulas` into a new shared memory block.
+        """
+        from multiprocessing import shared_memory
+
+        data = pack_formulas(formulas)
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        shm.buf[: len(data)] = data
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SharedFormulaTable:
+        """
+        Attach to the table created by another process.
+        """
+        from multiprocessing import shared_memory
+
+        return cls(shared_memory.SharedMemory(name=name))
+
+    def close(self) -> None:
+        self._template_cache.clear()
+        try:
+            for view in reversed(self._views):
+                view.release()
+            self._views.clear()
+            self._shm.close()
+        finally:
+            # the name is freed even if the memory is still in use
+            if self._owner:
+                self._shm.unlink()
+                self._owner = False
+
+
+# the table of a worker process, set by init_worker
+_worker_table: SharedFormulaTable | None = None
+
+
+def init_worker(name: str) -> None:
+    """
+    Pool initializer that attaches the worker to the shared table `name`,
+    which `worker_table` then returns. For example::
+
+        with SharedFormulaTable.create(kb) as table:
+            with Pool(initializer=init_worker, initargs=(table.name,)) as pool:
+                ...
+    """
+    global _worker_table
+    _worker_table = SharedFormulaTable.attach(name)
+
+
+def worker_table() -> SharedFormulaTable:
+    """
+    The table attached by `init_worker`.
+    """
+    assert _worker_table is not None, "worker was not initialized"
+    return _worker_table
@@ -20,6 +20,7 @@ from typing import (
 
 from pylogic.expressions.expr import Expr
 from pylogic.expressions.expr import replace as _replace
+from pylogic.session import journal_add, journal_append
 
 T = TypeVar("T")
 U = TypeVar("U")
@@ -209,30 +210,21 @@ def eval_same(x: Any, y: Any) -> bool:
     return x == y
 
 
-# TODO: Change unification so that we cannot prove
-# P(x) from forall x: P(1).
 def unify(
-    a: Proposition | Term, b: Proposition | Term
+    a: Proposition | Term,
+    b: Proposition | Term,
+    variables: Container[Variable] | None = None,
 ) -> Unification | Literal[True] | None:
-    """Unification algorithm."""
-    from pylogic.proposition.proposition import Proposition
-    from pylogic.variable import Variable
+    """
+    Unification algorithm, see :py:mod:`pylogic.unification`.
+
+    Only `variables` (by default, all variables) are instantiated. Returns
+    a `Unification` mapping variables to terms, True if `a` and `b` are
+    equal, or None if they do not unify.
+    """
+    from pylogic.unification import unify as _unify
 
-    # a is the variable if at least one argument is a variable
-    if isinstance(b, Variable) and not isinstance(a, Variable):
-        return unify(b, a)
-    # Variable and Term
-    if isinstance(a, Variable) and not isinstance(b, Proposition):
-        return True if a == b else {a: b}
-    # Expr and Expr
-    if isinstance(a, Expr) and isinstance(b, Expr):
-        return a.unify(b)
-    # Term and Term
-    if not isinstance(a, Proposition) and not isinstance(b, Proposition):
-        return True if a == b else None
-    # Proposition and Proposition
-    if isinstance(a, Proposition) and isinstance(b, Proposition):
-        return a.unify(b)
+    return _unify(a, b, variables)  # type: ignore
 
 
 def type_check(arg: Any, *types: type, context: Any = None) -> Literal[True]:
@@ -574,19 +566,9 @@ def is_prime(num: int | Fraction | Constant[int] | Constant[Fraction]) -> bool:
     if not isinstance(num, int):
         return False
 
-    if num <= 1:
-        return False
-    if num == 2:
-        return True
-    if num % 2 == 0:
-        return False
+    from pylogic.number_theory import is_prime as _is_prime
 
-    i = 3
-    while i < num**0.5 + 1:
-        if num % i == 0:
-            return False
-        i += 2
-    return True
+    return _is_prime(num)
 
 
 def Rational(
@@ -830,8 +812,8 @@ def _add_assumption_props(
                 add_to_context=attr in explicit_assumptions_attrs,
                 context=context,
             )
-            term.properties_of_each_term.append(prop1)
-            term.knowledge_base.add(prop1)
+            journal_append(term.properties_of_each_term, prop1)
+            journal_add(term.knowledge_base, prop1)
 
         if (term.is_sequence or term.is_set) and attr not in {
             "real",
@@ -859,7 +841,7 @@ def _add_assumption_props(
                 add_to_context=attr in explicit_assumptions_attrs,
                 context=context,
             )
-        term.knowledge_base.add(prop)
+        journal_add(term.knowledge_base, prop)
 
 
 def _add_assumption_attributes(term: Symbol | Set | Sequence, kwargs) -> None:
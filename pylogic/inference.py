@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import time
+from contextvars import ContextVar
 from typing import TYPE_CHECKING, Generic, TypeVar, TypeVarTuple
 
 from pylogic.proposition.proposition import Proposition
@@ -115,10 +117,35 @@ rules: set[str] = {
 }
 
 
+class _RuleTimer:
+    """
+    Measures the time between consecutive inferences.
+    """
+
+    def __init__(self) -> None:
+        self.last = time.perf_counter()
+
+    def lap(self) -> float:
+        now = time.perf_counter()
+        elapsed = now - self.last
+        self.last = now
+        return elapsed
+
+
+# the timer of the current thread or task, set by
+# pylogic.proofs.profile.record_timings
+_rule_timer: ContextVar[_RuleTimer | None] = ContextVar(
+    "pylogic_rule_timer", default=None
+)
+
+
 class Inference:
     """
     Represents an inference in a proof.
 
+    While timings are recorded (see `pylogic.proofs.profile.record_timings`),
+    `duration` is the time in seconds since the previous inference was made.
+
     Raises:
         InvalidRuleError: if the rule is not in the set of valid rules
     """
@@ -145,6 +172,8 @@ class Inference:
         self.conclusion: Proposition | None = conclusion
         self.rule: str = rule  # type:ignore
         self.inner_contexts: list[AssumptionsContext] = inner_contexts or []
+        timer = _rule_timer.get()
+        self.duration: float | None = timer.lap() if timer is not None else None
 
     def __repr__(self) -> str:
         has_inner_contexts = len(self.inner_contexts) > 0
@@ -49,11 +49,14 @@ def by_forall(p: P, prover: Forall[Proposition] | ForallInSet[Proposition]) -> P
     from pylogic.inference import Inference
     from pylogic.proposition.proposition import get_assumptions
     from pylogic.proposition.quantified.forall import Forall, ForallInSet
+    from pylogic.unification import match
 
     # We dig till the firt non-Forall proposition
     layer = prover
     p_type = type(p)
+    variables = []
     while isinstance(layer, Forall):
+        variables.append(layer.variable)
         match layer:
             case ForallInSet():
                 layer = layer._inner_without_set
@@ -64,7 +67,9 @@ def by_forall(p: P, prover: Forall[Proposition] | ForallInSet[Proposition]) -> P
     # we cannot prove p using prover
     if type(layer) != p_type:
         raise ValueError(f"Cannot prove {p} using {prover}")
-    unification = layer.unify(p)  # type: ignore
+    # only the quantified variables are instantiated: P(x) does not follow
+    # from forall y: P(1)
+    unification = match(layer, p, variables)
     if unification is None:
         raise ValueError(f"Cannot prove {p} using {prover}")
     # this function needs testing to ensure we are
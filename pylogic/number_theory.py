@@ -0,0 +1,190 @@
+"""
+Integer arithmetic used when inspecting constants: primality, factorization,
+divisibility, gcd and lcm. Everything here works on python ints.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from functools import lru_cache
+
+# primes below this bound are looked up in a sieve
+SIEVE_LIMIT = 1 << 16
+
+# Miller-Rabin with these bases is deterministic for n < 3.3e24
+# (Sorenson and Webster), which covers all 64-bit integers
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_DETERMINISTIC_BOUND = 3317044064679887385961981
+
+_sieve: bytearray | None = None
+_small_primes: list[int] = []
+
+
+def sieve(limit: int) -> bytearray:
+    """
+    Sieve of Eratosthenes. `result[n]` is 1 if n is prime, for 0 <= n < limit.
+    """
+    flags = bytearray([1]) * limit
+    flags[: min(limit, 2)] = bytes(min(limit, 2))
+    for p in range(2, math.isqrt(limit - 1) + 1 if limit > 1 else 0):
+        if flags[p]:
+            flags[p * p :: p] = bytes(len(range(p * p, limit, p)))
+    return flags
+
+
+def small_primes() -> list[int]:
+    """
+    The primes below `SIEVE_LIMIT`. Computed once and cached.
+    """
+    global _sieve
+    if _sieve is None:
+        _sieve = sieve(SIEVE_LIMIT)
+        _small_primes.extend(i for i, flag in enumerate(_sieve) if flag)
+    return _small_primes
+
+
+# composites above the sieve are usually caught by one of these primes
+# (the 50 primes below 230) before Miller-Rabin runs
+_TRIAL_PRIMES = tuple(i for i, flag in enumerate(sieve(230)) if flag)
+
+
+def _miller_rabin(n: int, bases: tuple[int, ...]) -> bool:
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n: int) -> bool:
+    """
+    Primality test. Deterministic Miller-Rabin for n < 3.3e24; larger n
+    use sympy's Baillie-PSW test, which has no known counterexamples.
+    """
+    if n < SIEVE_LIMIT:
+        if n < 2:
+            return False
+        small_primes()
+        return bool(_sieve[n])  # type: ignore
+    for p in _TRIAL_PRIMES:
+        if n % p == 0:
+            return False
+    if n < _MR_DETERMINISTIC_BOUND:
+        return _miller_rabin(n, _MR_BASES)
+    from sympy import isprime
+
+    return bool(isprime(n))
+
+
+def _pollard_rho_brent(n: int) -> int:
+    """
+    Return a nontrivial factor of the odd composite `n` (Brent's variant of
+    Pollard's rho method).
+    """
+    rng = random.Random(n)
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+@lru_cache(maxsize=1024)
+def _factor(n: int) -> tuple[tuple[int, int], ...]:
+    factors: dict[int, int] = {}
+    for p in small_primes():
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = _pollard_rho_brent(m)
+        stack.extend((d, m // d))
+    return tuple(sorted(factors.items()))
+
+
+def factorize(n: int) -> dict[int, int]:
+    """
+    Prime factorization of `n` as {prime: multiplicity}, by trial division
+    by the primes below `SIEVE_LIMIT` and Pollard's rho method for the rest.
+    Negative numbers get the factor -1. Results are cached.
+    """
+    if n == 0:
+        raise ValueError("0 has no prime factorization")
+    factors = dict(_factor(abs(n)))
+    if n < 0:
+        factors[-1] = 1
+    return factors
+
+
+def divisors(n: int) -> list[int]:
+    """
+    The positive divisors of `n`, in increasing order.
+    """
+    result = [1]
+    for p, k in factorize(n).items():
+        if p == -1:
+            continue
+        result = [d * p**e for d in result for e in range(k + 1)]
+    return sorted(result)
+
+
+def divides(a: int, b: int) -> bool:
+    """
+    Whether `a` divides `b`, ie b = a * k for some integer k.
+    """
+    if a == 0:
+        return b == 0
+    return b % a == 0
+
+
+def gcd(*nums: int) -> int:
+    """
+    Greatest common divisor of integers, by Euclid's algorithm
+    (faster than comparing factorizations).
+    """
+    return math.gcd(*nums)
+
+
+def lcm(*nums: int) -> int:
+    """
+    Least common multiple of integers.
+    """
+    return math.lcm(*nums)
@@ -0,0 +1,533 @@
+"""
+Compact, pickle-safe archives of proofs.
+
+A proof is the graph of propositions linked through their `deduced_from`
+inferences. A `ProofArchive` stores it as
+
+- a node table of hash-consed formulas (see `pylogic.serialize`),
+- a list of steps, one per proposition object in the proof. A step is a tuple
+  `(formula, rule, premises, contexts, assumptions, flags)` where `formula`
+  is a node index, `rule` is a name from `pylogic.inference.rules` (None if
+  the proposition was not deduced), `premises` are indices of earlier steps,
+  `contexts` are indices of context blocks, `assumptions` are the indices of
+  the steps in `from_assumptions` (None if these are exactly the assumptions
+  of the premises, which is the common case) and `flags` is a bitmask of
+  `PROVEN`, `ASSUMPTION`, `AXIOM` and `TODO`,
+- a list of `AssumptionsContext` blocks. A block is a tuple
+  `(name, auto_conclude, assumptions, conclusions, proven)` where
+  `assumptions` holds `("step", index)` or `("term", node)` pairs (assumed
+  propositions and context variables), `conclusions` are the steps proven
+  inside the context that were turned into its proven propositions, and
+  `proven` are the steps of those propositions, the steps that close the
+  context.
+
+Steps are topologically ordered: premises, assumptions and the blocks of a
+step always come before it, and the contents of a block come before the block.
+The exceptions are a `todo` step, whose premise is itself, and the `proven`
+steps of a block, which use the block and so come after it.
+
+`ProofArchive.dumps` stores the archive as JSON (see
+`pylogic.serialize.dumps_data`) and `ProofArchive.loads` rejects archives
+whose nodes name objects outside pylogic, so archives from other machines can
+be loaded safely.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, Any, Container, Iterable
+
+if TYPE_CHECKING:
+    from pylogic.assumptions_context import AssumptionsContext
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.serialize import FormulaDecoder, FormulaEncoder, Node
+
+PROOF_FORMAT = 2
+
+# step flags
+PROVEN = 1
+ASSUMPTION = 2
+AXIOM = 4
+TODO = 8
+
+Step = tuple  # (formula, rule, premises, contexts, assumptions, flags)
+ContextBlock = tuple  # (name, auto_conclude, assumptions, conclusions, proven)
+
+
+class ProofArchive:
+    """
+    A serialized proof. See the module docstring for the layout.
+
+    Parameters
+    ----------
+    nodes: list[Node]
+        The formula node table.
+    steps: list[Step]
+        The steps of the proof, in topological order.
+    contexts: list[ContextBlock]
+        The assumptions contexts used in the proof.
+    roots: tuple[int, ...]
+        The steps of the conclusions that were archived.
+    """
+
+    __slots__ = ("nodes", "steps", "contexts", "roots")
+
+    def __init__(
+        self,
+        nodes: list[Node],
+        steps: list[Step],
+        contexts: list[ContextBlock],
+        roots: tuple[int, ...],
+    ) -> None:
+        self.nodes = nodes
+        self.steps = steps
+        self.contexts = contexts
+        self.roots = roots
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __repr__(self) -> str:
+        return (
+            f"ProofArchive({len(self.steps)} steps, {len(self.contexts)} contexts, "
+            f"{len(self.nodes)} nodes)"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ProofArchive):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        The archive as a dict made only of builtin types.
+        """
+        return {
+            "format": PROOF_FORMAT,
+            "nodes": self.nodes,
+            "steps": self.steps,
+            "contexts": self.contexts,
+            "roots": self.roots,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ProofArchive:
+        if data.get("format") != PROOF_FORMAT:
+            raise ValueError(f"Unsupported proof format {data.get('format')!r}")
+        return cls(
+            list(data["nodes"]),
+            list(data["steps"]),
+            list(data["contexts"]),
+            tuple(data["roots"]),
+        )
+
+    def dumps(self, compress: bool = True) -> bytes:
+        """
+        Serialize the archive to bytes, compressed with zlib by default.
+        """
+        from pylogic.serialize import dumps_data
+
+        data = dumps_data(self.to_dict())
+        return zlib.compress(data) if compress else data
+
+    @classmethod
+    def loads(cls, data: bytes) -> ProofArchive:
+        """
+        Inverse of `dumps`. Accepts compressed and uncompressed data. Raises
+        ValueError for invalid data and for archives that refer to objects
+        outside pylogic (see `pylogic.serialize.check_nodes`).
+        """
+        from pylogic.serialize import check_nodes, loads_data
+
+        try:
+            data = zlib.decompress(data)
+        except zlib.error:
+            pass
+        data = loads_data(data)
+        if not isinstance(data, dict):
+            raise ValueError("Invalid proof archive")
+        archive = cls.from_dict(data)
+        check_nodes(archive.nodes)
+        return archive
+
+    def rules(self) -> dict[str, int]:
+        """
+        The number of steps using each rule.
+        """
+        counts: dict[str, int] = {}
+        for step in self.steps:
+            if step[1] is not None:
+                counts[step[1]] = counts.get(step[1], 0) + 1
+        return counts
+
+
+def _flags(prop: Proposition) -> int:
+    flags = 0
+    if prop._is_proven:
+        flags |= PROVEN
+    if prop.is_assumption:
+        flags |= ASSUMPTION
+    if prop.is_axiom:
+        flags |= AXIOM
+    if getattr(prop, "is_todo", False):
+        flags |= TODO
+    return flags
+
+
+def context_conclusions(context: AssumptionsContext) -> list[Proposition]:
+    """
+    The propositions proven inside `context` that were turned into its
+    proven propositions, in the same order.
+    """
+    if context._interesting_conclusions:
+        return list(context._interesting_conclusions)
+    if context.auto_conclude:
+        return context._proven[-1:]
+    return []
+
+
+class ProofEncoder:
+    """
+    Encodes proofs into a `ProofArchive`. Propositions and contexts shared
+    between the proofs of several conclusions are stored once.
+
+    Parameters
+    ----------
+    formulas: FormulaEncoder | None
+        The encoder used for formulas. A new one is created by default.
+    """
+
+    def __init__(self, formulas: FormulaEncoder | None = None) -> None:
+        from pylogic.serialize import FormulaEncoder
+
+        self.formulas: FormulaEncoder = formulas or FormulaEncoder()
+        self.steps: list[Step] = []
+        self.contexts: list[ContextBlock] = []
+        self.roots: list[int] = []
+        # id(obj) -> (obj, index); obj is kept alive so that ids are not reused
+        self._step_index: dict[int, tuple[Proposition, int]] = {}
+        self._context_index: dict[int, tuple[AssumptionsContext, int]] = {}
+        # step index -> ids of the assumptions it depends on
+        self._assumption_ids: list[frozenset[int]] = []
+        # blocks whose proven steps are not encoded yet
+        self._unfinished: list[tuple[AssumptionsContext, int]] = []
+
+    def _dependencies(self, prop: Proposition) -> list[Proposition]:
+        from pylogic.proposition.proposition import Proposition
+
+        deps: list[Proposition] = []
+        inference = prop.deduced_from
+        if inference is not None:
+            deps.extend(p for p in inference.premises if p is not prop)
+            for context in inference.inner_contexts:
+                if id(context) in self._context_index:
+                    continue
+                deps.extend(
+                    a for a in context.assumptions if isinstance(a, Proposition)
+                )
+                deps.extend(context_conclusions(context))
+        # from_assumptions are usually those of the premises; others are
+        # added by _add_step
+        return deps
+
+    def add(self, prop: Proposition) -> int:
+        """
+        Encode the proof of `prop` and return the index of its step.
+        """
+        # iterative depth-first search, so that long proofs do not hit the
+        # recursion limit
+        in_progress: set[int] = set()
+        stack: list[tuple[Proposition, bool]] = [(prop, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if id(current) in self._step_index:
+                continue
+            if expanded:
+                in_progress.discard(id(current))
+                self._add_step(current)
+                continue
+            if id(current) in in_progress:
+                raise ValueError(f"The proof of {current} is cyclic")
+            in_progress.add(id(current))
+            stack.append((current, True))
+            for dep in reversed(self._dependencies(current)):
+                if id(dep) not in self._step_index:
+                    stack.append((dep, False))
+        return self._step_index[id(prop)][1]
+
+    def add_root(self, prop: Proposition) -> int:
+        """
+        Encode the proof of `prop` and record it as one of the conclusions
+        of the archive.
+        """
+        index = self.add(prop)
+        self.roots.append(index)
+        return index
+
+    def add_context(self, context: AssumptionsContext) -> int:
+        """
+        Encode `context`, with the proofs of its assumptions and conclusions,
+        and return the index of its block.
+        """
+        from pylogic.proposition.proposition import Proposition
+
+        for a in context.assumptions:
+            if isinstance(a, Proposition):
+                self.add(a)
+        for p in context_conclusions(context):
+            self.add(p)
+        index = self._add_context(context)
+        self._finish_contexts()
+        return index
+
+    def _step(self, prop: Proposition) -> int:
+        return self._step_index[id(prop)][1]
+
+    def _add_context(self, context: AssumptionsContext) -> int:
+        from pylogic.proposition.proposition import Proposition
+
+        seen = self._context_index.get(id(context))
+        if seen is not None:
+            return seen[1]
+        assumptions = tuple(
+            (
+                ("step", self._step(a))
+                if isinstance(a, Proposition)
+                else ("term", self.formulas.encode(a))
+            )
+            for a in context.assumptions
+        )
+        block = (
+            context.name,
+            context.auto_conclude,
+            assumptions,
+            tuple(self._step(p) for p in context_conclusions(context)),
+            (),
+        )
+        index = len(self.contexts)
+        self.contexts.append(block)
+        self._context_index[id(context)] = (context, index)
+        self._unfinished.append((context, index))
+        return index
+
+    def _finish_contexts(self) -> None:
+        # the proven propositions of a context are deduced from it, so they
+        # are encoded after its block
+        while self._unfinished:
+            context, index = self._unfinished.pop()
+            proven = tuple(self.add(p) for p in context.proven_propositions)
+            self.contexts[index] = self.contexts[index][:4] + (proven,)
+
+    def _add_step(self, prop: Proposition) -> int:
+        from pylogic.proposition.proposition import get_assumptions
+
+        inference = prop.deduced_from
+        premise_props = inference.premises if inference is not None else ()
+        ids = frozenset(map(id, get_assumptions(prop)))
+        inherited = frozenset().union(
+            *(self._assumption_ids[self._step(p)] for p in premise_props if p is not prop)
+        )
+        if prop.is_assumption or ids == inherited:
+            assumptions = None
+        else:
+            assumptions = tuple(sorted(self.add(a) for a in prop.from_assumptions))
+
+        index = len(self.steps)
+        if inference is None:
+            rule, premises, contexts = None, (), ()
+        else:
+            rule = inference.rule
+            premises = tuple(index if p is prop else self._step(p) for p in premise_props)
+            contexts = tuple(self._add_context(c) for c in inference.inner_contexts)
+        step = (
+            self.formulas.encode(prop),
+            rule,
+            premises,
+            contexts,
+            assumptions,
+            _flags(prop),
+        )
+        self.steps.append(step)
+        self._assumption_ids.append(ids)
+        self._step_index[id(prop)] = (prop, index)
+        return index
+
+    def archive(self) -> ProofArchive:
+        self._finish_contexts()
+        return ProofArchive(
+            self.formulas.nodes, self.steps, self.contexts, tuple(self.roots)
+        )
+
+
+class ProofDecoder:
+    """
+    Rebuilds propositions, inferences and contexts from a `ProofArchive`.
+    Steps are decoded on demand and memoized.
+
+    Decoding has no side effects: the rebuilt propositions are not added to
+    the current assumptions context or to the knowledge bases of their terms.
+    """
+
+    def __init__(self, archive: ProofArchive) -> None:
+        from pylogic.serialize import FormulaDecoder
+
+        self.archive = archive
+        self.formulas: FormulaDecoder = FormulaDecoder(archive.nodes)
+        self._props: dict[int, Proposition] = {}
+        self._contexts: dict[int, AssumptionsContext] = {}
+
+    def proposition(self, index: int) -> Proposition:
+        """
+        Return the proposition of step `index`, with its inference.
+        """
+        prop = self._props.get(index)
+        if prop is not None:
+            return prop
+        # decode the steps this one depends on first, without recursion
+        for i in required_steps(self.archive, [index], known=self._props):
+            # decoding a context may have decoded later steps already
+            if i not in self._props:
+                self._build_step(i)
+        return self._props[index]
+
+    def use(self, index: int, prop: Proposition) -> None:
+        """
+        Use `prop` as the proposition of step `index` instead of rebuilding
+        it, eg to attach a proof to existing premises. Must be called before
+        decoding the steps that depend on `index`.
+        """
+        self._props[index] = prop
+
+    def _build_step(self, index: int) -> Proposition:
+        from pylogic.inference import Inference
+        from pylogic.proposition.proposition import get_assumptions
+
+        formula, rule, premises, context_refs, assumptions, flags = (
+            self.archive.steps[index]
+        )
+        # a new object for each step, even if the formula is shared
+        prop = self.formulas.build(formula)
+        self._props[index] = prop
+        prop._is_proven = bool(flags & PROVEN)
+        prop.is_assumption = bool(flags & ASSUMPTION)
+        prop.is_axiom = bool(flags & AXIOM)
+        prop.is_todo = bool(flags & TODO)
+        if prop.is_assumption:
+            prop.from_assumptions = set()
+        elif assumptions is None:
+            # union keeps the stored hashes, which are slow to recompute
+            prop.from_assumptions = set().union(
+                *(get_assumptions(self._props[p]) for p in premises if p != index)
+            )
+        else:
+            prop.from_assumptions = {self._props[a] for a in assumptions}
+        if rule is not None:
+            premise_props = [self._props[p] for p in premises] or [None]
+            prop.deduced_from = Inference(
+                *premise_props,  # type: ignore
+                conclusion=prop,
+                rule=rule,
+                inner_contexts=[self.context(c) for c in context_refs],
+            )
+        else:
+            prop.deduced_from = None
+        return prop
+
+    def context(self, index: int) -> AssumptionsContext:
+        """
+        Return the assumptions context of block `index`. The context is
+        closed and is not registered as an open context. Its proven
+        propositions are the decoded steps that close it.
+        """
+        from pylogic.assumptions_context import AssumptionsContext
+
+        context = self._contexts.get(index)
+        if context is not None:
+            return context
+        name, auto_conclude, assumptions, conclusions, proven = self.archive.contexts[
+            index
+        ]
+        # bypass __init__, which opens the context
+        context = AssumptionsContext.__new__(AssumptionsContext)
+        context.name = name
+        context.auto_conclude = auto_conclude
+        context.assumptions = [
+            self.proposition(ref) if kind == "step" else self.formulas.decode(ref)
+            for kind, ref in assumptions
+        ]
+        context._proven = [self.proposition(i) for i in conclusions]
+        # the block stores the conclusions, whether or not they were
+        # concluded explicitly
+        context._interesting_conclusions = list(context._proven)
+        context.proven_propositions = []
+        context.exited = True
+        # registered first: decoding the proven steps uses the context
+        self._contexts[index] = context
+        context.proven_propositions.extend(self.proposition(i) for i in proven)
+        return context
+
+    def roots(self) -> list[Proposition]:
+        return [self.proposition(i) for i in self.archive.roots]
+
+
+def encode_proof(*conclusions: Proposition) -> ProofArchive:
+    """
+    Encode the proofs of `conclusions` into one archive.
+    """
+    encoder = ProofEncoder()
+    for prop in conclusions:
+        encoder.add_root(prop)
+    return encoder.archive()
+
+
+def decode_proof(archive: ProofArchive) -> list[Proposition]:
+    """
+    Rebuild the conclusions of `archive`, with their proofs.
+    """
+    return ProofDecoder(archive).roots()
+
+
+def save_proof(path: str, *conclusions: Proposition) -> ProofArchive:
+    """
+    Write the proofs of `conclusions` to the file `path`.
+    """
+    archive = encode_proof(*conclusions)
+    with open(path, "wb") as f:
+        f.write(archive.dumps())
+    return archive
+
+
+def load_proof(path: str) -> list[Proposition]:
+    """
+    Read the proofs written by `save_proof` and rebuild their conclusions.
+    """
+    with open(path, "rb") as f:
+        return decode_proof(ProofArchive.loads(f.read()))
+
+
+def required_steps(
+    archive: ProofArchive,
+    roots: Iterable[int] | None = None,
+    known: Container[int] = (),
+) -> list[int]:
+    """
+    The steps that the proofs of `roots` (default: the archive's roots)
+    depend on, in topological order. Steps in `known` and their
+    dependencies are left out.
+    """
+    steps, contexts = archive.steps, archive.contexts
+    needed: set[int] = set()
+    stack = list(archive.roots if roots is None else roots)
+    while stack:
+        i = stack.pop()
+        if i in needed or i in known:
+            continue
+        needed.add(i)
+        _, _, premises, context_refs, assumptions, _ = steps[i]
+        stack.extend(p for p in premises if p != i)
+        stack.extend(assumptions or ())
+        for c in context_refs:
+            _, _, ctx_assumptions, conclusions, _ = contexts[c]
+            stack.extend(ref for kind, ref in ctx_assumptions if kind == "step")
+            stack.extend(conclusions)
+    return sorted(needed)
@@ -0,0 +1,348 @@
+"""
+A persistent cache of proofs, so that lemmas are not searched for again on
+every run.
+
+A `ProofCache` is a directory of proof archives (see
+`pylogic.proofs.archive`). An entry is keyed by the hash of the formula it
+proves, the hash of the set of premises it may use and the pylogic version.
+Only proofs accepted by the proof checker are stored, and they are checked
+again when loaded. A loaded proof is attached to the premises given to
+`get`, so its assumptions are the caller's propositions.
+
+Writers take a lock on the directory and replace entries atomically, so
+several processes can share a cache. Reading an entry marks it as recently
+used; when the cache grows over `max_bytes`, the least recently used entries
+are removed.
+
+Set the environment variable `PYLOGIC_PROOF_CACHE` to a directory to make
+`proof_search` use a cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import zlib
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from pylogic.proofs.archive import ProofArchive
+    from pylogic.proposition.proposition import Proposition
+
+CACHE_ENV_VAR = "PYLOGIC_PROOF_CACHE"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_SUFFIX = ".proof"
+
+
+def pylogic_version() -> str:
+    """
+    The installed version of pylogic, with the proof archive format.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    from pylogic.proofs.archive import PROOF_FORMAT
+
+    try:
+        v = version("pylogic")
+    except PackageNotFoundError:
+        v = "unknown"
+    return f"{v}/{PROOF_FORMAT}"
+
+
+def formula_hash(prop: Proposition) -> str:
+    """
+    A hash of the structure of `prop`, equal for equal formulas built
+    separately.
+    """
+    from pylogic.serialize import FormulaEncoder
+
+    encoder = FormulaEncoder()
+    encoder.encode(prop)
+    return hashlib.sha256(repr(encoder.nodes).encode()).hexdigest()
+
+
+def premises_hash(premises: Iterable[Proposition]) -> str:
+    """
+    A hash of the set of formulas of `premises`, independent of their order.
+    """
+    digests = sorted({formula_hash(p) for p in premises})
+    return hashlib.sha256("\n".join(digests).encode()).hexdigest()
+
+
+class _FileLock:
+    """
+    An exclusive lock on a file, held between processes.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = None
+
+    def __enter__(self) -> _FileLock:
+        self._file = open(self.path, "a+b")
+        try:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        except ImportError:
+            import msvcrt
+
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)  # type: ignore
+        return self
+
+    def __exit__(self, *args) -> None:
+        assert self._file is not None
+        try:
+            import fcntl
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore
+        self._file.close()
+        self._file = None
+
+
+class ProofCache:
+    """
+    A directory of checked proofs. See the module docstring.
+
+    Parameters
+    ----------
+    path: str
+        The cache directory. It is created if needed.
+    max_bytes: int
+        Least recently used entries are removed when the entries take more
+        than this many bytes.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = pylogic_version()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return f"ProofCache({self.path!r}, hits={self.hits}, misses={self.misses})"
+
+    def key(self, target: Proposition, premises: Iterable[Proposition]) -> str:
+        parts = (formula_hash(target), premises_hash(premises), self.version)
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], key + _SUFFIX)
+
+    def _lock(self) -> _FileLock:
+        return _FileLock(os.path.join(self.path, ".lock"))
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for dirpath, _, filenames in os.walk(self.path):
+            for name in filenames:
+                if not name.endswith(_SUFFIX):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        """
+        The number of bytes taken by the entries.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def read(self, key: str) -> bytes | None:
+        """
+        The data stored under `key`, or None.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # the modification time orders entries for eviction
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def write(self, key: str, data: bytes) -> None:
+        """
+        Store `data` under `key`, then evict old entries if needed.
+        """
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with self._lock():
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._evict()
+
+    def load(self, key: str) -> ProofArchive | None:
+        """
+        The archive stored under `key`, or None.
+        """
+        from pylogic.proofs.archive import ProofArchive
+
+        data = self.read(key)
+        if data is None:
+            return None
+        try:
+            return ProofArchive.loads(data)
+        except (ValueError, KeyError, TypeError, zlib.error):
+            return None
+
+    def store(self, key: str, archive: ProofArchive) -> None:
+        """
+        Store `archive` under `key`.
+        """
+        self.write(key, archive.dumps())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock():
+            for _, _, path in self._entries():
+                os.remove(path)
+
+    def get(
+        self, target: Proposition, premises: Iterable[Proposition]
+    ) -> Proposition | None:
+        """
+        A proof of `target` from `premises`, if one is cached. The
+        proof uses the given premises.
+        """
+        premises = list(premises)
+        archive = self.load(self.key(target, premises))
+        result = None if archive is None else _attach(archive, target, premises)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, proof: Proposition, premises: Iterable[Proposition]) -> None:
+        """
+        Store the proof of the proven proposition `proof`, which was found
+        from `premises`. Invalid proofs raise `ProofCheckError`.
+        """
+        from pylogic.proofs.archive import encode_proof
+        from pylogic.proofs.checker import check_proof
+
+        archive = encode_proof(proof)
+        check_proof(archive).raise_if_invalid()
+        self.store(self.key(proof, premises), archive)
+
+
+def _attach(
+    archive: ProofArchive, target: Proposition, premises: list[Proposition]
+) -> Proposition | None:
+    """
+    Decode the proof in `archive`, using `premises` for the steps with the
+    same formulas. Returns None if the proof is invalid, does not prove
+    `target` or needs other assumptions.
+
+    The decoded conclusion is marked proven like a proof made in this
+    process: it is added to the current assumptions context and to the
+    knowledge bases of its terms.
+    """
+    from pylogic.proofs.archive import TODO, ProofDecoder, required_steps
+    from pylogic.proofs.checker import ProofChecker
+
+    if len(archive.roots) != 1:
+        return None
+    (root,) = archive.roots
+    checker = ProofChecker(archive)
+    result = checker.check()
+    if not result.ok or root not in result.assumptions:
+        return None
+    if checker.formula(root) != target:
+        return None
+
+    by_formula = {p: p for p in premises}
+    decoder = ProofDecoder(archive)
+    bound: set[int] = set()
+    for i in required_steps(archive):
+        if i == root:
+            continue
+        premise = by_formula.get(checker.formula(i))
+        if premise is not None and premise.is_proven:
+            decoder.use(i, premise)
+            bound.add(i)
+    # everything left must be proven without assumptions
+    for i in required_steps(archive, known=bound):
+        if i in result.assumptions[root] or archive.steps[i][5] & TODO:
+            return None
+    proof = decoder.proposition(root)
+    proof._set_is_proven(True)
+    return proof
+
+
+_default_cache: ProofCache | None = None
+
+
+def default_cache() -> ProofCache | None:
+    """
+    The cache in the directory given by the `PYLOGIC_PROOF_CACHE`
+    environment variable, or None if it is not set.
+    """
+    global _default_cache
+    path = os.environ.get(CACHE_ENV_VAR)
+    if not path:
+        return None
+    if _default_cache is None or _default_cache.path != path:
+        _default_cache = ProofCache(path)
+    return _default_cache
+
+
+def cached_proof(
+    target: Proposition,
+    premises: Iterable[Proposition],
+    cache: ProofCache | None = None,
+    search: Callable[[list[Proposition], Proposition], Proposition] | None = None,
+) -> Proposition:
+    """
+    Prove `target` from `premises`, loading the proof from `cache` (default:
+    `default_cache()`) if it was found before. Otherwise the proof is found
+    with `search` (default: `proof_search` without caching) and stored.
+    Raises ValueError if no proof is found.
+    """
+    premises = list(premises)
+    if cache is None:
+        cache = default_cache()
+    if cache is not None:
+        proof = cache.get(target, premises)
+        if proof is not None:
+            return proof
+    if search is None:
+        from pylogic.proposition.proof_search import _BackwardProver
+
+        proof = _BackwardProver(premises).prove(target)
+    else:
+        proof = search(premises, target)
+    # a premise is its own proof, there is nothing to store
+    if cache is not None and not any(proof is p for p in premises):
+        cache.put(proof, premises)
+    return proof
@@ -0,0 +1,659 @@
+"""
+A small proof-checking kernel for `ProofArchive`s.
+
+The checker replays every step of an archive in topological order. Steps
+whose rule is in `rule_checkers` are re-verified from the formulas of their
+premises; the formulas are decoded from the node table but no proven
+propositions are created. Assumptions are tracked by the checker itself, so
+the open assumptions reported for a conclusion do not rely on the recorded
+`from_assumptions`.
+
+Steps using other rules are trusted if their premises are valid, and are
+counted in `CheckResult.unchecked`. With `strict=True` they are errors.
+A trusted step without proven premises is only accepted if its rule is in
+`premise_free_rules`. A root that is an open assumption of itself is not a
+proof and is an error too.
+
+Steps flagged as axioms or TODOs are accepted without proof, whatever their
+formula, and are listed in `CheckResult.axioms` and `CheckResult.todo`.
+Steps flagged as assumptions, and steps with the rule "given" and no
+premises, are open assumptions of the steps that use them (see
+`CheckResult.assumptions`). A checked proof is therefore only as good as its
+axioms and open assumptions; callers that do not trust the archive must look
+at both.
+
+Checking a step has two phases. `ProofChecker.derive` checks the shape of
+the inference from the formulas alone and returns the premises it uses;
+this only reads the archive, so steps can be derived in any order (see
+`pylogic.proofs.parallel`). `ProofChecker.apply` then propagates validity
+and open assumptions from the premises, in topological order.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from pylogic.proofs.archive import ASSUMPTION, AXIOM, TODO
+
+if TYPE_CHECKING:
+    from pylogic.proofs.archive import ProofArchive
+    from pylogic.proposition.proposition import Proposition
+
+# a premise used by a rule: alternative steps, one of which must be valid,
+# and the assumptions it discharges
+Use = tuple[tuple[int, ...], frozenset[int]]
+# the outcome of ProofChecker.derive: (kind, dependencies, uses or message)
+Derivation = tuple[str, tuple[int, ...], Any]
+
+_NONE: frozenset[int] = frozenset()
+
+# rules that prove a proposition from definitions or by evaluation, so their
+# steps have no premises
+premise_free_rules: set[str] = {
+    "absolute_value_nonnegative_f",
+    "by_containment_func",
+    "by_definition",
+    "by_empty",
+    "by_inspection",
+    "by_predicate",
+    "by_simplification",
+    "evaluate",
+    "is_even_power",
+    "order_axiom_bf",
+    "reflexive",
+    "tautology",
+}
+
+
+class ProofCheckError(Exception):
+    def __init__(self, errors: list[tuple[int, str]]) -> None:
+        lines = [f"step {step}: {message}" for step, message in errors]
+        super().__init__("Invalid proof:\n" + "\n".join(lines))
+        self.errors = errors
+
+
+class _InvalidStep(Exception):
+    pass
+
+
+class CheckResult:
+    """
+    The outcome of checking (part of) a proof.
+
+    Attributes
+    ----------
+    errors: dict[int, str]
+        Steps whose inference is invalid, with the reason. Steps that are only
+        invalid because a premise is invalid are not listed.
+    invalid: set[int]
+        All invalid steps, including those that depend on invalid steps.
+    unchecked: dict[str, int]
+        Rules without a checker, with the number of steps that used them.
+    todo: list[int]
+        Steps marked as TODO, which are accepted without proof.
+    axioms: list[int]
+        Steps marked as axioms, which are accepted without proof.
+    assumptions: dict[int, frozenset[int]]
+        The open assumptions (as step indices) of each checked step.
+    """
+
+    def __init__(self) -> None:
+        self.errors: dict[int, str] = {}
+        self.invalid: set[int] = set()
+        self.unchecked: dict[str, int] = {}
+        self.todo: list[int] = []
+        self.axioms: list[int] = []
+        self.assumptions: dict[int, frozenset[int]] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.invalid
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __repr__(self) -> str:
+        return (
+            f"CheckResult(checked={len(self.assumptions) + len(self.invalid)}, "
+            f"errors={len(self.errors)}, unchecked={sum(self.unchecked.values())}, "
+            f"todo={len(self.todo)}, axioms={len(self.axioms)})"
+        )
+
+    def merge(self, other: CheckResult) -> CheckResult:
+        """
+        Add the results of `other`, which checked other steps of the same
+        archive. Returns self.
+        """
+        self.errors.update(other.errors)
+        self.invalid.update(other.invalid)
+        for rule, count in other.unchecked.items():
+            self.unchecked[rule] = self.unchecked.get(rule, 0) + count
+        self.todo = sorted(set(self.todo).union(other.todo))
+        self.axioms = sorted(set(self.axioms).union(other.axioms))
+        self.assumptions.update(other.assumptions)
+        return self
+
+    def raise_if_invalid(self) -> None:
+        """
+        Raises ProofCheckError if some step is invalid.
+        """
+        if self.errors or self.invalid:
+            errors = sorted(self.errors.items()) or [
+                (min(self.invalid), "depends on an invalid step")
+            ]
+            raise ProofCheckError(errors)
+
+
+class ProofChecker:
+    """
+    Checks the steps of a `ProofArchive`.
+
+    Parameters
+    ----------
+    archive: ProofArchive
+        The proof to check.
+    strict: bool
+        If True, steps whose rule has no checker are invalid.
+    """
+
+    def __init__(self, archive: ProofArchive, strict: bool = False) -> None:
+        from pylogic.serialize import FormulaDecoder
+
+        self.archive = archive
+        self.strict = strict
+        self.formulas = FormulaDecoder(archive.nodes)
+        self.result = CheckResult()
+        # assumptions made with .assume() in a context that has since been
+        # closed are no longer flagged as assumptions
+        self.assumed: set[int] = {
+            ref
+            for block in archive.contexts
+            for kind, ref in block[2]
+            if kind == "step"
+        }
+
+    def formula(self, step: int) -> Proposition:
+        """
+        The formula of `step`, as an unproven proposition.
+        """
+        return self.formulas.decode(self.archive.steps[step][0])
+
+    def same(self, step_a: int, step_b: int) -> bool:
+        """
+        Whether two steps have equal formulas.
+        """
+        node_a, node_b = self.archive.steps[step_a][0], self.archive.steps[step_b][0]
+        return node_a == node_b or self.formula(step_a) == self.formula(step_b)
+
+    def require(self, condition: Any, message: str) -> None:
+        if not condition:
+            raise _InvalidStep(message)
+
+    def check(self, steps: Iterable[int] | None = None) -> CheckResult:
+        """
+        Check `steps` (default: all steps, then the roots, see `check_roots`),
+        which must be in topological order. Steps they depend on must have
+        been checked before.
+        """
+        if steps is None:
+            for index in range(len(self.archive.steps)):
+                self.check_step(index)
+            self.check_roots()
+            return self.result
+        for index in steps:
+            self.check_step(index)
+        return self.result
+
+    def check_roots(self) -> None:
+        """
+        Flag the roots that are only assumed. Called once all steps are
+        checked.
+        """
+        result = self.result
+        for root in self.archive.roots:
+            if result.assumptions.get(root) == frozenset((root,)):
+                result.errors[root] = f"{self.formula(root)} is assumed, not proven"
+                result.invalid.add(root)
+
+    def check_step(self, index: int) -> None:
+        self.apply(index, self.derive(index))
+
+    def derive(self, index: int) -> Derivation:
+        """
+        Check the inference of `index` without looking at the results of
+        other steps.
+        """
+        _, rule, premises, contexts, _, flags = self.archive.steps[index]
+        dependencies = [p for p in premises if p != index]
+        dependencies.extend(self._context_steps(contexts))
+        deps = tuple(dependencies)
+        try:
+            for dep in deps:
+                self.require(dep < index, f"refers to the later step {dep}")
+            if flags & AXIOM:
+                return ("axiom", deps, ())
+            if flags & TODO:
+                return ("todo", deps, ())
+            if (
+                flags & ASSUMPTION
+                or index in self.assumed
+                or (rule == "given" and not premises)
+            ):
+                return ("assumption", deps, ())
+            if rule is None:
+                # an unproven proposition, only usable as a pattern, eg the
+                # first premise of is_one_of
+                return ("pattern", deps, ())
+            if rule in rule_checkers:
+                return ("rule", deps, tuple(rule_checkers[rule](self, index)))
+            # trusted; some premises may be unproven patterns
+            self.require(not self.strict, f"no checker for rule {rule!r}")
+            self.require(
+                deps or rule in premise_free_rules,
+                f"no checker for rule {rule!r}, which has no premises",
+            )
+            discharged = _NONE.union(*(self.discharged(c) for c in contexts))
+            return ("trusted", deps, tuple(((d,), discharged) for d in deps))
+        except _InvalidStep as e:
+            return ("error", deps, str(e))
+
+    def apply(self, index: int, derivation: Derivation) -> None:
+        """
+        Record the result of `index` from its derivation. The steps it
+        depends on must have been applied before.
+        """
+        result = self.result
+        kind, deps, uses = derivation
+        if any(dep in result.invalid for dep in deps):
+            result.invalid.add(index)
+            return
+        if kind == "error":
+            result.errors[index] = uses
+            result.invalid.add(index)
+            return
+        if kind == "pattern":
+            return
+        if kind == "assumption":
+            result.assumptions[index] = frozenset((index,))
+            return
+        if kind == "todo":
+            result.todo.append(index)
+        elif kind == "axiom":
+            result.axioms.append(index)
+        assumptions: set[int] = set()
+        proven = 0
+        for alternatives, discharged in uses:
+            step = next((s for s in alternatives if s in result.assumptions), None)
+            if step is None:
+                if kind == "trusted":
+                    continue
+                result.errors[index] = f"premise {alternatives[0]} is not proven"
+                result.invalid.add(index)
+                return
+            proven += 1
+            assumptions.update(result.assumptions[step] - discharged)
+        if kind == "trusted":
+            rule = self.archive.steps[index][1]
+            if not proven and rule not in premise_free_rules:
+                result.errors[index] = (
+                    f"no checker for rule {rule!r}, and none of its premises is proven"
+                )
+                result.invalid.add(index)
+                return
+            result.unchecked[rule] = result.unchecked.get(rule, 0) + 1
+        result.assumptions[index] = frozenset(assumptions)
+
+    def _context_steps(self, contexts: Iterable[int]) -> list[int]:
+        steps: list[int] = []
+        for c in contexts:
+            _, _, assumptions, conclusions, _ = self.archive.contexts[c]
+            steps.extend(ref for kind, ref in assumptions if kind == "step")
+            steps.extend(conclusions)
+        return steps
+
+    def context_assumptions(self, context: int) -> list[Any]:
+        """
+        The assumptions of a context block: propositions and variables.
+        """
+        return [
+            self.formula(ref) if kind == "step" else self.formulas.decode(ref)
+            for kind, ref in self.archive.contexts[context][2]
+        ]
+
+    def discharged(self, context: int) -> frozenset[int]:
+        return frozenset(
+            ref for kind, ref in self.archive.contexts[context][2] if kind == "step"
+        )
+
+
+##############################################################
+# rule checkers
+# Each receives the checker and a step index, raises _InvalidStep if the
+# step does not follow from the formulas of its premises, and returns the
+# premises it uses. It must not look at the results of other steps.
+
+
+def _premises(checker: ProofChecker, index: int) -> tuple[int, ...]:
+    return checker.archive.steps[index][2]
+
+
+def _uses(*steps: int) -> list[Use]:
+    return [((step,), _NONE) for step in steps]
+
+
+_IMPLICATION_CLASSES = {
+    "pylogic.proposition.implies:Implies",
+    "pylogic.proposition.iff:Iff",
+}
+
+
+def _check_modus_ponens(checker: ProofChecker, index: int) -> list[Use]:
+    from pylogic.proposition.iff import Iff
+    from pylogic.proposition.implies import Implies
+
+    premises = _premises(checker, index)
+    checker.require(len(premises) == 2, "modus ponens needs two premises")
+    ante, imp = premises
+    steps, nodes = checker.archive.steps, checker.archive.nodes
+    imp_node = nodes[steps[imp][0]]
+    if (
+        imp_node[0] == "prop"
+        and imp_node[1] in _IMPLICATION_CLASSES
+        and imp_node[2] == (steps[ante][0], steps[index][0])
+    ):
+        # same nodes, no need to decode the formulas
+        return _uses(ante, imp)
+    imp_formula = checker.formula(imp)
+    checker.require(
+        isinstance(imp_formula, (Implies, Iff)), f"{imp_formula} is not an implication"
+    )
+    checker.require(
+        imp_formula.left == checker.formula(ante),
+        f"{checker.formula(ante)} is not the antecedent of {imp_formula}",
+    )
+    checker.require(
+        imp_formula.right == checker.formula(index),
+        f"{checker.formula(index)} is not the consequent of {imp_formula}",
+    )
+    return _uses(ante, imp)
+
+
+def _is_conjunct(prop: Proposition, conj: Proposition) -> bool:
+    from pylogic.proposition.and_ import And
+
+    if not isinstance(conj, And):
+        return False
+    return any(p == prop or _is_conjunct(prop, p) for p in conj.propositions)
+
+
+def _check_is_one_of(checker: ProofChecker, index: int) -> list[Use]:
+    premises = _premises(checker, index)
+    checker.require(len(premises) == 2, "is_one_of needs two premises")
+    # the first premise is the conjunct itself, proven or not
+    conjunct, conj = premises
+    formula = checker.formula(index)
+    checker.require(
+        conjunct == index or checker.same(conjunct, index),
+        f"{formula} is not {checker.formula(conjunct)}",
+    )
+    checker.require(
+        _is_conjunct(formula, checker.formula(conj)),
+        f"{formula} is not a conjunct of {checker.formula(conj)}",
+    )
+    return _uses(conj)
+
+
+def _check_resolve(checker: ProofChecker, index: int) -> list[Use]:
+    from pylogic.proposition._junction import _Junction
+    from pylogic.proposition.contradiction import Contradiction
+    from pylogic.proposition.not_ import are_negs
+
+    premises = _premises(checker, index)
+    checker.require(len(premises) >= 1, "resolve needs premises")
+    disj, *others = premises
+    disj_formula = checker.formula(disj)
+    checker.require(
+        isinstance(disj_formula, _Junction) and disj_formula._supports_resolve,
+        f"{disj_formula} does not support resolution",
+    )
+    negated = [checker.formula(p) for p in others]
+    remaining = [
+        p for p in disj_formula.propositions if not any(are_negs(p, n) for n in negated)
+    ]
+    formula = checker.formula(index)
+    if len(remaining) == 0:
+        checker.require(
+            isinstance(formula, Contradiction), f"{formula} is not a contradiction"
+        )
+    elif len(remaining) == 1:
+        checker.require(formula == remaining[0], f"expected {remaining[0]}")
+    else:
+        checker.require(
+            formula.__class__ is disj_formula.__class__
+            and list(formula.propositions) == remaining,
+            f"{formula} is not the disjunction of {remaining}",
+        )
+    return _uses(*premises)
+
+
+def _junction_matches(
+    formula: Proposition, cls: type, props: list[Proposition]
+) -> bool:
+    """
+    Whether `formula` is `cls(*props).remove_duplicates()`.
+    """
+    unique: list[Proposition] = []
+    for p in props:
+        if p not in unique:
+            unique.append(p)
+    if len(unique) == 1:
+        return formula == unique[0]
+    return formula.__class__ is cls and list(formula.propositions) == unique
+
+
+def _check_by_cases(checker: ProofChecker, index: int) -> list[Use]:
+    from pylogic.proposition._junction import _Junction
+    from pylogic.proposition.iff import Iff
+    from pylogic.proposition.implies import Implies
+    from pylogic.proposition.or_ import Or
+
+    premises = _premises(checker, index)
+    contexts = checker.archive.steps[index][3]
+    checker.require(len(premises) >= 1, "by_cases needs premises")
+    disj, *implications = premises
+    disj_formula = checker.formula(disj)
+    checker.require(
+        isinstance(disj_formula, _Junction), f"{disj_formula} has no cases"
+    )
+    cases = list(disj_formula.propositions)
+    formula = checker.formula(index)
+
+    if contexts:
+        # each case is assumed in a context that proves the conclusion
+        checker.require(
+            not implications and len(contexts) == len(cases),
+            "one context is needed for each case",
+        )
+        uses = _uses(disj)
+        for c in contexts:
+            conclusions = checker.archive.contexts[c][3]
+            assumed = checker.context_assumptions(c)
+            checker.require(
+                len(assumed) == 1 and assumed[0] in cases,
+                f"context {c} does not assume one of the cases",
+            )
+            if assumed[0] == formula:
+                # the case is the conclusion itself
+                continue
+            steps = tuple(s for s in conclusions if checker.same(s, index))
+            checker.require(steps, f"context {c} does not prove {formula}")
+            uses.append((steps, checker.discharged(c)))
+        covered = [checker.context_assumptions(c)[0] for c in contexts]
+        checker.require(
+            all(case in covered for case in cases), "not all cases are covered"
+        )
+        return uses
+
+    imps = [checker.formula(p) for p in implications]
+    checker.require(
+        all(isinstance(imp, (Implies, Iff)) for imp in imps),
+        "the cases must be implications",
+    )
+    antes = [imp.left for imp in imps]
+    checker.require(
+        len(antes) == len(cases) and set(antes) == set(cases),
+        "the implications do not match the cases",
+    )
+    if disj_formula._supports_by_cases or (
+        disj_formula._supports_by_cases_with_equivalence
+        and all(isinstance(imp, Iff) for imp in imps)
+    ):
+        cls: type = disj_formula.__class__
+    else:
+        checker.require(
+            disj_formula._supports_by_cases_with_equivalence,
+            f"{disj_formula} does not support by_cases",
+        )
+        cls = Or
+    checker.require(
+        _junction_matches(formula, cls, [imp.right for imp in imps]),
+        f"{formula} does not follow from the cases",
+    )
+    return _uses(*premises)
+
+
+def discharge(assumptions: list[Any], conclusion: Proposition) -> Proposition:
+    """
+    The proposition proven by closing a context with these assumptions
+    (in the order they were made) and this conclusion.
+    Mirrors `AssumptionsContext._build_proven`, without proving anything.
+    """
+    from pylogic.proposition.and_ import And
+    from pylogic.proposition.contradiction import Contradiction
+    from pylogic.proposition.not_ import neg
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.proposition.quantified.forall import Forall, ForallInSet
+    from pylogic.proposition.relation.contains import IsContainedIn
+    from pylogic.variable import Variable
+
+    assumptions = assumptions[::-1]
+    cons = conclusion
+    i = 0
+    while i < len(assumptions):
+        a = assumptions[i]
+        if (
+            i + 1 < len(assumptions)
+            and isinstance(a, IsContainedIn)
+            and a.left == assumptions[i + 1]
+            and a.left.is_bound is False
+            and len(a.left.depends_on) == 0
+        ):
+            cons = ForallInSet(a.left, a.right, cons)
+            i += 2
+        elif isinstance(a, Proposition):
+            ante = [a]
+            j = i + 1
+            while j < len(assumptions) and not isinstance(
+                assumptions[j], (IsContainedIn, Variable)
+            ):
+                ante.append(assumptions[j])
+                j += 1
+            if len(ante) == 1:
+                premise = ante[0]
+            else:
+                premise = And(*reversed(ante))
+            if isinstance(cons, Contradiction):
+                cons = neg(premise)
+            else:
+                cons = premise.implies(cons, de_nest=False)
+            i = j
+        else:
+            if a.is_bound is False and len(a.depends_on) == 0:
+                cons = Forall(a, cons)
+            i += 1
+    return cons
+
+
+def _check_close_assumptions_context(
+    checker: ProofChecker, index: int
+) -> list[Use]:
+    contexts = checker.archive.steps[index][3]
+    checker.require(len(contexts) == 1, "closing needs exactly one context")
+    (c,) = contexts
+    conclusions = checker.archive.contexts[c][3]
+    assumed = checker.context_assumptions(c)
+    formula = checker.formula(index)
+    steps = tuple(
+        step
+        for step in conclusions
+        if discharge(assumed, checker.formula(step)) == formula
+    )
+    checker.require(steps, f"{formula} is not proven by closing context {c}")
+    return [(steps, checker.discharged(c))]
+
+
+def _check_transitive(checker: ProofChecker, index: int) -> list[Use]:
+    from pylogic.helpers import eval_same
+    from pylogic.proposition.ordering.greaterorequal import GreaterOrEqual
+    from pylogic.proposition.ordering.greaterthan import GreaterThan
+    from pylogic.proposition.ordering.lessthan import LessThan
+    from pylogic.proposition.ordering.lessorequal import LessOrEqual
+    from pylogic.proposition.relation.binaryrelation import BinaryRelation
+    from pylogic.proposition.relation.equals import Equals
+
+    premises = _premises(checker, index)
+    checker.require(len(premises) >= 1, "transitivity needs premises")
+    relations = [checker.formula(p) for p in premises]
+    formula = checker.formula(index)
+    checker.require(
+        all(isinstance(r, BinaryRelation) for r in relations + [formula]),
+        "transitivity applies to binary relations",
+    )
+    for r in relations:
+        checker.require(r.__class__.is_transitive, f"{r.__class__} is not transitive")
+    for a, b in zip(relations, relations[1:]):
+        checker.require(
+            eval_same(a.right, b.left), f"chain broken between {a} and {b}"
+        )
+    checker.require(
+        formula.left == relations[0].left and formula.right == relations[-1].right,
+        f"{formula} does not join the ends of the chain",
+    )
+    classes = {r.__class__ for r in relations}
+    cls = formula.__class__
+    checker.require(cls.is_transitive, f"{cls} is not transitive")
+    if classes != {cls}:
+        # pylogic.proposition.ordering.inference.transitive
+        closures = {LessThan: LessOrEqual, GreaterThan: GreaterOrEqual}
+        checker.require(
+            classes != {Equals}, f"{formula} does not follow from equalities"
+        )
+        allowed = {cls, Equals, closures.get(cls)}
+        checker.require(classes <= allowed, f"{formula} does not follow from {classes}")
+        checker.require(
+            cls not in closures or cls in classes,
+            f"at least one relation must be a {cls.__name__}",
+        )
+    return _uses(*premises)
+
+
+rule_checkers: dict[str, Callable[[ProofChecker, int], list[Use]]] = {
+    "modus_ponens": _check_modus_ponens,
+    "is_one_of": _check_is_one_of,
+    "resolve": _check_resolve,
+    "by_cases": _check_by_cases,
+    "close_assumptions_context": _check_close_assumptions_context,
+    "transitive": _check_transitive,
+}
+
+
+def check_proof(
+    proof: ProofArchive | Proposition, strict: bool = False
+) -> CheckResult:
+    """
+    Check a proof, given as an archive or as a proven proposition.
+    """
+    from pylogic.proofs.archive import ProofArchive, encode_proof
+
+    archive = proof if isinstance(proof, ProofArchive) else encode_proof(proof)
+    return ProofChecker(archive, strict=strict).check()
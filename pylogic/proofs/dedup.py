@@ -0,0 +1,202 @@
+"""
+Sharing of identical subproofs.
+
+Inference rules build new proposition objects, so a lemma that is proven in
+several branches of a proof (eg the same antecedent proven for different
+candidates by the backward prover) has several copies of its proof. The
+`ProofEncoder` stores one step per proposition object and so keeps all of
+them.
+
+`dedupe_archive` merges
+
+- steps with the same formula, rule, premises, contexts, assumptions and
+  flags, bottom-up, so that identical subproofs become one, and
+- with `canonicalize=True`, steps that prove the same formula from the same
+  assumptions in different ways: the first proof is kept.
+
+Assumptions are never merged, since discharging one must not discharge the
+other. The result is re-encoded, so steps, contexts and formula nodes that
+are no longer used are dropped.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pylogic.proofs.archive import ASSUMPTION, AXIOM, PROVEN, TODO, ProofArchive
+
+if TYPE_CHECKING:
+    from pylogic.proposition.proposition import Proposition
+
+# marks a premise that is the step itself (see `todo`)
+_SELF = -1
+
+
+class DedupReport:
+    """
+    The size of a proof before and after `dedupe_archive`.
+
+    Attributes
+    ----------
+    steps_before, steps_after: int
+    contexts_before, contexts_after: int
+    nodes_before, nodes_after: int
+        Number of steps, context blocks and formula nodes.
+    bytes_before, bytes_after: int
+        Size of the compressed archive.
+    merged: int
+        Steps that were identical to an earlier step.
+    canonicalized: int
+        Steps replaced by an earlier proof of the same formula.
+    """
+
+    def __init__(self, before: ProofArchive, after: ProofArchive) -> None:
+        self.steps_before = len(before.steps)
+        self.steps_after = len(after.steps)
+        self.contexts_before = len(before.contexts)
+        self.contexts_after = len(after.contexts)
+        self.nodes_before = len(before.nodes)
+        self.nodes_after = len(after.nodes)
+        self.bytes_before = len(before.dumps())
+        self.bytes_after = len(after.dumps())
+        self.merged = 0
+        self.canonicalized = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"DedupReport(steps {self.steps_before} -> {self.steps_after}, "
+            f"contexts {self.contexts_before} -> {self.contexts_after}, "
+            f"nodes {self.nodes_before} -> {self.nodes_after}, "
+            f"bytes {self.bytes_before} -> {self.bytes_after})"
+        )
+
+
+def _merge_steps(
+    archive: ProofArchive, canonicalize: bool
+) -> tuple[ProofArchive, int, int]:
+    steps, contexts = archive.steps, archive.contexts
+    # steps that are assumed in a context keep their identity
+    assumed = {
+        ref for block in contexts for kind, ref in block[2] if kind == "step"
+    }
+    new_steps: list[tuple] = []
+    new_contexts: list[tuple] = []
+    step_map: list[int] = []
+    context_map: dict[int, int] = {}
+    seen_steps: dict[tuple, int] = {}
+    seen_contexts: dict[tuple, int] = {}
+    # new step -> its assumptions, as new steps
+    open_assumptions: list[frozenset[int]] = []
+    proofs: dict[tuple[int, frozenset[int], int], int] = {}
+    merged = canonicalized = 0
+
+    def map_context(c: int) -> int:
+        index = context_map.get(c)
+        if index is not None:
+            return index
+        name, auto_conclude, assumptions, conclusions, proven = contexts[c]
+        block = (
+            name,
+            auto_conclude,
+            tuple(
+                (kind, step_map[ref] if kind == "step" else ref)
+                for kind, ref in assumptions
+            ),
+            tuple(step_map[s] for s in conclusions),
+            proven,
+        )
+        index = seen_contexts.get(block)
+        if index is None:
+            index = len(new_contexts)
+            new_contexts.append(block)
+            seen_contexts[block] = index
+        context_map[c] = index
+        return index
+
+    for i, (formula, rule, premises, context_refs, assumptions, flags) in enumerate(
+        steps
+    ):
+        premises = tuple(_SELF if p == i else step_map[p] for p in premises)
+        context_refs = tuple(map_context(c) for c in context_refs)
+        if assumptions is not None:
+            assumptions = tuple(sorted({step_map[a] for a in assumptions}))
+        key = (formula, rule, premises, context_refs, assumptions, flags)
+        is_assumption = flags & ASSUMPTION or i in assumed
+
+        index = None if is_assumption else seen_steps.get(key)
+        if index is not None:
+            merged += 1
+            step_map.append(index)
+            continue
+        if is_assumption:
+            deps = frozenset((len(new_steps),))
+        elif assumptions is not None:
+            deps = frozenset(assumptions)
+        else:
+            deps = frozenset().union(
+                *(open_assumptions[p] for p in premises if p != _SELF)
+            )
+        proof_key = (formula, deps, flags & PROVEN)
+        if (
+            canonicalize
+            and rule is not None
+            and not is_assumption
+            and not flags & (AXIOM | TODO)
+            and proof_key in proofs
+        ):
+            canonicalized += 1
+            step_map.append(proofs[proof_key])
+            continue
+
+        index = len(new_steps)
+        premises = tuple(index if p == _SELF else p for p in premises)
+        new_steps.append((formula, rule, premises, context_refs, assumptions, flags))
+        open_assumptions.append(deps)
+        step_map.append(index)
+        seen_steps[key] = index
+        if rule is not None and not is_assumption:
+            proofs.setdefault(proof_key, index)
+
+    # the proven steps of a block come after it
+    for c, index in context_map.items():
+        proven = tuple(step_map[s] for s in contexts[c][4])
+        new_contexts[index] = new_contexts[index][:4] + (proven,)
+    roots = tuple(step_map[r] for r in archive.roots)
+    merged_archive = ProofArchive(archive.nodes, new_steps, new_contexts, roots)
+    return merged_archive, merged, canonicalized
+
+
+def dedupe_archive(
+    archive: ProofArchive, canonicalize: bool = True
+) -> tuple[ProofArchive, DedupReport]:
+    """
+    Merge identical subproofs of `archive`. See the module docstring.
+
+    Returns the new archive and a report of the sizes before and after.
+    """
+    from pylogic.proofs.archive import ProofDecoder, ProofEncoder
+
+    merged_archive, merged, canonicalized = _merge_steps(archive, canonicalize)
+    # re-encoding drops the steps, contexts and nodes that are not used
+    # anymore; merged steps are decoded as one object and so encoded once
+    encoder = ProofEncoder()
+    for root in ProofDecoder(merged_archive).roots():
+        encoder.add_root(root)
+    result = encoder.archive()
+    report = DedupReport(archive, result)
+    report.merged = merged
+    report.canonicalized = canonicalized
+    return result, report
+
+
+def dedupe_proof(
+    *conclusions: Proposition, canonicalize: bool = True
+) -> tuple[list[Proposition], DedupReport]:
+    """
+    Rebuild `conclusions` with proofs in which identical subproofs are
+    shared. The original propositions are not modified.
+    """
+    from pylogic.proofs.archive import decode_proof, encode_proof
+
+    archive, report = dedupe_archive(encode_proof(*conclusions), canonicalize)
+    return decode_proof(archive), report
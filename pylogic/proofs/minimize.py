@@ -0,0 +1,208 @@
+"""
+Minimization of proofs.
+
+Proofs found by `proof_search`, or written interactively, often contain
+detours. `minimize_archive`
+
+- collapses a `by_cases` step when the conclusion is proven in one of the
+  cases without using the case hypothesis: that proof is used directly,
+- recomputes the `from_assumptions` of each step from the assumptions that
+  its inference actually uses (see `pylogic.proofs.checker`), and
+- drops the steps, contexts and formulas that are not needed by the
+  conclusions anymore.
+
+The proof must be valid; invalid proofs raise `ProofCheckError`.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pylogic.proofs.archive import ASSUMPTION, PROVEN, ProofArchive
+
+if TYPE_CHECKING:
+    from pylogic.proofs.checker import CheckResult, ProofChecker
+    from pylogic.proposition.proposition import Proposition
+
+
+class MinimizeReport:
+    """
+    What `minimize_archive` removed.
+
+    Attributes
+    ----------
+    steps_before, steps_after: int
+        Number of steps of the archive.
+    by_cases_collapsed: int
+        `by_cases` steps replaced by the proof of one case.
+    assumptions_dropped: int
+        Steps whose `from_assumptions` became smaller.
+    """
+
+    def __init__(self, steps_before: int) -> None:
+        self.steps_before = steps_before
+        self.steps_after = steps_before
+        self.by_cases_collapsed = 0
+        self.assumptions_dropped = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"MinimizeReport(steps {self.steps_before} -> {self.steps_after}, "
+            f"by_cases_collapsed={self.by_cases_collapsed}, "
+            f"assumptions_dropped={self.assumptions_dropped})"
+        )
+
+
+def effective_assumptions(archive: ProofArchive) -> list[frozenset[int]]:
+    """
+    The `from_assumptions` of each step (as step indices) of the propositions
+    rebuilt by `ProofDecoder`.
+    """
+    result: list[frozenset[int]] = []
+    for i, (_, _, premises, _, assumptions, flags) in enumerate(archive.steps):
+        if flags & ASSUMPTION:
+            result.append(frozenset((i,)))
+        elif assumptions is not None:
+            result.append(frozenset(assumptions))
+        else:
+            result.append(frozenset().union(*(result[p] for p in premises if p != i)))
+    return result
+
+
+def _direct_case(checker: ProofChecker, index: int) -> int | None:
+    """
+    A step that proves the conclusion of the by_cases step `index` inside
+    one of its cases, without using the case hypothesis.
+    """
+    from pylogic.proposition.implies import Implies
+
+    archive, result = checker.archive, checker.result
+    _, _, premises, contexts, _, _ = archive.steps[index]
+    if contexts:
+        # case hypotheses assumed in contexts
+        candidates = [(c, archive.contexts[c][3]) for c in contexts]
+    else:
+        # cases given as implications proven by closing a context
+        candidates = []
+        for imp in premises[1:]:
+            _, rule, _, imp_contexts, _, _ = archive.steps[imp]
+            formula = checker.formula(imp)
+            if (
+                rule == "close_assumptions_context"
+                and isinstance(formula, Implies)
+                and formula.right == checker.formula(index)
+            ):
+                c = imp_contexts[0]
+                candidates.append((c, archive.contexts[c][3]))
+    for c, conclusions in candidates:
+        hypotheses = checker.discharged(c)
+        if len(archive.contexts[c][2]) != 1 or len(hypotheses) != 1:
+            continue
+        for step in conclusions:
+            if (
+                step in result.assumptions
+                and checker.same(step, index)
+                and not hypotheses & result.assumptions[step]
+            ):
+                return step
+    return None
+
+
+def _collapse_by_cases(
+    archive: ProofArchive, checker: ProofChecker
+) -> tuple[ProofArchive, int]:
+    replacement: dict[int, int] = {}
+
+    def resolve(step: int) -> int:
+        while step in replacement:
+            step = replacement[step]
+        return step
+
+    steps = list(archive.steps)
+    for i, step in enumerate(steps):
+        formula, rule, premises, contexts, assumptions, flags = step
+        premises = tuple(p if p == i else resolve(p) for p in premises)
+        steps[i] = (formula, rule, premises, contexts, assumptions, flags)
+        if rule == "by_cases" and i in checker.result.assumptions:
+            direct = _direct_case(checker, i)
+            if direct is not None:
+                replacement[i] = resolve(direct)
+                # the proof of the case now proves the conclusion
+                f, r, p, c, a, direct_flags = steps[replacement[i]]
+                steps[replacement[i]] = (f, r, p, c, a, direct_flags | flags & PROVEN)
+    if not replacement:
+        return archive, 0
+    blocks = [
+        (
+            name,
+            auto,
+            assumptions,
+            tuple(resolve(s) for s in conclusions),
+            tuple(resolve(s) for s in proven),
+        )
+        for name, auto, assumptions, conclusions, proven in archive.contexts
+    ]
+    roots = tuple(resolve(r) for r in archive.roots)
+    return ProofArchive(archive.nodes, steps, blocks, roots), len(replacement)
+
+
+def _minimal_assumptions(archive: ProofArchive, result: CheckResult) -> ProofArchive:
+    steps = list(archive.steps)
+    effective: list[frozenset[int]] = []
+    for i, (formula, rule, premises, contexts, assumptions, flags) in enumerate(steps):
+        inherited = frozenset().union(*(effective[p] for p in premises if p != i))
+        if flags & ASSUMPTION:
+            effective.append(frozenset((i,)))
+            continue
+        if rule is not None and i in result.assumptions:
+            used = result.assumptions[i]
+            assumptions = None if used == inherited else tuple(sorted(used))
+            steps[i] = (formula, rule, premises, contexts, assumptions, flags)
+        effective.append(
+            inherited if assumptions is None else frozenset(assumptions)
+        )
+    return ProofArchive(archive.nodes, steps, archive.contexts, archive.roots)
+
+
+def minimize_archive(archive: ProofArchive) -> tuple[ProofArchive, MinimizeReport]:
+    """
+    Minimize the proofs in `archive`. See the module docstring.
+
+    Returns the new archive and a report of what was removed.
+    """
+    from pylogic.proofs.archive import ProofDecoder, ProofEncoder
+    from pylogic.proofs.checker import ProofChecker
+
+    report = MinimizeReport(len(archive.steps))
+    checker = ProofChecker(archive)
+    checker.check().raise_if_invalid()
+    archive, report.by_cases_collapsed = _collapse_by_cases(archive, checker)
+    if report.by_cases_collapsed:
+        checker = ProofChecker(archive)
+        checker.check()
+
+    before = effective_assumptions(archive)
+    archive = _minimal_assumptions(archive, checker.result)
+    after = effective_assumptions(archive)
+    report.assumptions_dropped = sum(1 for a, b in zip(before, after) if b < a)
+
+    # re-encoding keeps only what the roots depend on
+    encoder = ProofEncoder()
+    for root in ProofDecoder(archive).roots():
+        encoder.add_root(root)
+    archive = encoder.archive()
+    report.steps_after = len(archive.steps)
+    return archive, report
+
+
+def minimize_proof(
+    *conclusions: Proposition,
+) -> tuple[list[Proposition], MinimizeReport]:
+    """
+    Rebuild `conclusions` with minimized proofs. The original propositions
+    are not modified.
+    """
+    from pylogic.proofs.archive import decode_proof, encode_proof
+
+    archive, report = minimize_archive(encode_proof(*conclusions))
+    return decode_proof(archive), report
@@ -0,0 +1,168 @@
+"""
+Checking proof archives on a process pool.
+
+Deriving a step (`ProofChecker.derive`) only reads the archive, so the steps
+of a large proof can be derived in worker processes. The archive is written
+once to shared memory (see `ProofArchive.dumps`); each worker attaches to it
+by name when it starts and decodes the formulas it needs from the node table.
+Tasks and results only carry step indices, so formulas are never sent between
+processes. The parent then applies the derivations in topological order,
+which only propagates validity and open assumptions and is cheap.
+
+Steps are partitioned along the inference DAG: the independent subtrees of
+the proof (connected components, where the steps of a context block are
+connected to the steps that close it) are grouped into tasks of about
+`chunk_size` steps, and components larger than that are split into runs of
+consecutive steps, which share most of their formulas.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pylogic.proofs.checker import CheckResult, Derivation, ProofChecker
+
+if TYPE_CHECKING:
+    from pylogic.proofs.archive import ProofArchive
+    from pylogic.proposition.proposition import Proposition
+
+DEFAULT_CHUNK_SIZE = 512
+
+# the checker of a worker process, set by _init_worker
+_worker_checker: ProofChecker | None = None
+
+
+def _find(parent: list[int], i: int) -> int:
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:
+        parent[i], i = root, parent[i]
+    return root
+
+
+def partition(
+    archive: ProofArchive, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> list[list[int]]:
+    """
+    Split the steps of `archive` into groups that can be derived independently.
+    Each group is sorted, and the groups are ordered by their first step.
+    """
+    n = len(archive.steps)
+    parent = list(range(n))
+    for index, (_, _, premises, contexts, _, _) in enumerate(archive.steps):
+        deps = [p for p in premises if p != index]
+        for c in contexts:
+            _, _, assumptions, conclusions, _ = archive.contexts[c]
+            deps.extend(ref for kind, ref in assumptions if kind == "step")
+            deps.extend(conclusions)
+        for dep in deps:
+            if 0 <= dep < n:
+                a, b = _find(parent, index), _find(parent, dep)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+    components: dict[int, list[int]] = {}
+    for index in range(n):
+        components.setdefault(_find(parent, index), []).append(index)
+
+    groups: list[list[int]] = []
+    current: list[int] = []
+    for steps in components.values():
+        if len(steps) >= chunk_size:
+            groups.extend(
+                steps[i : i + chunk_size] for i in range(0, len(steps), chunk_size)
+            )
+            continue
+        current.extend(steps)
+        if len(current) >= chunk_size:
+            groups.append(sorted(current))
+            current = []
+    if current:
+        groups.append(sorted(current))
+    groups.sort(key=lambda g: g[0])
+    return groups
+
+
+def _init_worker(name: str, size: int, strict: bool) -> None:
+    global _worker_checker
+    from multiprocessing import shared_memory
+
+    from pylogic.proofs.archive import ProofArchive
+
+    # workers share the resource tracker of the parent, which unlinks the
+    # block when it is done
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        archive = ProofArchive.loads(bytes(shm.buf[:size]))
+    finally:
+        shm.close()
+    _worker_checker = ProofChecker(archive, strict=strict)
+
+
+def _derive_steps(steps: list[int]) -> list[tuple[int, Derivation]]:
+    checker = _worker_checker
+    assert checker is not None, "worker was not initialized"
+    return [(index, checker.derive(index)) for index in steps]
+
+
+def check_archive_parallel(
+    archive: ProofArchive,
+    processes: int | None = None,
+    strict: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CheckResult:
+    """
+    Check `archive` like `ProofChecker(archive, strict).check()`, deriving
+    the steps on a pool of `processes` workers (default: one per CPU).
+    Small archives are checked in this process.
+    """
+    import os
+    from multiprocessing import Pool, shared_memory
+
+    checker = ProofChecker(archive, strict=strict)
+    n = len(archive.steps)
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or n <= chunk_size:
+        return checker.check()
+
+    data = archive.dumps(compress=False)
+    size = len(data)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    try:
+        shm.buf[:size] = data
+        del data
+        derivations: list[Derivation | None] = [None] * n
+        with Pool(
+            processes, initializer=_init_worker, initargs=(shm.name, size, strict)
+        ) as pool:
+            for results in pool.imap_unordered(
+                _derive_steps, partition(archive, chunk_size)
+            ):
+                for index, derivation in results:
+                    derivations[index] = derivation
+    finally:
+        shm.close()
+        shm.unlink()
+
+    for index, derivation in enumerate(derivations):
+        assert derivation is not None, f"step {index} was not derived"
+        checker.apply(index, derivation)
+    checker.check_roots()
+    return checker.result
+
+
+def check_proof_parallel(
+    proof: ProofArchive | Proposition,
+    processes: int | None = None,
+    strict: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> CheckResult:
+    """
+    Check a proof, given as an archive or as a proven proposition, on a
+    process pool. See `check_archive_parallel`.
+    """
+    from pylogic.proofs.archive import ProofArchive, encode_proof
+
+    archive = proof if isinstance(proof, ProofArchive) else encode_proof(proof)
+    return check_archive_parallel(archive, processes, strict, chunk_size)
@@ -0,0 +1,247 @@
+"""
+Profiling of the size and shape of proofs.
+
+A proof is the graph of propositions linked through their `deduced_from`
+inferences; propositions used by several inferences are shared, so it is a
+DAG. `ProofProfile` walks it and reports
+
+- the number of propositions (nodes) and premise links (edges),
+- the depth: the longest chain of inferences from a leaf to a conclusion,
+- the tree size: the number of nodes if shared subproofs were copied, and
+  the propositions that are shared,
+- the number of inferences using each rule, and the time spent in each rule
+  if the proof was built while `record_timings` was active,
+- the largest formulas in the proof.
+
+The walk uses explicit stacks, so proofs of any depth can be profiled.
+"""
+
+from __future__ import annotations
+
+import heapq
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from pylogic.proposition.proposition import Proposition
+
+DEFAULT_LARGEST = 10
+# tree sizes grow exponentially with the depth of shared subproofs
+TREE_SIZE_CAP = 10**18
+
+
+@contextmanager
+def record_timings() -> Iterator[None]:
+    """
+    Record the duration of the inferences made in the block, for
+    `ProofProfile.rule_time`. The duration of an inference is the time since
+    the previous inference, so it also counts the work done between rules
+    (eg building the formulas they are applied to). Only inferences made in
+    the current thread or task are timed.
+    """
+    from pylogic.inference import _rule_timer, _RuleTimer
+
+    token = _rule_timer.set(_RuleTimer())
+    try:
+        yield
+    finally:
+        _rule_timer.reset(token)
+
+
+def _proof_dependencies(prop: Proposition) -> list[Proposition]:
+    inference = prop.deduced_from
+    if inference is None:
+        return []
+    deps = [p for p in inference.premises if p is not prop]
+    if inference.inner_contexts:
+        from pylogic.proofs.archive import context_conclusions
+        from pylogic.proposition.proposition import Proposition
+
+        for context in inference.inner_contexts:
+            deps.extend(a for a in context.assumptions if isinstance(a, Proposition))
+            deps.extend(context_conclusions(context))
+    return deps
+
+
+def formula_size(prop: Any, _sizes: dict[int, int] | None = None) -> int:
+    """
+    The number of subformulas and subterms of `prop`, counting repeated ones
+    each time they occur.
+    """
+    from pylogic.traversal import children
+
+    sizes = _sizes if _sizes is not None else {}
+    # kept alive so that ids are not reused during the walk
+    keep: list[Any] = []
+    stack: list[tuple[Any, bool]] = [(prop, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if id(current) in sizes:
+            continue
+        parts = children(current)
+        if expanded:
+            sizes[id(current)] = 1 + sum(sizes[id(c)] for c in parts)
+            keep.append(current)
+            continue
+        stack.append((current, True))
+        stack.extend((c, False) for c in parts if id(c) not in sizes)
+    return sizes[id(prop)]
+
+
+class ProofProfile:
+    """
+    The size, shape and rule usage of the proofs of `conclusions`. See the
+    module docstring.
+
+    Parameters
+    ----------
+    *conclusions: Proposition
+    largest: int
+        Number of largest formulas to keep. 0 skips measuring formulas.
+
+    Attributes
+    ----------
+    nodes: int
+        Number of propositions in the proofs.
+    edges: int
+        Number of links from a proposition to the premises (and context
+        assumptions and conclusions) it was deduced from.
+    depth: int
+        Length of the longest chain of inferences.
+    tree_size: int
+        Number of nodes if the proofs were trees, with shared subproofs
+        copied, at most `TREE_SIZE_CAP`.
+    shared: int
+        Propositions used by more than one inference.
+    rule_counts: dict[str, int]
+        Number of inferences using each rule.
+    rule_time: dict[str, float]
+        Seconds spent in each rule, for the inferences made while
+        `record_timings` was active.
+    largest_formulas: list[tuple[int, Proposition]]
+        The largest formulas with their sizes (see `formula_size`), largest
+        first.
+    """
+
+    def __init__(self, *conclusions: Proposition, largest: int = DEFAULT_LARGEST) -> None:
+        self.conclusions = conclusions
+        self.nodes = 0
+        self.edges = 0
+        self.depth = 0
+        self.tree_size = 0
+        self.shared = 0
+        self.rule_counts: dict[str, int] = {}
+        self.rule_time: dict[str, float] = {}
+        self.largest_formulas: list[tuple[int, Proposition]] = []
+        self._profile(largest)
+
+    def _profile(self, largest: int) -> None:
+        # id -> index of the proposition; props keeps them alive
+        index: dict[int, int] = {}
+        props: list[Proposition] = []
+        deps: list[list[int]] = []
+        depth: list[int] = []
+        tree_size: list[int] = []
+        in_progress: set[int] = set()
+
+        for conclusion in self.conclusions:
+            # (proposition, its dependencies once expanded)
+            stack: list[tuple[Proposition, list | None]] = [(conclusion, None)]
+            while stack:
+                current, current_deps = stack.pop()
+                if id(current) in index:
+                    continue
+                if current_deps is None:
+                    if id(current) in in_progress:
+                        raise ValueError(f"The proof of {current} is cyclic")
+                    in_progress.add(id(current))
+                    current_deps = _proof_dependencies(current)
+                    stack.append((current, current_deps))
+                    stack.extend(
+                        (d, None) for d in reversed(current_deps) if id(d) not in index
+                    )
+                    continue
+                in_progress.discard(id(current))
+                refs = [index[id(d)] for d in current_deps]
+                index[id(current)] = len(props)
+                props.append(current)
+                deps.append(refs)
+                depth.append(1 + max((depth[r] for r in refs), default=-1))
+                tree_size.append(
+                    min(TREE_SIZE_CAP, 1 + sum(tree_size[r] for r in refs))
+                )
+                self._count_inference(current)
+
+        users = [0] * len(props)
+        for refs in deps:
+            for r in set(refs):
+                users[r] += 1
+        self.nodes = len(props)
+        self.edges = sum(map(len, deps))
+        roots = [index[id(c)] for c in self.conclusions]
+        self.depth = max((depth[r] for r in roots), default=0)
+        self.tree_size = min(TREE_SIZE_CAP, sum(tree_size[r] for r in set(roots)))
+        self.shared = sum(1 for u in users if u > 1)
+        if largest > 0:
+            sizes: dict[int, int] = {}
+            self.largest_formulas = heapq.nlargest(
+                largest,
+                ((formula_size(p, sizes), p) for p in props),
+                key=lambda item: item[0],
+            )
+
+    def _count_inference(self, prop: Proposition) -> None:
+        inference = prop.deduced_from
+        if inference is None:
+            return
+        rule = inference.rule
+        self.rule_counts[rule] = self.rule_counts.get(rule, 0) + 1
+        duration = getattr(inference, "duration", None)
+        if duration is not None:
+            self.rule_time[rule] = self.rule_time.get(rule, 0.0) + duration
+
+    @property
+    def shared_ratio(self) -> float:
+        """
+        The fraction of the propositions that are shared.
+        """
+        return self.shared / self.nodes if self.nodes else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ProofProfile(nodes={self.nodes}, depth={self.depth}, "
+            f"tree_size={self.tree_size}, shared_ratio={self.shared_ratio:.3f})"
+        )
+
+    def report(self, max_width: int = 80) -> str:
+        """
+        A human-readable summary. Formulas are cut to `max_width` characters.
+        """
+        lines = [
+            f"nodes: {self.nodes}",
+            f"edges: {self.edges}",
+            f"depth: {self.depth}",
+            f"tree size: {self.tree_size}",
+            f"shared: {self.shared} ({self.shared_ratio:.1%})",
+            "rules:",
+        ]
+        for rule, count in sorted(self.rule_counts.items(), key=lambda rc: -rc[1]):
+            line = f"  {rule:<36}{count:>10}"
+            if rule in self.rule_time:
+                line += f"{self.rule_time[rule]:>12.6f}s"
+            lines.append(line)
+        if self.largest_formulas:
+            lines.append("largest formulas:")
+            for size, prop in self.largest_formulas:
+                text = str(prop)
+                if len(text) > max_width:
+                    text = text[: max_width - 3] + "..."
+                lines.append(f"  {size:>8}  {text}")
+        return "\n".join(lines)
+
+
+def profile_proof(*conclusions: Proposition, largest: int = DEFAULT_LARGEST) -> ProofProfile:
+    """
+    Profile the proofs of `conclusions`. See `ProofProfile`.
+    """
+    return ProofProfile(*conclusions, largest=largest)
@@ -0,0 +1,563 @@
+"""
+An asyncio interface to the prover and the proof checker.
+
+`prove_async` and `check_async` run `proof_search` and `ProofChecker` without
+blocking the event loop. By default they run in a thread; assumptions
+contexts are stored in context variables, so the search does not interfere
+with proofs made by the caller or by other tasks.
+
+A `ProverPool` runs the searches and checks on worker processes instead, so
+CPU-bound searches run in parallel:
+
+- at most `processes` jobs run at a time, one per worker;
+- at most `max_pending` jobs are running or waiting for a worker; further
+  submissions wait for a slot, which bounds memory and applies backpressure
+  to the producer;
+- a job that times out or is cancelled stops its worker, which is replaced.
+
+Jobs cross the process boundary as formula node tables (see
+`pylogic.serialize`) and proof archives (see `pylogic.proofs.archive`). The
+premises are assumed in the worker, and the proof it finds is checked again
+and attached to the caller's premises, like a proof loaded from a
+`ProofCache`. Each job runs in a discarded `ProofSession`, so workers do not
+accumulate state.
+
+For testing, the pool can be served as JSON lines on stdin/stdout or TCP::
+
+    python -m pylogic.proofs.service [--tcp HOST:PORT] [--processes N]
+
+Each request is a JSON object on one line, and gets a response with the same
+`id`, in completion order:
+
+- `{"id": 1, "op": "prove", "nodes": [...], "kb": [...], "target": 3}`
+  proves the formula at index `target` of the node table from those at the
+  indices `kb`, and returns `{"id": 1, "ok": true, "proof": {...}}` with the
+  proof archive;
+- `{"id": 2, "op": "check", "proof": {...}, "strict": false}` checks an
+  archive, and returns `{"id": 2, "ok": true, "valid": true, "errors": {},
+  ...}`. The response also lists the steps accepted without proof (`todo`
+  and `axioms`) and the open assumptions of each root (`assumptions`), since
+  a valid proof is only as good as these.
+
+Failures return `{"id": ..., "ok": false, "type": ..., "error": ...}`.
+`prove_request` builds a prove request from propositions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sys
+from decimal import Decimal
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Iterable
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.context import BaseContext
+
+    from pylogic.proofs.archive import ProofArchive
+    from pylogic.proofs.checker import CheckResult
+    from pylogic.proposition.proposition import Proposition
+
+
+def _run_job(kind: str, payload: Any) -> Any:
+    from pylogic.proofs.archive import ProofArchive, encode_proof
+    from pylogic.proofs.checker import ProofChecker
+    from pylogic.proposition.proof_search import proof_search
+    from pylogic.serialize import FormulaDecoder
+    from pylogic.session import ProofSession
+
+    with ProofSession(discard=True):
+        if kind == "prove":
+            nodes, kb_refs, target_ref = payload
+            decoder = FormulaDecoder(nodes)
+            kb = [decoder.build(ref) for ref in kb_refs]
+            for p in kb:
+                p._set_is_assumption(True)
+            proof = proof_search(kb, decoder.decode(target_ref))
+            return encode_proof(proof).to_dict()
+        if kind == "check":
+            data, strict = payload
+            return ProofChecker(ProofArchive.from_dict(data), strict=strict).check()
+    raise ValueError(f"Unknown job {kind!r}")
+
+
+def _worker_main(conn: Connection) -> None:
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+        try:
+            reply = ("ok", _run_job(*job))
+        except Exception as e:
+            reply = ("error", type(e).__name__, str(e))
+        conn.send(reply)
+
+
+class _Worker:
+    """
+    A worker process and the parent's end of its pipe.
+    """
+
+    def __init__(self, context: BaseContext) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    async def run(self, kind: str, payload: Any) -> tuple:
+        self.conn.send((kind, payload))
+        try:
+            return await asyncio.to_thread(self.conn.recv)
+        except (EOFError, OSError):
+            raise RuntimeError("The prover worker exited") from None
+
+    def stop(self, wait: bool = True) -> None:
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            if wait:
+                self.process.join(1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class ProverPool:
+    """
+    Runs proof searches and checks on worker processes. See the module
+    docstring.
+
+    Parameters
+    ----------
+    processes: int | None
+        Number of workers, default one per CPU.
+    max_pending: int | None
+        Maximum number of jobs running or waiting for a worker, default
+        `4 * processes`.
+    timeout: float | None
+        Default time limit of a job, in seconds.
+    mp_context: BaseContext | None
+        The multiprocessing context used to start workers (default:
+        `multiprocessing.get_context()`).
+
+    Attributes
+    ----------
+    stats: dict[str, int]
+        Numbers of jobs submitted, completed, failed, timed out and
+        cancelled, and of workers restarted.
+    """
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        max_pending: int | None = None,
+        timeout: float | None = None,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        import multiprocessing
+
+        self.processes = processes or os.cpu_count() or 1
+        self.max_pending = max_pending or 4 * self.processes
+        assert self.max_pending >= self.processes, "max_pending must be at least processes"
+        self.timeout = timeout
+        self._context = mp_context or multiprocessing.get_context()
+        self._workers: list[_Worker] = []
+        self._idle: asyncio.Queue[_Worker] = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._pending = 0
+        self._closed = False
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "timed_out": 0,
+            "cancelled": 0,
+            "restarted": 0,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ProverPool(processes={self.processes}, pending={self._pending}, "
+            f"max_pending={self.max_pending})"
+        )
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of jobs running or waiting for a worker.
+        """
+        return self._pending
+
+    async def __aenter__(self) -> ProverPool:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        self.close()
+
+    def _start_worker(self) -> None:
+        worker = _Worker(self._context)
+        self._workers.append(worker)
+        self._idle.put_nowait(worker)
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.kill()
+        self._workers.remove(worker)
+        if not self._closed:
+            self.stats["restarted"] += 1
+            self._start_worker()
+
+    async def _run(self, kind: str, payload: Any, timeout: float | None) -> Any:
+        if self._closed:
+            raise RuntimeError("The prover pool is closed")
+        if not self._workers:
+            for _ in range(self.processes):
+                self._start_worker()
+        timeout = self.timeout if timeout is None else timeout
+        self.stats["submitted"] += 1
+        self._pending += 1
+        try:
+            async with self._slots:
+                worker = await self._idle.get()
+                try:
+                    reply = await asyncio.wait_for(worker.run(kind, payload), timeout)
+                except BaseException as e:
+                    # the worker may still be busy with the job
+                    self._replace(worker)
+                    if isinstance(e, TimeoutError):
+                        self.stats["timed_out"] += 1
+                    elif isinstance(e, asyncio.CancelledError):
+                        self.stats["cancelled"] += 1
+                    else:
+                        self.stats["failed"] += 1
+                    raise
+                self._idle.put_nowait(worker)
+        finally:
+            self._pending -= 1
+        if reply[0] == "ok":
+            self.stats["completed"] += 1
+            return reply[1]
+        self.stats["failed"] += 1
+        _, name, message = reply
+        if name == "ValueError":
+            raise ValueError(message)
+        raise RuntimeError(f"{name}: {message}")
+
+    async def prove(
+        self,
+        kb: Iterable[Proposition],
+        target: Proposition,
+        timeout: float | None = None,
+    ) -> Proposition:
+        """
+        Prove `target` from the proven propositions `kb` on a worker.
+        Raises ValueError if no proof is found, and TimeoutError if
+        `timeout` (default: the pool's) seconds pass first.
+        """
+        from pylogic.proofs.archive import ProofArchive
+        from pylogic.proofs.cache import _attach
+        from pylogic.serialize import FormulaEncoder
+
+        kb = list(kb)
+        for p in kb:
+            if p == target:
+                return p
+        encoder = FormulaEncoder()
+        kb_refs = encoder.encode_all(kb)
+        target_ref = encoder.encode(target)
+        data = await self._run("prove", (encoder.nodes, kb_refs, target_ref), timeout)
+        proof = _attach(ProofArchive.from_dict(data), target, kb)
+        if proof is None:
+            raise RuntimeError(f"The proof of {target} found by the worker is invalid")
+        return proof
+
+    async def check(
+        self,
+        proof: ProofArchive | Proposition,
+        strict: bool = False,
+        timeout: float | None = None,
+    ) -> CheckResult:
+        """
+        Check a proof, given as an archive or as a proven proposition, on a
+        worker.
+        """
+        from pylogic.proofs.archive import ProofArchive, encode_proof
+
+        archive = proof if isinstance(proof, ProofArchive) else encode_proof(proof)
+        return await self._run("check", (archive.to_dict(), strict), timeout)
+
+    def close(self) -> None:
+        """
+        Stop the workers. Jobs still running fail.
+        """
+        self._closed = True
+        for worker in self._workers:
+            worker.stop()
+        self._workers.clear()
+
+
+async def prove_async(
+    kb: Iterable[Proposition],
+    target: Proposition,
+    pool: ProverPool | None = None,
+    timeout: float | None = None,
+) -> Proposition:
+    """
+    Prove `target` from `kb` like `proof_search`, on `pool` if given and in
+    a thread otherwise. Raises ValueError if no proof is found, and
+    TimeoutError after `timeout` seconds. A search running in a thread
+    cannot be stopped, so it finishes in the background after a timeout.
+    """
+    from pylogic.proposition.proof_search import proof_search
+
+    kb = list(kb)
+    if pool is not None:
+        return await pool.prove(kb, target, timeout)
+    return await asyncio.wait_for(asyncio.to_thread(proof_search, kb, target), timeout)
+
+
+async def check_async(
+    proof: ProofArchive | Proposition,
+    strict: bool = False,
+    pool: ProverPool | None = None,
+    timeout: float | None = None,
+) -> CheckResult:
+    """
+    Check a proof like `check_proof`, on `pool` if given and in a thread
+    otherwise.
+    """
+    from pylogic.proofs.archive import ProofArchive, encode_proof
+    from pylogic.proofs.checker import ProofChecker
+
+    archive = proof if isinstance(proof, ProofArchive) else encode_proof(proof)
+    if pool is not None:
+        return await pool.check(archive, strict, timeout)
+    checker = ProofChecker(archive, strict=strict)
+    return await asyncio.wait_for(asyncio.to_thread(checker.check), timeout)
+
+
+# JSON has no tuples or exact numbers; these are tagged objects
+def _to_json(obj: Any) -> Any:
+    if isinstance(obj, (list, tuple)):
+        return [_to_json(x) for x in obj]
+    if isinstance(obj, dict):
+        return {str(k): _to_json(v) for k, v in obj.items()}
+    if isinstance(obj, Fraction):
+        return {"fraction": str(obj)}
+    if isinstance(obj, Decimal):
+        return {"decimal": str(obj)}
+    if isinstance(obj, complex):
+        return {"complex": [obj.real, obj.imag]}
+    return obj
+
+
+def _from_json(obj: Any) -> Any:
+    if isinstance(obj, list):
+        return tuple(_from_json(x) for x in obj)
+    if isinstance(obj, dict):
+        if obj.keys() == {"fraction"}:
+            return Fraction(obj["fraction"])
+        if obj.keys() == {"decimal"}:
+            return Decimal(obj["decimal"])
+        if obj.keys() == {"complex"}:
+            return complex(*obj["complex"])
+        raise ValueError(f"Unexpected object {obj!r}")
+    return obj
+
+
+def prove_request(
+    kb: Iterable[Proposition], target: Proposition, id: Any = None
+) -> dict[str, Any]:
+    """
+    A JSON prove request for the server (see the module docstring).
+    """
+    from pylogic.serialize import FormulaEncoder
+
+    encoder = FormulaEncoder()
+    kb_refs = encoder.encode_all(kb)
+    target_ref = encoder.encode(target)
+    return {
+        "id": id,
+        "op": "prove",
+        "nodes": _to_json(encoder.nodes),
+        "kb": list(kb_refs),
+        "target": target_ref,
+    }
+
+
+def _archive_from_json(data: dict[str, Any]) -> ProofArchive:
+    from pylogic.proofs.archive import ProofArchive
+    from pylogic.serialize import check_nodes
+
+    archive = ProofArchive.from_dict(
+        {k: v if k == "format" else _from_json(v) for k, v in data.items()}
+    )
+    check_nodes(archive.nodes)
+    return archive
+
+
+async def handle_request(pool: ProverPool, request: dict[str, Any]) -> dict[str, Any]:
+    """
+    Run one JSON request on `pool` and return the response.
+    """
+    from pylogic.proofs.archive import encode_proof
+    from pylogic.serialize import FormulaDecoder, check_nodes
+    from pylogic.session import ProofSession
+
+    response: dict[str, Any] = {"id": request.get("id")}
+    try:
+        op = request.get("op")
+        timeout = request.get("timeout")
+        if op == "prove":
+            with ProofSession(discard=True):
+                nodes = _from_json(request["nodes"])
+                check_nodes(nodes)
+                decoder = FormulaDecoder(nodes)
+                kb = [decoder.build(ref) for ref in request.get("kb", [])]
+                for p in kb:
+                    p._set_is_assumption(True)
+                target = decoder.decode(request["target"])
+                proof = await pool.prove(kb, target, timeout)
+                response.update(ok=True, proof=_to_json(encode_proof(proof).to_dict()))
+        elif op == "check":
+            archive = _archive_from_json(request["proof"])
+            result = await pool.check(archive, bool(request.get("strict")), timeout)
+            response.update(
+                ok=True,
+                valid=result.ok,
+                errors={str(k): v for k, v in result.errors.items()},
+                unchecked=result.unchecked,
+                todo=result.todo,
+                axioms=result.axioms,
+                assumptions={
+                    str(root): sorted(result.assumptions.get(root, ()))
+                    for root in archive.roots
+                },
+            )
+        elif op == "stats":
+            response.update(ok=True, stats=pool.stats, pending=pool.pending)
+        else:
+            raise ValueError(f"Unknown op {op!r}")
+    except Exception as e:
+        response.update(ok=False, type=type(e).__name__, error=str(e))
+    return response
+
+
+async def serve_lines(
+    pool: ProverPool,
+    readline: Callable[[], Awaitable[bytes]],
+    write: Callable[[bytes], Awaitable[None]],
+) -> None:
+    """
+    Answer the JSON-lines requests returned by `readline` with `write`,
+    until `readline` returns an empty line. Requests run concurrently, up to
+    the pool's limits, and responses are written as they complete. No more
+    lines are read while `max_pending` requests are running, so clients
+    that send faster than the pool proves are slowed down.
+    """
+    lock = asyncio.Lock()
+    slots = asyncio.Semaphore(pool.max_pending)
+    tasks: set[asyncio.Task] = set()
+
+    async def answer(line: bytes) -> None:
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("A request must be a JSON object")
+            except ValueError as e:
+                response = {"id": None, "ok": False, "type": "ValueError", "error": str(e)}
+            else:
+                response = await handle_request(pool, request)
+            async with lock:
+                await write(json.dumps(response).encode() + b"\n")
+        finally:
+            slots.release()
+
+    while line := await readline():
+        if not line.strip():
+            continue
+        await slots.acquire()
+        task = asyncio.create_task(answer(line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def serve_stdio(pool: ProverPool) -> None:
+    """
+    Serve JSON lines on stdin and stdout until stdin is closed.
+    """
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+
+    async def write(data: bytes) -> None:
+        stdout.write(data)
+        stdout.flush()
+
+    # stdin can be a file, which asyncio cannot read without blocking
+    await serve_lines(pool, lambda: asyncio.to_thread(stdin.readline), write)
+
+
+async def serve_tcp(pool: ProverPool, host: str, port: int) -> asyncio.Server:
+    """
+    Start serving JSON lines on a TCP socket, one client per connection.
+    """
+
+    async def client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def write(data: bytes) -> None:
+            writer.write(data)
+            await writer.drain()
+
+        try:
+            await serve_lines(pool, reader.readline, write)
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(client, host, port)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pylogic.proofs.service",
+        description="Serve the prover and checker as JSON lines.",
+    )
+    parser.add_argument("--tcp", metavar="HOST:PORT", help="listen on TCP instead of stdio")
+    parser.add_argument("--processes", type=int, help="number of worker processes")
+    parser.add_argument("--max-pending", type=int, help="maximum number of queued jobs")
+    parser.add_argument("--timeout", type=float, help="time limit of a job in seconds")
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        async with ProverPool(args.processes, args.max_pending, args.timeout) as pool:
+            if args.tcp is None:
+                await serve_stdio(pool)
+                return
+            host, _, port = args.tcp.rpartition(":")
+            server = await serve_tcp(pool, host or "127.0.0.1", int(port))
+            print(f"listening on {args.tcp}", file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
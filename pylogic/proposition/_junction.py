@@ -179,8 +179,9 @@ class _Junction(Proposition, Generic[*Ps], ABC):
                 props.append(prop)
                 added.add(prop)
         if len(props) == 1:
-            # not making a copy here, I think no need
-            new_p = props[0]
+            # a copy, since props[0] may be the conclusion of another proof
+            # (eg of a case in by_cases), which must not be changed
+            new_p = props[0].copy()
             new_p.is_assumption = self.is_assumption
             new_p.description = self.description
             if self._is_proven:
@@ -258,22 +259,9 @@ class _Junction(Proposition, Generic[*Ps], ABC):
                 f"{other} is not an instance of {self.__class__}\n\
 Occured when trying to unify `{self}` and `{other}`"
             )
-        if len(self.propositions) != len(other.propositions):
-            return None
-        d: Unification = {}
-        for s_prop, o_prop in zip(self.propositions, other.propositions):
-            res: Unification | Literal[True] | None = s_prop.unify(o_prop)  # type: ignore
-            if res is None:
-                return None
-            if isinstance(res, dict):
-                for k in res:
-                    if k in d and d[k] != res[k]:
-                        return None
-                    d[k] = res[k]
-        if len(d) == 0:
-            return True
-        else:
-            return d
+        from pylogic.helpers import unify
+
+        return unify(self, other)
 
     def resolve(self, p: list[Proposition] | And[*Props]) -> Proposition | Self:
         r"""
@@ -395,27 +395,9 @@ class Implies(Proposition, Generic[TProposition, UProposition]):
                 f"{other} is not an instance of {self.__class__}\n\
 Occured when trying to unify `{self}` and `{other}`"
             )
-        d: Unification = {}
-        res1 = self.antecedent.unify(other.antecedent)
-        if res1 is None:
-            return None
-        if isinstance(res1, dict):
-            for k in res1:
-                if k in d and d[k] != res1[k]:
-                    return None
-                d[k] = res1[k]
-        res2 = self.consequent.unify(other.consequent)
-        if res2 is None:
-            return None
-        if isinstance(res2, dict):
-            for k in res2:
-                if k in d and d[k] != res2[k]:
-                    return None
-                d[k] = res2[k]
-        if len(d) == 0:
-            return True
-        else:
-            return d
+        from pylogic.helpers import unify
+
+        return unify(self, other)
 
     def has_as_subproposition(self, other: Proposition) -> bool:
         """
@@ -15,6 +15,7 @@ from pylogic.enviroment_settings.settings import settings
 
 from pylogic.proposition.implies import Implies
 from pylogic.proposition.proposition import get_assumptions
+from pylogic.session import journal_add, journal_discard, journal_setattr
 from pylogic.typing import Term, Unification
 
 if TYPE_CHECKING:
@@ -190,23 +191,23 @@ class Not(Implies, Generic[TProposition]):
             case Equals(right=r):
                 if r == EmptySet:
                     if value:
-                        self.negated.left.is_empty = False
-                        self.negated.left.knowledge_base.add(self)
+                        journal_setattr(self.negated.left, "is_empty", False)
+                        journal_add(self.negated.left.knowledge_base, self)
                     else:
-                        self.negated.left.is_empty = None
-                        self.negated.left.knowledge_base.discard(self)
+                        journal_setattr(self.negated.left, "is_empty", None)
+                        journal_discard(self.negated.left.knowledge_base, self)
                 elif r == Constant(0):
                     if value:
-                        self.negated.left.is_zero = False
-                        self.negated.left.knowledge_base.add(self)
+                        journal_setattr(self.negated.left, "is_zero", False)
+                        journal_add(self.negated.left.knowledge_base, self)
                     else:
-                        self.negated.left.is_zero = None
-                        self.negated.left.knowledge_base.discard(self)
+                        journal_setattr(self.negated.left, "is_zero", None)
+                        journal_discard(self.negated.left.knowledge_base, self)
             case BinaryRelation():
                 if value:
-                    self.negated.left.knowledge_base.add(self)
+                    journal_add(self.negated.left.knowledge_base, self)
                 else:
-                    self.negated.left.knowledge_base.discard(self)
+                    journal_discard(self.negated.left.knowledge_base, self)
 
     def _set_is_proven(self, value: bool, **kwargs) -> None:
         super()._set_is_proven(value, **kwargs)
@@ -360,7 +361,9 @@ class Not(Implies, Generic[TProposition]):
                 f"{other} is not an instance of {self.__class__}\n\
 Occured when trying to unify `{self}` and `{other}`"
             )
-        return self.negated.unify(other.negated)
+        from pylogic.helpers import unify
+
+        return unify(self.negated, other.negated)
 
     def has_as_subproposition(self, other: Proposition) -> bool:
         """
@@ -6,6 +6,7 @@ from pylogic.constant import Constant
 from pylogic.proposition.ordering.ordering import _Ordering
 from pylogic.proposition.ordering.total import StrictTotalOrder
 from pylogic.proposition.proposition import get_assumptions
+from pylogic.session import journal_add
 from pylogic.typing import Term
 
 if TYPE_CHECKING:
@@ -178,7 +179,7 @@ class LessThan(StrictTotalOrder[T, U], _Ordering):
                     self, conclusion=new_p, rule="by_definition"
                 )
                 new_p.from_assumptions = set()
-                self.left.knowledge_base.add(new_p)
+                journal_add(self.left.knowledge_base, new_p)
                 return new_p
             else:
                 raise ValueError(f"{self} is not true by definition")
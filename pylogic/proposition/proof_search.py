@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from pylogic.assumptions_context import AssumptionsContext, conclude
+from pylogic.discrimination_tree import LemmaIndex, universal_prefix
 from pylogic.inference import Inference
 from pylogic.proposition.and_ import And
 from pylogic.proposition.contradiction import Contradiction
@@ -11,14 +12,25 @@ from pylogic.proposition.implies import Implies
 from pylogic.proposition.not_ import Not, are_negs, neg
 from pylogic.proposition.or_ import Or
 from pylogic.proposition.proposition import Proposition
+from pylogic.proposition.quantified.forall import Forall, ForallInSet, ForallSubsets
+from pylogic.proposition.relation.contains import IsContainedIn
 from pylogic.proposition.relation.equals import Equals
+from pylogic.proposition.relation.subsets import IsSubsetOf
 
 
 def proof_search(kb: list[Proposition], target: Proposition) -> Proposition:
     """
     Attempt to build an Inference proving `target` from premises in `kb`.
     Raises ValueError if no proof is found.
+
+    If the environment variable `PYLOGIC_PROOF_CACHE` is set, proofs are
+    stored in and loaded from that directory (see `pylogic.proofs.cache`).
     """
+    from pylogic.proofs.cache import cached_proof, default_cache
+
+    cache = default_cache()
+    if cache is not None:
+        return cached_proof(target, kb, cache)
     return _BackwardProver(kb).prove(target)
 
 
@@ -73,7 +85,10 @@ def check_kb(kb: list[Proposition]) -> None:
 
 class _BackwardProver:
     def __init__(
-        self, kb: list[Proposition], no_extend: set[Proposition] | None = None
+        self,
+        kb: list[Proposition],
+        no_extend: set[Proposition] | None = None,
+        lemmas: LemmaIndex | None = None,
     ) -> None:
         # knowledge base of proven propositions
         self.kb = list(kb)  # make copy in case other prover has same kb
@@ -82,6 +97,21 @@ class _BackwardProver:
             if isinstance(p, And) and not p in self.no_extend:
                 self.kb.extend(p.extract())
                 self.no_extend.add(p)
+        # universal statements in the KB, indexed by conclusion; shared with
+        # the provers of subgoals unless they add new ones
+        self.lemmas = lemmas if lemmas is not None else LemmaIndex()
+        new_lemmas = [
+            p for p in self.kb if isinstance(p, Forall) and p not in self.lemmas
+        ]
+        if new_lemmas:
+            self.lemmas = self.lemmas.copy() if lemmas is not None else self.lemmas
+            for p in new_lemmas:
+                self.lemmas.add(p)
+
+    def _extended(self, *props: Proposition) -> _BackwardProver:
+        return _BackwardProver(
+            self.kb + list(props), no_extend=self.no_extend, lemmas=self.lemmas
+        )
 
     def prove(self, goal: Proposition) -> Proposition:
         return self._prove(goal, visited=set(), no_recurse_on=set())
@@ -152,9 +182,7 @@ class _BackwardProver:
                     cons = ant_inf.modus_ponens(p)
                     if cons == p:
                         continue
-                    new_prover = _BackwardProver(
-                        self.kb + [cons], no_extend=self.no_extend
-                    )
+                    new_prover = self._extended(cons)
                     ret_val = new_prover._prove(
                         goal, visited=set(), no_recurse_on=no_recurse_on.union({p})
                     )
@@ -176,9 +204,7 @@ class _BackwardProver:
                     #             f"{_p} at index {_i} is not proven "
                     #             + str(len(self.kb) + 1)
                     #         )
-                    new_prover = _BackwardProver(
-                        self.kb + [neg_ante], no_extend=self.no_extend
-                    )
+                    new_prover = self._extended(neg_ante)
                     ret_val = new_prover._prove(
                         goal, visited=set(), no_recurse_on=no_recurse_on.union({p})
                     )
@@ -196,9 +222,7 @@ class _BackwardProver:
                     ctx = AssumptionsContext().open()
                     c.assume()
                     # add c to KB only within this context
-                    new_prover = _BackwardProver(
-                        self.kb + [c], no_extend=self.no_extend
-                    )
+                    new_prover = self._extended(c)
                     not_proven = False
                     try:
                         new_prover._prove(
@@ -232,6 +256,24 @@ class _BackwardProver:
                     )
                     return ret_val
 
+        # Universal instantiation: apply a lemma `forall x1 ... xn: A -> B`
+        # (or `forall x1 ... xn: B`) from the KB whose conclusion B becomes
+        # the goal for some values of x1 ... xn
+        for lemma, values, hypothesis in self.lemmas.candidates(goal):
+            if lemma in no_recurse_on:
+                continue
+            try:
+                return self._apply_lemma(
+                    lemma,
+                    values,
+                    hypothesis,
+                    goal,
+                    visited,
+                    no_recurse_on.union({lemma}),
+                )
+            except ValueError:
+                pass
+
         # Conjunction‐intro: if goal = A ∧ B ∧ …, prove each conjunct
         if isinstance(goal, And):
             sub_infs = [
@@ -245,9 +287,7 @@ class _BackwardProver:
             ctx = AssumptionsContext(auto_conclude=False).open()
             goal.antecedent.assume()
             # add A to KB only within this context
-            new_prover = _BackwardProver(
-                self.kb + [goal.antecedent], no_extend=self.no_extend
-            )
+            new_prover = self._extended(goal.antecedent)
             try:
                 b_inf = new_prover._prove(
                     goal.consequent, visited=set(), no_recurse_on=no_recurse_on
@@ -280,3 +320,48 @@ class _BackwardProver:
                     continue
         # If we get here, no rule applies
         raise ValueError(f"No rule found to prove {goal}")
+
+    def _apply_lemma(
+        self,
+        lemma: Forall,
+        values: dict,
+        hypothesis: bool,
+        goal: Proposition,
+        visited: set,
+        no_recurse_on: set[Proposition],
+    ) -> Proposition:
+        """
+        Instantiate the variables of `lemma` to `values` and prove `goal`
+        with it. The conditions `x in S` of `forall x in S` quantifiers
+        and, if `hypothesis`, the antecedent of the instantiated lemma are
+        proven as subgoals.
+        """
+        variables, body = universal_prefix(lemma)
+        conclusion = body.consequent if hypothesis else body  # type: ignore
+        if conclusion.replace(values) != goal:
+            raise ValueError(f"{lemma} does not prove {goal}")
+        layer: Proposition = lemma
+        for variable in variables:
+            term = values.get(variable, variable)
+            if isinstance(layer, ForallInSet):
+                condition = self._prove(
+                    IsContainedIn(term, layer.set_), visited, no_recurse_on
+                )
+                layer = layer.in_particular(term, condition)
+            elif isinstance(layer, ForallSubsets):
+                condition = self._prove(
+                    IsSubsetOf(term, layer.right_set), visited, no_recurse_on
+                )
+                layer = layer.in_particular(term, condition)
+            else:
+                assert isinstance(layer, Forall)
+                layer = layer.in_particular(term)
+        if hypothesis:
+            assert isinstance(layer, Implies)
+            if layer.consequent != goal:
+                raise ValueError(f"{lemma} does not prove {goal}")
+            antecedent = self._prove(layer.antecedent, visited, no_recurse_on)
+            layer = antecedent.modus_ponens(layer)
+        if layer != goal:
+            raise ValueError(f"{lemma} does not prove {goal}")
+        return layer
@@ -15,6 +15,8 @@ from typing import (
 
 from pylogic.enviroment_settings.settings import settings
 from pylogic.helpers import fn_alias
+from pylogic.session import journal_attrs
+from pylogic.traversal import wrap_traversal_methods
 
 if TYPE_CHECKING:
     from pylogic.constant import Constant
@@ -135,6 +137,11 @@ class Proposition:
         {"name": "de_morgan", "arguments": []},
     ]
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # __str__, __eq__, replace etc. are evaluated without recursion
+        wrap_traversal_methods(cls, "proposition")
+
     def __init__(
         self,
         name: str,
@@ -371,6 +378,7 @@ class Proposition:
     def _set_is_proven(self, value: bool, **kwargs) -> None:
         import pylogic.assumptions_context as ac
 
+        journal_attrs(self, "_is_proven")
         self._is_proven = value
         if value:
             self._set_is_inferred(True)
@@ -382,13 +390,14 @@ class Proposition:
             return
 
         # context can be None
-        context = kwargs.get("context", ac.assumptions_contexts[-1])
+        context = kwargs.get("context", ac.current_context())
         if context is not None and value:
             context._proven.append(self)
-        if ac._target_to_prove == self:
-            ac._target_to_prove = None
+        if ac._target.get() == self:
+            ac._target.set(None)
 
     def _set_is_assumption(self, value: bool, **kwargs) -> None:
+        journal_attrs(self, "is_assumption")
         self.is_assumption = value
         if value:
             self._set_is_inferred(True)
@@ -403,22 +412,22 @@ class Proposition:
         add_to_context = kwargs.get("add_to_context", True)
         if not add_to_context:
             return
-        context = kwargs.get("context", ac.assumptions_contexts[-1])
+        context = kwargs.get("context", ac.current_context())
         if context is not None and value:
             context.assumptions.append(self)
-        if ac._target_to_prove == self:
-            ac._target_to_prove = None
-        elif isinstance(ac._target_to_prove, Implies):
+        target = ac._target.get()
+        if target == self:
+            ac._target.set(None)
+        elif isinstance(target, Implies):
             try:
-                ac._target_to_prove = (
-                    ac._target_to_prove.first_unit_definite_clause_resolve(
-                        self, prove=False
-                    )
+                ac._target.set(
+                    target.first_unit_definite_clause_resolve(self, prove=False)
                 )
             except (AssertionError, TypeError, ValueError):
                 pass
 
     def _set_is_axiom(self, value: bool) -> None:
+        journal_attrs(self, "is_axiom")
         self.is_axiom = value
         if value:
             self._set_is_inferred(True)
@@ -501,6 +510,12 @@ class Proposition:
     def __hash__(self) -> int:
         return hash((self.name, *self.args))
 
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        # the knowledge bases of the terms refer back to their propositions
+        from pylogic.serialize import reduce_with_state
+
+        return reduce_with_state(self)
+
     def __repr__(self) -> str:
         if self.args:
             args_str = tuple(str(a) for a in self.args)
@@ -1746,15 +1761,15 @@ class Proposition:
 
         assert isinstance(other, Forall), f"{other} is not a forall statement"
         assert other.is_proven, f"{other} is not proven"
-        unif = other.inner_proposition.unify(self)
-        condition1 = isinstance(unif, dict) and len(unif) == 1
-        condition2 = False
-        if condition1:
-            try:
-                condition2 = other.in_particular(unif[other.variable]) == self  # type: ignore
-            except KeyError:
-                condition2 = False
-        if condition2 or (unif is True):
+        from pylogic.unification import match
+
+        # only the quantified variable is instantiated, so that P(x) is
+        # not a special case of forall y: P(1)
+        unif = match(other.inner_proposition, self, [other.variable])
+        condition = unif is not None and (
+            not unif or other.in_particular(unif[other.variable]) == self  # type: ignore
+        )
+        if condition:
             new_p = self.copy()
             new_p._set_is_proven(True)
             new_p.deduced_from = Inference(
@@ -2175,24 +2190,12 @@ and is a dependency of {expression_to_replace}"
         assert (
             self.is_atomic and other.is_atomic
         ), f"{self} and {other} are not atomic sentences"
-        from pylogic.helpers import unify as term_unify
-
-        if self.name != other.name or len(self.args) != len(other.args):
-            return None
-        d: Unification = {}
-        for s_arg, o_arg in zip(self.args, other.args):
-            res = term_unify(s_arg, o_arg)
-            if isinstance(res, dict):
-                for k in res:
-                    if k in d and d[k] != res[k]:
-                        return None
-                    d[k] = res[k]
-            elif res is None:
-                return None
-        if len(d) == 0:
-            return True
-        else:
-            return d
+        from pylogic.helpers import unify
+
+        return unify(self, other)
+
+
+wrap_traversal_methods(Proposition, "proposition")
 
 
 def predicate(name: str) -> Callable[..., Proposition]:
@@ -12,6 +12,7 @@ from pylogic.proposition.quantified.quantified import _Quantified
 from pylogic.proposition.relation.contains import IsContainedIn
 from pylogic.proposition.relation.equals import Equals
 from pylogic.proposition.relation.subsets import IsSubsetOf
+from pylogic.session import journal_add, journal_update
 from pylogic.typing import Term
 from pylogic.variable import Variable
 
@@ -169,9 +170,9 @@ class Exists(_Quantified[TProposition]):
             self, conclusion=proven_inner, rule="extract"
         )
         if isinstance(proven_inner, And):
-            c.knowledge_base.update(proven_inner.extract())
+            journal_update(c.knowledge_base, proven_inner.extract())
         else:
-            c.knowledge_base.add(proven_inner)
+            journal_add(c.knowledge_base, proven_inner)
         return (c, proven_inner)
 
     def exists_modus_ponens(self, other: Forall[Implies[TProposition, B]]) -> Exists[B]:
@@ -238,7 +238,9 @@ class _Quantified(Proposition, Generic[TProposition], ABC):
                 f"{other} is not an instance of {self.__class__}\n\
 Occured when trying to unify `{self}` and `{other}`"
             )
-        return self.inner_proposition.unify(other.inner_proposition)
+        from pylogic.helpers import unify
+
+        return unify(self.inner_proposition, other.inner_proposition)
 
     def has_as_subproposition(self, other: Proposition) -> bool:
         """
@@ -5,6 +5,7 @@ from typing import Callable, Generic, Self, TypeVar
 from pylogic.helpers import replace
 from pylogic.proposition.proposition import get_assumptions
 from pylogic.proposition.relation.relation import Relation
+from pylogic.session import journal_add, journal_discard
 from pylogic.typing import Term
 
 C = TypeVar("C", bound="BinaryRelation")
@@ -72,9 +73,9 @@ class BinaryRelation(Relation, Generic[T, U]):
     def _set_is_inferred(self, value: bool) -> None:
         super()._set_is_inferred(value)
         if value:
-            self.left.knowledge_base.add(self)
+            journal_add(self.left.knowledge_base, self)
         else:
-            self.left.knowledge_base.discard(self)
+            journal_discard(self.left.knowledge_base, self)
 
     def _set_is_proven(self, value: bool, **kwargs) -> None:
         super()._set_is_proven(value, **kwargs)
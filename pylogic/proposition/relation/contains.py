@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any, Self, TypedDict, TypeVar
 
 from pylogic.inference import Inference
 from pylogic.proposition.relation.binaryrelation import BinaryRelation
+from pylogic.session import journal_add, journal_discard, journal_setattr
 from pylogic.typing import Term
 
 if TYPE_CHECKING:
@@ -29,6 +30,13 @@ T = TypeVar("T", bound=Term)
 InferenceRule = TypedDict("InferenceRule", {"name": str, "arguments": list[str]})
 
 
+def _proven_members(set_: Any) -> Any:
+    # sets and classes keep proven memberships in their bounded containment
+    # cache, so that eg Naturals.elements does not grow with every proof
+    cache = getattr(set_, "containment_cache", None)
+    return set_.elements if cache is None else cache
+
+
 class IsContainedIn(BinaryRelation[T, U]):
     is_transitive = False
     name = "IsContainedIn"
@@ -93,23 +101,23 @@ class IsContainedIn(BinaryRelation[T, U]):
             # TODO: add more here
             if self.right.name in sets_and_attrs:
                 for attr in sets_and_attrs[self.right.name]:
-                    setattr(self.left, attr, True)
+                    journal_setattr(self.left, attr, True)
             else:
                 for attr in assumption_attrs:
-                    setattr(self.left, attr, getattr(self.right, attr))
-            self.left.knowledge_base.add(self)
-            self.left.sets_contained_in.add(self.right)
-            self.right.elements.add(self.left)
+                    journal_setattr(self.left, attr, getattr(self.right, attr))
+            journal_add(self.left.knowledge_base, self)
+            journal_add(self.left.sets_contained_in, self.right)
+            journal_add(_proven_members(self.right), self.left)
         else:
             if self.right.name in sets_and_attrs:
                 for attr in sets_and_attrs[self.right.name]:
-                    setattr(self.left, attr, None)
+                    journal_setattr(self.left, attr, None)
             else:
                 for attr in assumption_attrs:
-                    setattr(self.left, attr, None)
-            self.left.knowledge_base.discard(self)
-            self.left.sets_contained_in.discard(self.right)
-            self.right.elements.discard(self.left)
+                    journal_setattr(self.left, attr, None)
+            journal_discard(self.left.knowledge_base, self)
+            journal_discard(self.left.sets_contained_in, self.right)
+            journal_discard(_proven_members(self.right), self.left)
 
     # def _set_is_proven(self, value: bool, **kwargs) -> None:
     #     super()._set_is_proven(value, **kwargs)
@@ -227,14 +235,14 @@ class IsContainedIn(BinaryRelation[T, U]):
         from pylogic.proposition.relation.equals import Equals
         from pylogic.structures.set_ import EmptySet
 
-        self.right.is_empty = False
+        journal_setattr(self.right, "is_empty", False)
         res = Not(
             Equals(self.right, EmptySet),
             _is_proven=True,
             _inference=Inference(self, rule="thus_not_empty"),
             _assumptions=get_assumptions(self),
         )
-        self.right.knowledge_base.add(res)
+        journal_add(self.right.knowledge_base, res)
         return res
 
     def thus_contained_in_at_least_one(self) -> Or[IsContainedIn, ...]:
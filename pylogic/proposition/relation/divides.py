@@ -9,6 +9,7 @@ from pylogic.proposition.ordering.lessthan import LessThan
 from pylogic.proposition.proposition import Proposition
 from pylogic.proposition.quantified.exists import ExistsInSet
 from pylogic.proposition.relation.relation import Relation
+from pylogic.session import journal_add, journal_discard
 from pylogic.structures.ordered_set import OrderedSet
 from pylogic.structures.ringlike.ring import RIng
 from pylogic.typing import Term, Unevaluated
@@ -83,9 +84,9 @@ class Divides(Relation):
     def _set_is_inferred(self, value: bool) -> None:
         super()._set_is_inferred(value)
         if value:
-            self.a.knowledge_base.add(self)
+            journal_add(self.a.knowledge_base, self)
         else:
-            self.a.knowledge_base.discard(self)
+            journal_discard(self.a.knowledge_base, self)
         self._definition._set_is_inferred(value)
 
     def _set_is_proven(self, value: bool, **kwargs) -> None:
@@ -135,12 +136,17 @@ class Divides(Relation):
         )
 
     def by_inspection_check(self) -> bool | None:
-        from pylogic.helpers import is_python_real_numeric
+        from pylogic.helpers import is_integer_numeric, is_python_real_numeric
+        from pylogic.number_theory import divides
 
         if isinstance(self.a, Constant) and isinstance(self.b, Constant):
+            if is_integer_numeric(self.a, self.b):
+                return divides(self.a.value, self.b.value)
             if is_python_real_numeric(self.a.value) and is_python_real_numeric(
                 self.b.value
             ):
+                if self.a.value == 0:
+                    return self.b.value == 0
                 return self.b.value % self.a.value == 0
         return None
 
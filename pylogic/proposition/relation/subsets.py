@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING, Any, Self, TypedDict, TypeVar
 
 from pylogic.proposition.proposition import get_assumptions
 from pylogic.proposition.relation.binaryrelation import BinaryRelation
+from pylogic.session import journal_add, journal_discard, journal_setattr
 
 if TYPE_CHECKING:
     from pylogic.expressions.sequence_term import SequenceTerm
@@ -81,6 +82,8 @@ right: {right}, right.is_set: {right.is_set}"
         )
 
     def _set_is_inferred(self, value: bool) -> None:
+        from pylogic.proposition.relation.contains import _proven_members
+
         sets_and_attrs = {
             "Naturals": ["is_natural"],
             "Integers": ["is_integer"],
@@ -103,21 +106,21 @@ right: {right}, right.is_set: {right.is_set}"
             # TODO: add more here
             if self.right.name in sets_and_attrs:
                 for attr in sets_and_attrs[self.right.name]:
-                    setattr(self.left, attr, True)
+                    journal_setattr(self.left, attr, True)
             else:
                 for attr in assumption_attrs:
-                    setattr(self.left, attr, getattr(self.right, attr, None))
-            self.left.knowledge_base.add(self)
-            self.right.elements.add(self.left)
+                    journal_setattr(self.left, attr, getattr(self.right, attr, None))
+            journal_add(self.left.knowledge_base, self)
+            journal_add(_proven_members(self.right), self.left)
         else:
             if self.right.name in sets_and_attrs:
                 for attr in sets_and_attrs[self.right.name]:
-                    setattr(self.left, attr, None)
+                    journal_setattr(self.left, attr, None)
             else:
                 for attr in assumption_attrs:
-                    setattr(self.left, attr, None)
-            self.left.knowledge_base.discard(self)
-            self.right.elements.discard(self.left)
+                    journal_setattr(self.left, attr, None)
+            journal_discard(self.left.knowledge_base, self)
+            journal_discard(_proven_members(self.right), self.left)
 
     def to_forall(self) -> Forall[Implies[IsContainedIn, IsContainedIn]]:
         """
@@ -0,0 +1,395 @@
+"""
+Incremental re-checking of proof scripts.
+
+A script is split into its top-level statements, the steps. Each step reads
+some names and binds others; a name read by a step comes from the last
+earlier step that bound it. The hash of a step covers its code (not its
+formatting or comments) and the hashes of the steps it reads from, so it
+changes when the step or anything it depends on changes.
+
+After a run, the values bound by each step are stored in a proof cache (see
+`pylogic.proofs.cache`): propositions with their proofs, contexts,
+variables and other terms, and tuples and lists of these. On the next run,
+a step whose hash is unchanged is not executed; its values are restored
+from the cache. Steps that changed, and the steps that depend on them, are
+executed again.
+
+Restored values are rebuilt without side effects: restored propositions are
+not added to the knowledge bases of their terms. Function and class
+definitions, imports and expression statements are always executed, as
+are steps that bind values which cannot be stored.
+
+Run a script with::
+
+    python -m pylogic.recheck script.py [--cache DIR] [--clear]
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import os
+import sys
+import zlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pylogic.proofs.archive import ProofDecoder, ProofEncoder
+    from pylogic.proofs.cache import ProofCache
+
+RECHECK_FORMAT = 2
+CACHE_DIR_NAME = ".pylogic_cache"
+
+# steps that are cheap and bind no proofs, and expressions, which are only
+# run for their side effects
+_ALWAYS_RUN = (
+    ast.Import,
+    ast.ImportFrom,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.Expr,
+)
+
+
+class _Names(ast.NodeVisitor):
+    """
+    Collects the global names read and bound by a top-level statement.
+    """
+
+    def __init__(self) -> None:
+        self.reads: set[str] = set()
+        self.writes: set[str] = set()
+        self.star_import = False
+        self._depth = 0
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Load):
+            self.reads.add(node.id)
+        elif self._depth == 0:
+            self.writes.add(node.id)
+
+    def _visit_target(self, node: ast.expr) -> None:
+        # x.a = ... and x[i] = ... change x
+        while isinstance(node, (ast.Attribute, ast.Subscript)):
+            node = node.value
+        if isinstance(node, ast.Name) and self._depth == 0:
+            self.reads.add(node.id)
+            self.writes.add(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if not isinstance(node.ctx, ast.Load):
+            self._visit_target(node)
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        if not isinstance(node.ctx, ast.Load):
+            self._visit_target(node)
+        self.generic_visit(node)
+
+    def _visit_scope(self, node: ast.AST, name: str | None) -> None:
+        if name is not None and self._depth == 0:
+            self.writes.add(name)
+        # names read in the body are globals at call time, so they are
+        # dependencies; names bound there are local
+        self._depth += 1
+        self.generic_visit(node)
+        self._depth -= 1
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_scope(node, node.name)
+
+    visit_AsyncFunctionDef = visit_FunctionDef  # type: ignore
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self._visit_scope(node, node.name)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        self._visit_scope(node, None)
+
+    def _visit_comprehension(self, node: ast.AST) -> None:
+        self._visit_scope(node, None)
+
+    visit_ListComp = visit_SetComp = visit_DictComp = _visit_comprehension  # type: ignore
+    visit_GeneratorExp = _visit_comprehension  # type: ignore
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.writes.add(alias.asname or alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_import = True
+            else:
+                self.writes.add(alias.asname or alias.name)
+
+
+class ScriptStep:
+    """
+    A top-level statement of a script.
+
+    Attributes
+    ----------
+    index: int
+    lineno: int
+        Line of the statement in the script.
+    reads, writes: set[str]
+        Global names read and bound by the statement.
+    depends_on: list[int]
+        The earlier steps that bound the names it reads.
+    hash: str
+        Hash of the statement and of the steps it depends on.
+    status: str | None
+        "run" or "restored" after `recheck`.
+    """
+
+    def __init__(self, index: int, node: ast.stmt) -> None:
+        self.index = index
+        self.node = node
+        self.lineno = node.lineno
+        names = _Names()
+        names.visit(node)
+        self.reads = names.reads
+        self.writes = names.writes
+        self.star_import = names.star_import
+        self.depends_on: list[int] = []
+        self.hash = ""
+        self.status: str | None = None
+
+    def __repr__(self) -> str:
+        return f"ScriptStep({self.index}, line {self.lineno}, {self.status})"
+
+    @property
+    def always_run(self) -> bool:
+        return isinstance(self.node, _ALWAYS_RUN)
+
+
+def script_steps(source: str, salt: str = "") -> list[ScriptStep]:
+    """
+    Split `source` into steps, with their dependencies and hashes.
+    """
+    tree = ast.parse(source)
+    steps = [ScriptStep(i, node) for i, node in enumerate(tree.body)]
+    bound_by: dict[str, int] = {}
+    star_imports: list[int] = []
+    for step in steps:
+        deps = {bound_by[name] for name in step.reads if name in bound_by}
+        # a name that is not bound may come from a star import
+        if any(name not in bound_by for name in step.reads):
+            deps.update(star_imports)
+        step.depends_on = sorted(deps)
+        digest = hashlib.sha256(salt.encode())
+        digest.update(ast.dump(step.node).encode())
+        for d in step.depends_on:
+            digest.update(steps[d].hash.encode())
+        step.hash = digest.hexdigest()
+        for name in step.writes:
+            bound_by[name] = step.index
+        if step.star_import:
+            star_imports.append(step.index)
+    return steps
+
+
+class _ValueEncoder:
+    """
+    Encodes the values bound by steps into one proof archive, so that the
+    objects shared between steps are shared again when restored.
+    """
+
+    def __init__(self) -> None:
+        from pylogic.proofs.archive import ProofEncoder
+
+        self.proofs: ProofEncoder = ProofEncoder()
+
+    def encode(self, value: Any) -> tuple:
+        """
+        Raises TypeError if `value` cannot be stored.
+        """
+        from pylogic.assumptions_context import AssumptionsContext
+        from pylogic.proposition.proposition import Proposition
+
+        if isinstance(value, Proposition):
+            return ("step", self.proofs.add(value))
+        if isinstance(value, AssumptionsContext):
+            return ("context", self.proofs.add_context(value))
+        if isinstance(value, (tuple, list)):
+            return (type(value).__name__, tuple(self.encode(v) for v in value))
+        return ("term", self.proofs.formulas.encode(value))
+
+
+def _decode_value(decoder: ProofDecoder, ref: tuple) -> Any:
+    kind, data = ref
+    if kind == "step":
+        return decoder.proposition(data)
+    if kind == "context":
+        return decoder.context(data)
+    if kind == "tuple":
+        return tuple(_decode_value(decoder, r) for r in data)
+    if kind == "list":
+        return [_decode_value(decoder, r) for r in data]
+    return decoder.formulas.decode(data)
+
+
+class RecheckReport:
+    """
+    The outcome of `recheck`.
+
+    Attributes
+    ----------
+    steps: list[ScriptStep]
+    namespace: dict[str, Any]
+        The globals of the script after the run.
+    """
+
+    def __init__(self, path: str, steps: list[ScriptStep], namespace: dict) -> None:
+        self.path = path
+        self.steps = steps
+        self.namespace = namespace
+
+    @property
+    def run(self) -> list[ScriptStep]:
+        return [s for s in self.steps if s.status == "run"]
+
+    @property
+    def restored(self) -> list[ScriptStep]:
+        return [s for s in self.steps if s.status == "restored"]
+
+    def __repr__(self) -> str:
+        return (
+            f"RecheckReport({self.path!r}, run={len(self.run)}, "
+            f"restored={len(self.restored)})"
+        )
+
+
+def _cache_key(path: str, salt: str) -> str:
+    return hashlib.sha256(f"recheck|{os.path.abspath(path)}|{salt}".encode()).hexdigest()
+
+
+def _load_state(cache: ProofCache, key: str) -> dict[str, Any] | None:
+    from pylogic.serialize import check_nodes, loads_data
+
+    data = cache.read(key)
+    if data is None:
+        return None
+    try:
+        state = loads_data(zlib.decompress(data))
+        if not isinstance(state, dict) or state.get("format") != RECHECK_FORMAT:
+            return None
+        # the archive is decoded when steps are restored
+        check_nodes(state["archive"]["nodes"])
+    except (ValueError, KeyError, TypeError, zlib.error):
+        return None
+    return state
+
+
+def default_recheck_cache(path: str) -> ProofCache:
+    """
+    The cache given by `PYLOGIC_PROOF_CACHE`, or a `.pylogic_cache`
+    directory next to the script.
+    """
+    from pylogic.proofs.cache import ProofCache, default_cache
+
+    cache = default_cache()
+    if cache is None:
+        cache = ProofCache(
+            os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+        )
+    return cache
+
+
+def recheck(
+    path: str,
+    cache: ProofCache | None = None,
+    namespace: dict[str, Any] | None = None,
+) -> RecheckReport:
+    """
+    Run the script at `path`, restoring the steps that did not change since
+    the last run from `cache` (default: `default_recheck_cache(path)`).
+    """
+    from pylogic.proofs.archive import ProofArchive, ProofDecoder
+    from pylogic.proofs.cache import pylogic_version
+    from pylogic.serialize import dumps_data
+
+    if cache is None:
+        cache = default_recheck_cache(path)
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    salt = pylogic_version()
+    steps = script_steps(source, salt)
+    key = _cache_key(path, salt)
+
+    previous = _load_state(cache, key)
+    stored: dict[str, dict[str, tuple]] = previous["steps"] if previous else {}
+    decoder = (
+        ProofDecoder(ProofArchive.from_dict(previous["archive"])) if previous else None
+    )
+
+    if namespace is None:
+        namespace = {"__name__": "__main__", "__file__": os.path.abspath(path)}
+    encoder = _ValueEncoder()
+    new_stored: dict[str, dict[str, tuple]] = {}
+    for step in steps:
+        refs = stored.get(step.hash)
+        if refs is not None and decoder is not None and not step.always_run:
+            namespace.update(
+                {name: _decode_value(decoder, ref) for name, ref in refs.items()}
+            )
+            step.status = "restored"
+        else:
+            module = ast.Module(body=[step.node], type_ignores=[])
+            exec(compile(module, path, "exec"), namespace)
+            step.status = "run"
+        if step.always_run:
+            continue
+        try:
+            new_stored[step.hash] = {
+                name: encoder.encode(namespace[name])
+                for name in sorted(step.writes)
+                if name in namespace
+            }
+        except (TypeError, ValueError):
+            # not restorable; this step is run every time
+            pass
+
+    state = {
+        "format": RECHECK_FORMAT,
+        "steps": new_stored,
+        "archive": encoder.proofs.archive().to_dict(),
+    }
+    cache.write(key, zlib.compress(dumps_data(state)))
+    return RecheckReport(path, steps, namespace)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m pylogic.recheck",
+        description="Run a proof script, re-checking only the steps that changed.",
+    )
+    parser.add_argument("script", help="path of the script")
+    parser.add_argument("--cache", help="cache directory")
+    parser.add_argument(
+        "--clear", action="store_true", help="clear the cache before running"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="list the steps")
+    args = parser.parse_args(argv)
+
+    from pylogic.proofs.cache import ProofCache
+
+    cache = ProofCache(args.cache) if args.cache else default_recheck_cache(args.script)
+    if args.clear:
+        cache.clear()
+    # the script's imports are relative to its directory, as with `python script`
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.script)))
+    report = recheck(args.script, cache)
+    if args.verbose:
+        for step in report.steps:
+            print(f"line {step.lineno}: {step.status}")
+    print(f"{len(report.run)} steps run, {len(report.restored)} restored")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
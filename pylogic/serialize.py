@@ -0,0 +1,828 @@
+"""
+Encoding of pylogic objects into flat, pickle-safe node tables.
+
+A formula is encoded into a list of nodes. Every node is a tuple whose first
+element is a tag and whose remaining elements are either plain python values
+or integer references to earlier nodes, so a node table is topologically
+ordered and can be stored with `pickle`, `marshal` or `json`-like formats.
+Structurally identical nodes are hash-consed: they are stored once and
+referenced by index.
+
+Objects that cannot be rebuilt from their structure (sets and sequences
+defined by lambdas, like `Naturals` or `EmptySet`) are referenced by the
+qualified name of the module attribute that holds them, see `register` and
+`named_objects`.
+
+The same names make sets and sequences picklable, see `reduce_collection`:
+lambdas cannot be pickled, so the sets and sequences that hold them are
+pickled by name or as formulas. A lambda given as the `nth_term` of a
+sequence or the `predicate` of a set is encoded by the formula it returns
+for a new variable, see `FormulaFunction`. Formulas and proofs that refer to
+them can then be sent to `multiprocessing` workers.
+
+Decoding a node table calls the classes it names, so `FormulaDecoder` only
+resolves names inside pylogic (see `resolve_trusted_name`): registered
+objects and module-level objects of `pylogic.*` modules, with classes that
+match the tags of their nodes. Node tables and the other data that pylogic
+writes to files or sends to other machines are stored with `dumps_data`, a
+JSON encoding of builtin values, and not with pickle, so loading them does
+not run arbitrary code.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import pickle
+from decimal import Decimal
+from fractions import Fraction
+from functools import lru_cache
+from types import FunctionType, ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+if TYPE_CHECKING:
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.variable import Variable
+
+Node = tuple
+
+# modules whose module-level sets, sequences and functions can be referenced
+# by name in a node table
+builtin_modules: list[str] = [
+    "pylogic.structures.set_",
+    "pylogic.structures.sequence",
+    "pylogic.theories.natural_numbers",
+    "pylogic.theories.integers",
+    "pylogic.theories.rational_numbers",
+    "pylogic.theories.real_numbers",
+    "pylogic.theories.numbers",
+    "pylogic.structures.class_",
+]
+
+_PY_SCALARS = (type(None), bool, int, float, complex, str, Fraction, Decimal)
+
+_registry: dict[str, Any] = {}
+_registry_names: dict[int, str] = {}
+_builtins_registered = False
+
+# attributes of symbols that can change after construction
+_SYMBOL_PROPS = (
+    "_is_real",
+    "_is_rational",
+    "_is_integer",
+    "_is_natural",
+    "_is_zero",
+    "_is_nonpositive",
+    "_is_nonnegative",
+    "_is_positive",
+    "_is_negative",
+    "_is_even",
+    "_is_odd",
+    "_is_set",
+    "_is_list",
+    "_is_sequence",
+    "_is_finite",
+)
+# keyword arguments of symbols that refer to mutable state and are not encoded
+_SKIPPED_SYMBOL_KWARGS = {"knowledge_base", "sets_contained_in", "context"}
+
+
+def register(obj: Any, name: str | None = None) -> Any:
+    """
+    Register an object so that it is encoded by name instead of by structure.
+    `name` defaults to `module:qualname` for functions and classes.
+    Returns the object, so this can be used as a decorator.
+    """
+    if name is None:
+        name = f"{obj.__module__}:{obj.__qualname__}"
+    _registry[name] = obj
+    _registry_names[id(obj)] = name
+    return obj
+
+
+def _is_named_kind(value: Any) -> bool:
+    from pylogic.structures.collection import Collection
+    from pylogic.structures.sequence import Sequence
+
+    # sets and classes are instances of classes made by Collection
+    return isinstance(value.__class__, Collection) or isinstance(value, Sequence)
+
+
+def named_objects() -> dict[int, str]:
+    """
+    Return a mapping from the ids of named objects (registered objects and
+    module-level sets, classes and sequences of `builtin_modules`) to their
+    qualified names.
+    """
+    import sys
+
+    names: dict[int, str] = {}
+    for module_name in builtin_modules:
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        for attr, value in vars(module).items():
+            if _is_named_kind(value) and id(value) not in names:
+                names[id(value)] = f"{module_name}:{attr}"
+    names.update(_registry_names)
+    return names
+
+
+def register_builtins() -> None:
+    """
+    Import `builtin_modules` and register their module-level sets, classes
+    and sequences. Objects imported by several modules keep the name of
+    the first.
+    """
+    global _builtins_registered
+    for module_name in builtin_modules:
+        module = importlib.import_module(module_name)
+        for attr, value in list(vars(module).items()):
+            if _is_named_kind(value) and id(value) not in _registry_names:
+                register(value, f"{module_name}:{attr}")
+    _builtins_registered = True
+
+
+def registered_name(obj: Any) -> str | None:
+    """
+    The name `obj` was registered with, or None. The builtin objects are
+    registered on first use.
+    """
+    if not _builtins_registered:
+        register_builtins()
+    return _registry_names.get(id(obj))
+
+
+def resolve_name(name: str) -> Any:
+    """
+    Return the object with qualified name `module:attr.attr...`.
+    """
+    if name in _registry:
+        return _registry[name]
+    module_name, _, qualname = name.partition(":")
+    obj: Any = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def resolve_trusted_name(name: Any) -> Any:
+    """
+    `resolve_name`, restricted to registered objects and module-level
+    attributes of pylogic modules. Raises ValueError for other names, before
+    importing anything.
+    """
+    if not isinstance(name, str):
+        raise ValueError(f"Invalid name {name!r}")
+    if name in _registry:
+        return _registry[name]
+    module_name, _, qualname = name.partition(":")
+    if not module_name.startswith("pylogic.") or not qualname or "." in qualname:
+        raise ValueError(f"{name!r} is not a pylogic name")
+    try:
+        return resolve_name(name)
+    except (ImportError, AttributeError):
+        raise ValueError(f"Unknown name {name!r}") from None
+
+
+# node tags whose second item is a class that is called to build the node
+_CLASS_TAGS = {
+    "var": "pylogic.variable:Variable",
+    "sym": "pylogic.symbol:Symbol",
+    "expr": "pylogic.expressions.expr:Expr",
+    "seq": "pylogic.structures.sequence:Sequence",
+    "set_": "pylogic.structures.set_:Set",
+    "setof": "pylogic.structures.set_:Set",
+    "prop": "pylogic.proposition.proposition:Proposition",
+    "atom": "pylogic.proposition.proposition:Proposition",
+}
+
+
+@lru_cache(maxsize=None)
+def _resolve_node_class(tag: str, name: str) -> type:
+    cls = resolve_trusted_name(name)
+    base = resolve_name(_CLASS_TAGS[tag])
+    if not (isinstance(cls, type) and issubclass(cls, base)):
+        raise ValueError(f"{name!r} cannot be used in a {tag!r} node")
+    return cls
+
+
+def _node_class(tag: str, name: Any) -> type:
+    if not isinstance(name, str):
+        raise ValueError(f"Invalid class name {name!r}")
+    return _resolve_node_class(tag, name)
+
+
+def _named_object(name: Any) -> Any:
+    obj = resolve_trusted_name(name)
+    # module-level sets, sequences and functions of pylogic
+    if isinstance(obj, (type, ModuleType)):
+        raise ValueError(f"{name!r} cannot be used in a 'name' node")
+    return obj
+
+
+def _check_symbol_props(props: Any) -> None:
+    if not all(attr in _SYMBOL_PROPS for attr, _ in props):
+        raise ValueError(f"Invalid symbol properties {props!r}")
+
+
+def check_nodes(nodes: Iterable[Node]) -> None:
+    """
+    Raises ValueError if `nodes` refer to objects outside pylogic, use
+    classes that do not match their tags, or set other attributes than the
+    properties of symbols. `FormulaDecoder` checks the nodes it decodes;
+    this checks a whole table up front.
+    """
+    for node in nodes:
+        if not isinstance(node, tuple) or not node or not isinstance(node[0], str):
+            raise ValueError(f"Invalid node {node!r}")
+        tag = node[0]
+        if tag == "name":
+            _named_object(node[1])
+        elif tag in _CLASS_TAGS:
+            _node_class(tag, node[1])
+            if tag in ("var", "sym"):
+                _check_symbol_props(node[4])
+
+
+def _to_data(obj: Any) -> Any:
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return obj
+    if isinstance(obj, tuple):
+        return [_to_data(x) for x in obj]
+    if isinstance(obj, list):
+        return {"list": [_to_data(x) for x in obj]}
+    if isinstance(obj, dict):
+        return {"dict": [[_to_data(k), _to_data(v)] for k, v in obj.items()]}
+    if isinstance(obj, frozenset):
+        return {"frozenset": [_to_data(x) for x in obj]}
+    if isinstance(obj, set):
+        return {"set": [_to_data(x) for x in obj]}
+    if isinstance(obj, Fraction):
+        return {"fraction": str(obj)}
+    if isinstance(obj, Decimal):
+        return {"decimal": str(obj)}
+    if isinstance(obj, complex):
+        return {"complex": [obj.real, obj.imag]}
+    raise TypeError(f"Cannot store {obj!r} of type {type(obj).__name__}")
+
+
+_FROM_DATA: dict[str, Callable[[Any], Any]] = {
+    "list": lambda v: [_from_data(x) for x in v],
+    "dict": lambda v: {_from_data(k): _from_data(x) for k, x in v},
+    "frozenset": lambda v: frozenset(_from_data(x) for x in v),
+    "set": lambda v: {_from_data(x) for x in v},
+    "fraction": Fraction,
+    "decimal": Decimal,
+    "complex": lambda v: complex(*v),
+}
+
+
+def _from_data(obj: Any) -> Any:
+    if isinstance(obj, list):
+        return tuple(_from_data(x) for x in obj)
+    if isinstance(obj, dict):
+        if len(obj) == 1:
+            ((kind, value),) = obj.items()
+            if kind in _FROM_DATA:
+                try:
+                    return _FROM_DATA[kind](value)
+                except (TypeError, ArithmeticError):
+                    pass
+        raise ValueError(f"Unexpected object {obj!r}")
+    return obj
+
+
+def dumps_data(obj: Any) -> bytes:
+    """
+    Serialize `obj`, made of python scalars, tuples, lists, dicts and sets,
+    to JSON. Tuples are JSON arrays and the other containers are tagged
+    objects, so `loads_data` restores them exactly.
+    """
+    return json.dumps(_to_data(obj), separators=(",", ":")).encode()
+
+
+def loads_data(data: bytes | memoryview) -> Any:
+    """
+    Inverse of `dumps_data`. Raises ValueError for data it did not write.
+    """
+    return _from_data(json.loads(bytes(data)))
+
+
+def _class_name(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _callable_name(func: Callable) -> str | None:
+    """
+    The qualified name of a module-level function, or None if `func`
+    cannot be looked up by name (lambdas, closures, bound methods).
+    """
+    module = getattr(func, "__module__", None)
+    qualname = getattr(func, "__qualname__", None)
+    if module is None or qualname is None or "<" in qualname:
+        return None
+    name = f"{module}:{qualname}"
+    try:
+        if resolve_name(name) is func:
+            return name
+    except (ImportError, AttributeError):
+        pass
+    return None
+
+
+def _has_anonymous_functions(obj: Any) -> bool:
+    """
+    Whether the attributes of `obj`, or the items of its dict, list and
+    tuple attributes, include functions that pickle cannot look up by name.
+    """
+    for value in vars(obj).values():
+        items = value.values() if isinstance(value, dict) else (
+            value if isinstance(value, (list, tuple)) else (value,)
+        )
+        for item in items:
+            if isinstance(item, FunctionType) and _callable_name(item) is None:
+                return True
+    return False
+
+
+class FormulaFunction:
+    """
+    A function of one argument given by a formula: calling it replaces
+    `variable` by the argument in `body`.
+
+    Examples
+    --------
+    >>> f = FormulaFunction.from_callable(lambda n: 2 * n + 1)
+    >>> print(f(Constant(3)))
+    2 * 3 + 1
+    """
+
+    def __init__(self, variable: Variable, body: Any) -> None:
+        self.variable = variable
+        self.body = body
+
+    @classmethod
+    def from_callable(
+        cls, func: Callable[[Any], Any], natural: bool = False
+    ) -> FormulaFunction:
+        """
+        The formula function that agrees with `func`, found by applying
+        `func` to a new variable (a natural number if `natural`).
+        Raises TypeError if `func` cannot be applied to a variable.
+        """
+        from pylogic.variable import Variable
+
+        variable = Variable("_arg")
+        # set directly, like the index of a sequence, so that no proposition
+        # about the variable is created
+        variable._is_natural = natural or None
+        try:
+            body = func(variable)
+        except Exception as e:
+            raise TypeError(f"Cannot apply {func!r} to a variable: {e}") from None
+        return cls(variable, body)
+
+    def __call__(self, x: Any) -> Any:
+        from pylogic.helpers import python_to_pylogic, replace
+
+        return replace(self.body, {self.variable: python_to_pylogic(x)})
+
+    def __repr__(self) -> str:
+        return f"FormulaFunction({self.variable!r}, {self.body!r})"
+
+
+# keyword arguments of sets and sequences whose lambdas are encoded as
+# formula functions
+_FORMULA_FUNCTIONS = ("nth_term", "predicate")
+
+
+def _as_formula_function(value: Any, natural: bool = False) -> Any:
+    if isinstance(value, FunctionType) and _callable_name(value) is None:
+        return FormulaFunction.from_callable(value, natural)
+    return value
+
+
+def _rebuild(new: type | Callable[[], Any], attrs: dict[str, Any]) -> Any:
+    obj = object.__new__(new) if isinstance(new, type) else new()
+    obj.__dict__.update(attrs)
+    return obj
+
+
+# attributes that the hashes of formulas depend on (see reduce_with_state);
+# formulas are DAGs, so these attributes do not refer back to the object
+_STRUCTURE_ATTRS = frozenset(
+    {
+        "args",
+        "negated",
+        "antecedent",
+        "consequent",
+        "left",
+        "right",
+        "propositions",
+        "variable",
+        "set_",
+        "inner_proposition",
+        "_inner_without_set",
+        "initial_terms",
+        "nth_term",
+        "function",
+        "arguments",
+        "domain",
+        "codomain",
+    }
+)
+
+
+def reduce_with_state(obj: Any, new: Callable[[], Any] | None = None) -> tuple:
+    """
+    A value for `obj.__reduce_ex__` that pickles the attributes of `obj`.
+
+    The attributes with scalar values (names, assumptions like `_is_real`)
+    and the subformulas and subterms are set when the object is created,
+    before the rest of its state is unpickled. Objects that refer back to
+    it, like the propositions of a symbol's knowledge base, can then hash
+    it while they are unpickled. Constructors are not called. `new` creates
+    an empty object when its class cannot be pickled.
+    """
+    structure = {}
+    rest = {}
+    for attr, value in obj.__dict__.items():
+        if attr in _STRUCTURE_ATTRS or isinstance(value, _PY_SCALARS):
+            structure[attr] = value
+        else:
+            rest[attr] = value
+    return (_rebuild, (new or obj.__class__, structure), rest)
+
+
+def reduce_collection(obj: Any, new: Callable[[], Any] | None = None) -> tuple:
+    """
+    The value of `obj.__reduce_ex__` for a set, class or sequence:
+
+    - registered objects (see `register` and `register_builtins`) are
+      pickled by name, and unpickled as the same object of the receiving
+      process;
+    - objects whose functions can be pickled are pickled with their state,
+      see `reduce_with_state`;
+    - other objects are pickled as formulas (see `FormulaEncoder`), and
+      unpickled as copies: the knowledge they have gained is lost. Their
+      `nth_term` and `predicate` lambdas become `FormulaFunction`s.
+
+    Raises pickle.PicklingError if `obj` cannot be encoded, eg if its
+    containment function is a lambda or it is a sequence whose `nth_term`
+    refers to itself.
+    """
+    name = registered_name(obj)
+    if name is not None:
+        return (resolve_name, (name,))
+    if not _has_anonymous_functions(obj):
+        return reduce_with_state(obj, new)
+    try:
+        nodes, root = encode(obj)
+    except TypeError as e:
+        raise pickle.PicklingError(
+            f"Cannot pickle {obj!r}: {e}. Objects defined by such functions "
+            "must be registered with pylogic.serialize.register"
+        ) from None
+    return (decode, (nodes, root))
+
+
+class FormulaEncoder:
+    """
+    Encodes pylogic objects into a table of hash-consed nodes.
+
+    Parameters
+    ----------
+    names: dict[int, str] | None
+        Mapping from object ids to qualified names for objects that are
+        encoded by name. Defaults to `named_objects()`.
+    """
+
+    def __init__(self, names: dict[int, str] | None = None) -> None:
+        self.nodes: list[Node] = []
+        self.names: dict[int, str] = names if names is not None else named_objects()
+        self._index: dict[tuple, int] = {}
+        # id(obj) -> (obj, index); obj is kept alive so that ids are not reused
+        self._seen: dict[int, tuple[Any, int]] = {}
+        # ids of the objects being encoded, to detect objects that refer to
+        # themselves (recursive sequences)
+        self._encoding: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _add(self, node: Node) -> int:
+        # include the types of the payload so that eg 1, 1.0 and True
+        # are not merged
+        key = (node, tuple(map(type, node)))
+        index = self._index.get(key)
+        if index is None:
+            index = len(self.nodes)
+            self.nodes.append(node)
+            self._index[key] = index
+        return index
+
+    def encode(self, obj: Any) -> int:
+        """
+        Encode `obj` and return the index of its node.
+        """
+        seen = self._seen.get(id(obj))
+        if seen is not None:
+            return seen[1]
+        if id(obj) in self._encoding:
+            raise TypeError(f"Cannot encode {obj!r}, which refers to itself")
+        self._encoding.add(id(obj))
+        try:
+            index = self._add(self._encode_node(obj))
+        finally:
+            self._encoding.discard(id(obj))
+        self._seen[id(obj)] = (obj, index)
+        return index
+
+    def encode_all(self, objs: Iterable[Any]) -> tuple[int, ...]:
+        return tuple(self.encode(obj) for obj in objs)
+
+    def _encode_kwargs(
+        self, kwargs: dict[str, Any], skip=(), natural_functions: bool = False
+    ) -> tuple:
+        return tuple(
+            (
+                k,
+                self.encode(
+                    _as_formula_function(v, natural_functions and k == "nth_term")
+                    if k in _FORMULA_FUNCTIONS
+                    else v
+                ),
+            )
+            for k, v in sorted(kwargs.items())
+            if k not in skip and v is not None
+        )
+
+    def _encode_node(self, obj: Any) -> Node:
+        from pylogic.constant import Constant
+        from pylogic.expressions.expr import Expr
+        from pylogic.proposition.proposition import Proposition
+        from pylogic.structures.sequence import Sequence
+        from pylogic.structures.set_ import Set
+        from pylogic.symbol import Symbol
+        from pylogic.variable import Variable
+
+        if isinstance(obj, _PY_SCALARS):
+            return ("py", obj)
+        if id(obj) in self.names:
+            return ("name", self.names[id(obj)])
+        if isinstance(obj, Proposition):
+            return self._encode_proposition(obj)
+        if isinstance(obj, Constant):
+            return ("const", obj.value)
+        if isinstance(obj, Variable):
+            return self._encode_symbol("var", obj)
+        if isinstance(obj, Symbol):
+            return self._encode_symbol("sym", obj)
+        if isinstance(obj, Expr):
+            return (
+                "expr",
+                _class_name(obj.__class__),
+                self.encode_all(obj._init_args),
+                self._encode_kwargs(obj._init_kwargs),
+            )
+        if isinstance(obj, Set):
+            return self._encode_set(obj)
+        if isinstance(obj, Sequence):
+            return (
+                "seq",
+                _class_name(obj.__class__),
+                self.encode_all(obj._init_args),
+                self._encode_kwargs(obj._init_kwargs, natural_functions=True),
+            )
+        if isinstance(obj, FormulaFunction):
+            return ("fn", self.encode_all((obj.variable, obj.body)))
+        if isinstance(obj, (list, tuple)):
+            return ("list" if isinstance(obj, list) else "tuple", self.encode_all(obj))
+        if isinstance(obj, (set, frozenset)):
+            refs = sorted(self.encode_all(obj))
+            return ("set" if isinstance(obj, set) else "frozenset", tuple(refs))
+        if isinstance(obj, dict):
+            return ("dict", tuple((self.encode(k), self.encode(v)) for k, v in obj.items()))
+        if callable(obj):
+            name = _callable_name(obj)
+            if name is not None:
+                return ("name", name)
+        raise TypeError(f"Cannot encode {obj!r} of type {type(obj).__name__}")
+
+    def _encode_symbol(self, tag: str, symbol) -> Node:
+        props = tuple(
+            (attr, getattr(symbol, attr))
+            for attr in _SYMBOL_PROPS
+            if getattr(symbol, attr, None) is not None
+        )
+        depends_on = self.encode_all(getattr(symbol, "depends_on", ()))
+        return (
+            tag,
+            _class_name(symbol.__class__),
+            symbol.name,
+            self._encode_kwargs(symbol._init_kwargs, skip=_SKIPPED_SYMBOL_KWARGS),
+            props,
+            depends_on,
+        )
+
+    def _encode_set(self, set_) -> Node:
+        from pylogic.structures import set_ as s
+
+        cls = set_.__class__
+        name = _class_name(cls)
+        if isinstance(set_, s.SeqSet):
+            return ("setof", name, (self.encode(set_.sequence),))
+        if isinstance(set_, s.GLB):
+            parts = (set_.set_sequence, set_.major_set)
+        elif isinstance(set_, (s.FiniteUnion, s.FiniteIntersection)):
+            parts = (tuple(set_.set_sequence.initial_terms),)
+        elif isinstance(set_, s.FiniteCartesProduct):
+            parts = (set_.set_tuple,)
+        elif isinstance(set_, (s.Union, s.Intersection, s.CartesProduct)):
+            parts = (set_.set_sequence,)
+        elif isinstance(set_, s.CartesPower):
+            parts = (set_.base_set, set_.power)
+        elif isinstance(set_, (s.Complement, s.PowerSet)):
+            parts = (set_.base_set,)
+        elif isinstance(set_, s.Difference):
+            parts = (set_.a, set_.b)
+        elif isinstance(set_, s.FiniteSet):
+            parts = (set_._init_kwargs["name"], tuple(set_.elements))
+        elif cls is s.Set:
+            return (
+                "set_",
+                name,
+                self._encode_kwargs(set_._init_kwargs, skip={"knowledge_base"}),
+            )
+        else:
+            raise TypeError(f"Cannot encode set {set_!r} of type {cls.__name__}")
+        return ("setof", name, self.encode_all(parts))
+
+    def _encode_proposition(self, prop: Proposition) -> Node:
+        from pylogic.proposition._junction import _Junction
+        from pylogic.proposition.contradiction import Contradiction
+        from pylogic.proposition.iff import Iff
+        from pylogic.proposition.implies import Implies
+        from pylogic.proposition.not_ import Not
+        from pylogic.proposition.proposition import Proposition
+        from pylogic.proposition.quantified.quantified import _Quantified
+        from pylogic.proposition.relation.binaryrelation import BinaryRelation
+        from pylogic.proposition.relation.divides import Divides
+        from pylogic.proposition.relation.relation import Relation
+        from pylogic.theories.natural_numbers import Prime
+
+        cls = prop.__class__
+        if isinstance(prop, Not):
+            parts: tuple = (prop.negated,)
+        elif isinstance(prop, (Implies, Iff)):
+            parts = (prop.left, prop.right)
+        elif isinstance(prop, _Junction):
+            parts = tuple(prop.propositions)
+        elif isinstance(prop, _Quantified):
+            inner = getattr(prop, prop._innermost_prop_attr)
+            if prop._bin_symb is not None:
+                parts = (prop.variable, prop.set_, inner)
+            else:
+                parts = (prop.variable, inner)
+        elif isinstance(prop, BinaryRelation):
+            parts = (prop.left, prop.right)
+            if prop.name != cls.name:
+                parts += (prop.name,)
+        elif isinstance(prop, Divides):
+            parts = (prop.a, prop.b, prop.quotient_set)
+        elif isinstance(prop, Prime):
+            parts = (prop.n,)
+        elif isinstance(prop, Contradiction):
+            # the description is set by Contradiction itself
+            return ("prop", _class_name(cls), (), "")
+        elif cls in (Proposition, Relation):
+            return (
+                "atom",
+                _class_name(cls),
+                prop.name,
+                self.encode_all(prop.args),
+                prop.description,
+            )
+        else:
+            raise TypeError(
+                f"Cannot encode proposition {prop!r} of type {cls.__name__}"
+            )
+        return ("prop", _class_name(cls), self.encode_all(parts), prop.description)
+
+
+class FormulaDecoder:
+    """
+    Rebuilds pylogic objects from a node table produced by `FormulaEncoder`.
+    Nodes are decoded on demand and memoized, so decoding one formula of a
+    large table only touches the nodes it refers to. Nodes that name objects
+    outside pylogic raise ValueError when they are decoded (see
+    `check_nodes`).
+    """
+
+    def __init__(self, nodes: list[Node] | tuple[Node, ...]) -> None:
+        self.nodes = nodes
+        self._decoded: dict[int, Any] = {}
+
+    def decode(self, index: int) -> Any:
+        """
+        Return the object encoded at `index`.
+        """
+        try:
+            return self._decoded[index]
+        except KeyError:
+            pass
+        obj = self._decode_node(self.nodes[index])
+        self._decoded[index] = obj
+        return obj
+
+    def decode_all(self, indices: Iterable[int]) -> list[Any]:
+        return [self.decode(i) for i in indices]
+
+    def build(self, index: int) -> Any:
+        """
+        Return a new object for the node at `index`, even if it was decoded
+        before. Its children are shared with other decoded objects.
+        """
+        return self._decode_node(self.nodes[index])
+
+    def _decode_kwargs(self, pairs: tuple) -> dict[str, Any]:
+        return {k: self.decode(v) for k, v in pairs}
+
+    def _decode_node(self, node: Node) -> Any:
+        tag = node[0]
+        if tag == "py":
+            return node[1]
+        if tag == "name":
+            return _named_object(node[1])
+        if tag == "const":
+            from pylogic.constant import Constant
+
+            return Constant(node[1])
+        if tag in ("var", "sym"):
+            _, cls_name, name, kwargs, props, depends_on = node
+            kwargs = self._decode_kwargs(kwargs)
+            if depends_on:
+                kwargs["depends_on"] = tuple(self.decode_all(depends_on))
+            _check_symbol_props(props)
+            symbol = _node_class(tag, cls_name)(name, **kwargs)
+            for attr, value in props:
+                setattr(symbol, attr, value)
+            return symbol
+        if tag in ("expr", "seq"):
+            _, cls_name, args, kwargs = node
+            return _node_class(tag, cls_name)(
+                *self.decode_all(args), **self._decode_kwargs(kwargs)
+            )
+        if tag == "set_":
+            return _node_class(tag, node[1])(**self._decode_kwargs(node[2]))
+        if tag == "setof":
+            return _node_class(tag, node[1])(*self.decode_all(node[2]))
+        if tag == "prop":
+            _, cls_name, parts, description = node
+            cls = _node_class(tag, cls_name)
+            kwargs = {"description": description} if description else {}
+            return _construct_proposition(cls, self.decode_all(parts), kwargs)
+        if tag == "atom":
+            _, cls_name, name, args, description = node
+            return _node_class(tag, cls_name)(
+                name, args=self.decode_all(args), description=description
+            )
+        if tag == "fn":
+            return FormulaFunction(*self.decode_all(node[1]))
+        if tag == "list":
+            return self.decode_all(node[1])
+        if tag == "tuple":
+            return tuple(self.decode_all(node[1]))
+        if tag == "set":
+            return set(self.decode_all(node[1]))
+        if tag == "frozenset":
+            return frozenset(self.decode_all(node[1]))
+        if tag == "dict":
+            return {self.decode(k): self.decode(v) for k, v in node[1]}
+        raise ValueError(f"Unknown node tag {tag!r}")
+
+
+def _construct_proposition(cls: type, parts: list[Any], kwargs: dict) -> Proposition:
+    from pylogic.proposition.relation.binaryrelation import BinaryRelation
+
+    if issubclass(cls, BinaryRelation) and len(parts) == 3:
+        left, right, name = parts
+        return cls(left, right, name=name, **kwargs)
+    return cls(*parts, **kwargs)
+
+
+def encode(obj: Any) -> tuple[list[Node], int]:
+    """
+    Encode a single object. Returns the node table and the index of the root.
+    """
+    encoder = FormulaEncoder()
+    root = encoder.encode(obj)
+    return encoder.nodes, root
+
+
+def decode(nodes: list[Node] | tuple[Node, ...], root: int) -> Any:
+    """
+    Inverse of `encode`.
+    """
+    return FormulaDecoder(nodes).decode(root)
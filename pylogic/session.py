@@ -0,0 +1,313 @@
+"""
+Proof sessions: undoable side effects of proofs.
+
+Proving a proposition changes objects that outlive the proof. Proving
+`x in Naturals` sets `x.is_natural`, adds the proposition to
+`x.knowledge_base`, `Naturals` to `x.sets_contained_in` and `x` to
+`Naturals.containment_cache`, and marks the proposition as proven. Assumptions
+contexts record the propositions proven and assumed inside them.
+
+While a `ProofSession` is active, these changes are recorded in its
+journal, and `ProofSession.rollback` undoes them in reverse order, in time
+proportional to the number of changes. Exploratory searches can try a
+proof and undo it, and long-running services can run each request in a
+session that is rolled back at the end, so shared objects like `Naturals`
+do not accumulate state across requests.
+
+The active session is stored in a context variable, like the assumptions
+context stack, so each thread and asyncio task has its own. Code that
+changes terms or propositions as a side effect of a proof should go
+through `journal_add`, `journal_discard`, `journal_update`,
+`journal_append`, `journal_setitem`, `journal_setattr` and `journal_attrs`,
+which behave like the plain operations when no session is active. Caches
+filled during a proof, like the terms of sequences, use `journal_setitem`
+too, so a rollback also forgets what was computed from rolled-back facts.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Iterable, MutableMapping
+
+if TYPE_CHECKING:
+    from pylogic.assumptions_context import AssumptionsContext
+    from pylogic.proposition.proposition import Proposition
+
+# journal entry kinds
+_ADD = 0
+_DISCARD = 1
+_ATTRS = 2
+_APPEND = 3
+_SETITEM = 4
+# an attribute that was not set
+_MISSING = object()
+
+_session: ContextVar[ProofSession | None] = ContextVar(
+    "pylogic_proof_session", default=None
+)
+
+
+def current_session() -> ProofSession | None:
+    """
+    The active session of the current thread or task, or None.
+    """
+    return _session.get()
+
+
+def journal_add(s: set, item: Any) -> None:
+    """
+    `s.add(item)`, recorded in the active session.
+    """
+    session = _session.get()
+    if session is not None and item not in s:
+        session._journal.append((_ADD, s, item))
+    s.add(item)
+
+
+def journal_discard(s: set, item: Any) -> None:
+    """
+    `s.discard(item)`, recorded in the active session.
+    """
+    session = _session.get()
+    if session is not None and item in s:
+        session._journal.append((_DISCARD, s, item))
+    s.discard(item)
+
+
+def journal_update(s: set, items: Iterable[Any]) -> None:
+    """
+    `s.update(items)`, recorded in the active session.
+    """
+    session = _session.get()
+    if session is None:
+        s.update(items)
+        return
+    for item in items:
+        if item not in s:
+            session._journal.append((_ADD, s, item))
+            s.add(item)
+
+
+def journal_append(lst: list, item: Any) -> None:
+    """
+    `lst.append(item)`, recorded in the active session.
+    """
+    session = _session.get()
+    if session is not None:
+        session._journal.append((_APPEND, lst, item))
+    lst.append(item)
+
+
+def journal_setitem(m: MutableMapping, key: Any, value: Any) -> None:
+    """
+    `m[key] = value`, recorded in the active session.
+    """
+    session = _session.get()
+    if session is not None:
+        session._journal.append((_SETITEM, m, (key, m.get(key, _MISSING))))
+    m[key] = value
+
+
+def journal_attrs(obj: Any, *names: str) -> None:
+    """
+    Record the current values of the attributes `names` of `obj` in the
+    active session, before they are assigned directly.
+    """
+    session = _session.get()
+    if session is not None:
+        values = obj.__dict__
+        session._journal.append(
+            (_ATTRS, obj, {name: values.get(name, _MISSING) for name in names})
+        )
+
+
+def journal_setattr(obj: Any, name: str, value: Any) -> None:
+    """
+    `setattr(obj, name, value)`, recorded in the active session.
+
+    `name` can be a property, like `is_natural`: the attributes it changes
+    on `obj` are recorded.
+    """
+    session = _session.get()
+    if session is None:
+        setattr(obj, name, value)
+        return
+    before = dict(obj.__dict__)
+    setattr(obj, name, value)
+    after = obj.__dict__
+    changed = {
+        k: before.get(k, _MISSING)
+        for k in before.keys() | after.keys()
+        if before.get(k, _MISSING) is not after.get(k, _MISSING)
+    }
+    if changed:
+        session._journal.append((_ATTRS, obj, changed))
+
+
+def _undo_append(lst: list, item: Any) -> None:
+    for i in range(len(lst) - 1, -1, -1):
+        if lst[i] is item:
+            del lst[i]
+            return
+
+
+def _undo_setitem(m: MutableMapping, key: Any, value: Any) -> None:
+    if value is _MISSING:
+        # may have been evicted from a bounded cache since
+        m.pop(key, None)
+    else:
+        m[key] = value
+
+
+def _restore_attrs(obj: Any, values: dict[str, Any]) -> None:
+    for name, value in values.items():
+        if value is _MISSING:
+            obj.__dict__.pop(name, None)
+        else:
+            obj.__dict__[name] = value
+    # the properties of expressions are computed from those of their
+    # subterms; see eg Symbol.is_natural
+    for parent in getattr(obj, "parent_exprs", ()):
+        parent.update_properties()
+
+
+class Snapshot:
+    """
+    A point in a `ProofSession` that it can be rolled back to.
+
+    Attributes
+    ----------
+    position: int
+        Number of changes recorded in the journal when the snapshot was
+        taken.
+    """
+
+    def __init__(self, session: ProofSession) -> None:
+        from pylogic.assumptions_context import _context_stack, _target
+
+        self.session = session
+        self.position = len(session._journal)
+        self.target: Proposition | None = _target.get()
+        self.contexts = _context_stack.get()
+        # what the open contexts contained
+        self.context_state = [
+            (
+                len(c.assumptions),
+                len(c._proven),
+                len(c._interesting_conclusions),
+                len(c.proven_propositions),
+                c.exited,
+            )
+            for c in self.contexts
+        ]
+
+    def __repr__(self) -> str:
+        return f"Snapshot(position={self.position})"
+
+    def _restore_contexts(self) -> None:
+        from pylogic.assumptions_context import _context_stack, _target
+
+        for c, state in zip(self.contexts, self.context_state):
+            assumptions, proven, conclusions, proven_props, exited = state
+            del c.assumptions[assumptions:]
+            del c._proven[proven:]
+            del c._interesting_conclusions[conclusions:]
+            del c.proven_propositions[proven_props:]
+            c.exited = exited
+            del c._assumption_order[assumptions:]
+            c._assumption_ids = {id(a) for a in c._assumption_order}
+        _context_stack.set(self.contexts)
+        _target.set(self.target)
+
+
+class ProofSession:
+    """
+    Records the side effects of proofs so that they can be undone. See the
+    module docstring.
+
+    Use it as a context manager. Changes made in the block are kept when it
+    exits, unless `discard` is True, in which case they are rolled back.
+    When sessions are nested, the changes kept by the inner session are
+    added to the journal of the outer one.
+
+    Parameters
+    ----------
+    discard: bool
+        Roll back all the changes when the session exits.
+
+    Attributes
+    ----------
+    changes: int
+        Number of changes recorded.
+    """
+
+    def __init__(self, discard: bool = False) -> None:
+        self.discard = discard
+        self._journal: list[tuple[int, Any, Any]] = []
+        self._start: Snapshot | None = None
+        self._token: Token | None = None
+
+    def __repr__(self) -> str:
+        state = "active" if self._token is not None else "inactive"
+        return f"ProofSession({state}, changes={self.changes})"
+
+    @property
+    def changes(self) -> int:
+        return len(self._journal)
+
+    @property
+    def active(self) -> bool:
+        return self._token is not None
+
+    def __enter__(self) -> ProofSession:
+        assert self._token is None, "This session is already active"
+        self._start = Snapshot(self)
+        self._token = _session.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        assert self._token is not None, "This session is not active"
+        if self.discard:
+            self.rollback()
+        _session.reset(self._token)
+        self._token = None
+        outer = _session.get()
+        if outer is not None:
+            outer._journal.extend(self._journal)
+        self._journal = []
+
+    def snapshot(self) -> Snapshot:
+        """
+        The current state, to pass to `rollback`.
+        """
+        assert self._token is not None, "Snapshots can only be taken in an active session"
+        return Snapshot(self)
+
+    def rollback(self, snapshot: Snapshot | None = None) -> int:
+        """
+        Undo the changes made since `snapshot` (default: since the session
+        started), and restore the assumptions contexts and target to prove.
+        Returns the number of changes undone.
+        """
+        if snapshot is None:
+            snapshot = self._start
+        assert snapshot is not None, "This session was never started"
+        assert snapshot.session is self, "The snapshot belongs to another session"
+        if snapshot.position > len(self._journal):
+            raise ValueError("The snapshot was taken after a later rollback")
+        journal = self._journal
+        undone = len(journal) - snapshot.position
+        while len(journal) > snapshot.position:
+            kind, obj, data = journal.pop()
+            if kind == _ADD:
+                obj.discard(data)
+            elif kind == _DISCARD:
+                obj.add(data)
+            elif kind == _APPEND:
+                _undo_append(obj, data)
+            elif kind == _SETITEM:
+                _undo_setitem(obj, *data)
+            else:
+                _restore_attrs(obj, data)
+        snapshot._restore_contexts()
+        return undone
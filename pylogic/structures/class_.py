@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from functools import partial
 from typing import TYPE_CHECKING, Any, Callable, Iterable, Literal, overload
 
+from pylogic.session import journal_add
 from pylogic.structures.collection import Collection
 
 # https://en.wikipedia.org/wiki/Axiom_schema_of_specification#In_Quine's_New_Foundations
@@ -34,11 +36,14 @@ def class_n_init(
     containment_function: Callable[[Any], bool] | None = None,
     predicate: Callable[[Any], Proposition] | None = None,
 ):
+    from pylogic.structures.set_ import ContainmentCache, Set
+
     name = name.strip()
     assert " " not in name, "Set name cannot contain spaces"
     self.name = name
     self.elements = set(elements) if elements else set()
     self._containment_function = containment_function
+    self.containment_cache = ContainmentCache(Set.containment_cache_size)
     if illegal_occur_check:
         self.illegal_occur_check(containment_function, predicate)
     self._predicate = predicate
@@ -52,6 +57,18 @@ def class_n_hash(self) -> int:
     return hash((self.__class__.__name__, self.name, self.containment_function))
 
 
+def class_n_reduce_ex(self, protocol: int) -> tuple:
+    from pylogic.serialize import reduce_collection
+
+    # Class{n} is made by class_, so pickle cannot look it up by name
+    return reduce_collection(self, partial(_new_class_n, self.level))
+
+
+def _new_class_n(n: int) -> Class:
+    cls = class_(n)
+    return cls.__new__(cls)
+
+
 def to_sympy(self):
     from pylogic.sympy_helpers import PylSympySet
 
@@ -81,7 +98,7 @@ def containment_function(self, x: Any) -> bool:
     from pylogic.structures.set_ import Set
 
     # TODO: Should a Colletion{n} instance contain a Collection{n-2} instance and lower?
-    if x in self.elements:
+    if x in self.elements or self.containment_cache.lookup(x):
         return True
     if isinstance(x, Set) or x.__class__.__name__.startswith("Collection"):
         return (
@@ -91,7 +108,7 @@ def containment_function(self, x: Any) -> bool:
         )
     elif self._containment_function:
         res = self._containment_function(x)
-        self.elements.add(x) if res else None
+        journal_add(self.containment_cache, x) if res else None
         return res
     return False
 
@@ -268,6 +285,7 @@ def class_(n: int) -> Collection[Class[int]]:
             "__init__": class_n_init,
             "__repr__": class_n_repr,
             "__hash__": class_n_hash,
+            "__reduce_ex__": class_n_reduce_ex,
             "to_sympy": to_sympy,
             "level": n,
             "contains": contains,
@@ -5,7 +5,8 @@ from typing import Callable, Iterable, TypedDict, TypeVar, Unpack
 from pylogic.expressions.expr import BinaryExpression, Expr
 from pylogic.infix.infix import SpecialInfix
 from pylogic.proposition.quantified.forall import ForallInSet
-from pylogic.proposition.relation.contains import IsContainedIn
+from pylogic.proposition.relation.contains import IsContainedIn, _proven_members
+from pylogic.session import journal_add
 from pylogic.structures.set_ import Set
 from pylogic.typing import Term
 from pylogic.variable import Variable
@@ -112,15 +113,16 @@ class Magma(Set):
                     opname, opsymb, x, y, None  # type: ignore
                 )  # type: ignore
             result = operation(x, y)
-            result.knowledge_base.add(
+            journal_add(
+                result.knowledge_base,
                 IsContainedIn(
                     result,
                     self,
                     _is_proven=True,
                     _inference=Inference(None, rule="by_definition"),
-                )
+                ),
             )
-            self.elements.add(result)
+            journal_add(_proven_members(self), result)
             return result
 
         op = SpecialInfix(
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
 from typing import TYPE_CHECKING, Callable, Generic, Literal, Self
 from typing import Sequence as TSequence
 from typing import TypeVar, cast, overload
 
 from pylogic.proposition.ordering.greaterorequal import GreaterOrEqual
+from pylogic.session import journal_setitem
 from pylogic.typing import PythonNumeric, Term
 
 if TYPE_CHECKING:
@@ -27,6 +30,97 @@ else:
     C = TypeVar("C")
 
 
+class TermCache(MutableMapping[int, T]):
+    """
+    Cache of the computed terms of a sequence, keyed by index.
+
+    Terms at indices `0, 1, ..., k - 1` are stored in a dense list (the
+    prefix) as long as there are no gaps, up to `prefix_size` terms. Other
+    terms are kept in an LRU cache of at most `max_size` terms. Indices may be
+    python ints or `Constant`s wrapping them.
+    """
+
+    def __init__(self, prefix_size: int = 1024, max_size: int = 1024) -> None:
+        self.prefix_size = prefix_size
+        self.max_size = max_size
+        self.prefix: list[T] = []
+        self._lru: OrderedDict[int, T] = OrderedDict()
+
+    @staticmethod
+    def _index(key: object) -> int | None:
+        from pylogic.constant import Constant
+
+        if isinstance(key, Constant):
+            key = key.value
+        if isinstance(key, int) and not isinstance(key, bool) and key >= 0:
+            return key
+        return None
+
+    def __contains__(self, key: object) -> bool:
+        index = self._index(key)
+        if index is None:
+            return False
+        return index < len(self.prefix) or index in self._lru
+
+    def __getitem__(self, key: object) -> T:
+        index = self._index(key)
+        if index is not None:
+            if index < len(self.prefix):
+                return self.prefix[index]
+            if index in self._lru:
+                self._lru.move_to_end(index)
+                return self._lru[index]
+        raise KeyError(key)
+
+    def __setitem__(self, key: object, value: T) -> None:
+        index = self._index(key)
+        if index is None:
+            raise KeyError(f"{key} is not a valid sequence index")
+        if index < len(self.prefix):
+            self.prefix[index] = value
+            return
+        if index == len(self.prefix) and index < self.prefix_size:
+            self.prefix.append(value)
+            # later terms already computed become part of the prefix
+            while len(self.prefix) < self.prefix_size and len(self.prefix) in self._lru:
+                self.prefix.append(self._lru.pop(len(self.prefix)))
+            return
+        self._lru[index] = value
+        self._lru.move_to_end(index)
+        if len(self._lru) > self.max_size:
+            self._lru.popitem(last=False)
+
+    def __delitem__(self, key: object) -> None:
+        index = self._index(key)
+        if index is not None and index < len(self.prefix):
+            # keep the prefix dense
+            for i, term in enumerate(self.prefix[index + 1 :], index + 1):
+                self._lru[i] = term
+            del self.prefix[index:]
+            return
+        if index is None or index not in self._lru:
+            raise KeyError(key)
+        del self._lru[index]
+
+    def last_index_before(self, index: int) -> int:
+        """
+        The largest cached index below `index`, or -1 if there is none.
+        """
+        if index <= len(self.prefix):
+            return index - 1
+        return max((i for i in self._lru if i < index), default=len(self.prefix) - 1)
+
+    def __iter__(self) -> Iterator[int]:
+        yield from range(len(self.prefix))
+        yield from list(self._lru)
+
+    def __len__(self) -> int:
+        return len(self.prefix) + len(self._lru)
+
+    def __repr__(self) -> str:
+        return f"TermCache({dict(self)})"
+
+
 class Sequence(Generic[T]):
     """
     A sequence is a countably infinite or finite ordered list of elements.
@@ -41,9 +135,28 @@ class Sequence(Generic[T]):
         Note that if a term `x` is the nth term of the sequence, then `predicate(n)`
         is True, but if some predicate is True for `x`, it doesn't necessarily mean that
         `x` is in the sequence.
+
+        recursive: bool
+        Whether `nth_term` refers to earlier terms of the sequence itself, eg
+        `Sequence("a", [0, 1], nth_term=lambda n: a[n - 1] + a[n - 2],
+        recursive=True, integer=True)`. Terms of a recursive sequence are
+        computed in increasing order of index, reusing the cached terms.
+        Arithmetic on terms is only evaluated for real numbers, so the
+        sequence must be declared `real`, `rational`, `integer` or `natural`
+        (or `nth_term` must not need arithmetic on earlier terms); otherwise
+        `a[10].evaluate()` is `a_(10 + -1) + a_(10 + -2)`.
+
+        term_cache_size: int
+        The number of computed terms to keep, besides the dense prefix.
+
+        dense_prefix_size: int
+        The number of terms `0, 1, ..., k - 1` that are kept in a list and
+        never evicted from the term cache.
     """
 
     is_atomic = True
+    term_cache_size: int = 1024
+    dense_prefix_size: int = 1024
 
     def __init__(
         self,
@@ -71,8 +184,17 @@ class Sequence(Generic[T]):
         self.initial_terms: list[T] = (
             list(map(python_to_pylogic, initial_terms)) if initial_terms else []
         )  # type: ignore
-        self.terms: dict[Constant[int], T] = dict(zip(init_inds, self.initial_terms))
+        # initial terms are always in the prefix, so never evicted
+        self.terms: TermCache[T] = TermCache(
+            prefix_size=max(
+                kwargs.get("dense_prefix_size", self.dense_prefix_size),
+                len(self.initial_terms),
+            ),
+            max_size=kwargs.get("term_cache_size", self.term_cache_size),
+        )
+        self.terms.update(zip(init_inds, self.initial_terms))
         self.nth_term: Callable[[Term], T] | None = nth_term
+        self.recursive: bool = kwargs.get("recursive", False)
         self._is_finite: bool | None = None
         self._predicate: Callable[[Term], Proposition] | None = predicate
         self._predicate_uses_self = predicate is not None
@@ -80,7 +202,11 @@ class Sequence(Generic[T]):
         # hack to make n a natural number & save time
         n_ind = Variable("n")
         n_ind._is_natural = True
-        nth_term_expr = self.nth_term(n_ind) if self.nth_term else None
+        # a recursive nth_term may refer to this sequence, which is not
+        # bound to a name yet
+        nth_term_expr = (
+            self.nth_term(n_ind) if self.nth_term and not self.recursive else None
+        )
 
         self._is_real: bool | None = self._get_init_assump_attr(
             "real", kwargs, nth_term_expr
@@ -381,11 +507,59 @@ class Sequence(Generic[T]):
             )
         )
 
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        # nth_term and predicate are often lambdas
+        from pylogic.serialize import reduce_collection
+
+        return reduce_collection(self)
+
     def __getitem__(self, index: Term) -> SequenceTerm[T]:
         from pylogic.expressions.sequence_term import SequenceTerm
 
         return SequenceTerm(self, index)
 
+    def term(self, index: int) -> T | None:
+        """
+        Return the term at the natural number `index`, computing it with
+        `nth_term` and caching it if needed. Returns None if the term
+        cannot be computed.
+        """
+        if index in self.terms:
+            return self.terms[index]
+        if self.nth_term is None or index < 0:
+            return None
+        if self.recursive:
+            # compute the missing terms before index in increasing order, so
+            # each term only needs terms that are already cached
+            for i in range(self.terms.last_index_before(index) + 1, index):
+                self._compute_term(i)
+        return self._compute_term(index)
+
+    def _compute_term(self, index: int) -> T:
+        from pylogic.constant import Constant
+        from pylogic.helpers import python_to_pylogic
+
+        assert self.nth_term is not None
+        res = python_to_pylogic(self.nth_term(Constant(index)))
+        if self.recursive:
+            res = res.evaluate()
+        journal_setitem(self.terms, index, res)
+        return res
+
+    def terms_range(self, start: int, stop: int) -> list[T | SequenceTerm[T]]:
+        """
+        Return the terms at indices `start, start + 1, ..., stop - 1`,
+        computed in one pass in increasing order of index and cached.
+        Terms that cannot be computed are returned as `SequenceTerm`s.
+        """
+        from pylogic.constant import Constant
+
+        result: list[T | SequenceTerm[T]] = []
+        for i in range(max(start, 0), stop):
+            term = self.term(i)
+            result.append(self[Constant(i)] if term is None else term)
+        return result
+
     def equals(self, other: Term, **kwargs) -> Equals:
         from pylogic.proposition.relation.equals import Equals
 
@@ -549,6 +723,13 @@ class PeriodicSequence(Sequence[T]):
             index %= int(self.period)
         return super().__getitem__(index)
 
+    def term(self, index: int) -> T | None:
+        from pylogic.helpers import is_integer_numeric
+
+        if self.period is not None and is_integer_numeric(self.period) and index >= 0:
+            index %= int(self.period)
+        return super().term(index)
+
     def to_sympy(self) -> SeqBase | SeqPer:
         from sympy.series.sequences import SeqPer
 
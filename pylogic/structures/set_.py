@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -14,6 +15,7 @@ from typing import (
 import sympy as sp
 
 from pylogic.proposition.contradiction import Contradiction
+from pylogic.session import journal_add, journal_update
 from pylogic.structures.collection import Collection
 from pylogic.typing import Term
 
@@ -35,6 +37,89 @@ C = TypeVar("C", bound="Set")
 # TODO: implement __eq__, __hash__, __repr__ and latex methods for all classes
 
 
+class ContainmentCache:
+    """
+    Memo of the terms known to be in a set: those for which its containment
+    function returned True, so the function is not called again for them,
+    and those proven to be in the set. At most `max_size` terms are kept;
+    the least recently used ones are evicted first. An evicted proven
+    membership is still in the knowledge base of its term.
+
+    It is separate from the declared elements of the set (`Set.elements`),
+    so that testing or proving many memberships does not make `elements`
+    grow without bound. Only positive results are kept, since a term may be
+    shown to be in a set later (eg its `is_natural` attribute is set by a
+    proof).
+
+    Attributes
+    ----------
+    max_size: int
+    hits: int
+        Number of lookups that found the term.
+    misses: int
+        Number of lookups that did not.
+    evictions: int
+        Number of terms evicted to stay within `max_size`.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self.max_size = max_size
+        self._terms: OrderedDict[Term, None] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, x: Term) -> bool:
+        """
+        Whether `x` is in the cache, counting a hit or a miss.
+        """
+        terms = self._terms
+        if x in terms:
+            terms.move_to_end(x)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def __contains__(self, x: object) -> bool:
+        return x in self._terms
+
+    def add(self, x: Term) -> None:
+        terms = self._terms
+        terms[x] = None
+        terms.move_to_end(x)
+        if len(terms) > self.max_size:
+            terms.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, x: Term) -> None:
+        self._terms.pop(x, None)
+
+    def clear(self) -> None:
+        self._terms.clear()
+
+    def __iter__(self):
+        return iter(list(self._terms))
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._terms),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ContainmentCache(size={len(self._terms)}, max_size={self.max_size}, "
+            f"hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
+        )
+
+
 class Set(metaclass=Collection):
     """
     A set `S` is a collection of elements. This is equivalent to
@@ -52,9 +137,17 @@ class Set(metaclass=Collection):
     That is, `S.predicate(x) <-> x in S`.
 
     `Set()` gives the empty set.
+
+    `S.elements` holds the declared elements of `S`. Terms proven to be in
+    `S` or for which the containment function returned True are memoized
+    separately in `S.containment_cache` (see `ContainmentCache`), which
+    keeps at most `containment_cache_size` terms; pass
+    `containment_cache_size` to the constructor to change it for one set.
     """
 
     is_atomic = True
+    # default maximum number of terms in containment_cache
+    containment_cache_size = 1024
 
     level = 0  # level of the set in the hierarchy of Classes
 
@@ -140,6 +233,10 @@ class Set(metaclass=Collection):
 
         # from pylogic.proposition.iff import Iff
 
+        # before illegal_occur_check, which calls the containment function
+        self.containment_cache = ContainmentCache(
+            kwargs.get("containment_cache_size", self.containment_cache_size)
+        )
         if name is not None:
             name = name.strip()
             sympy_set = sp.Set(name)
@@ -602,11 +699,11 @@ See https://en.wikipedia.org/wiki/Axiom_schema_of_specification#In_Quine%27s_New
         )
 
     def containment_function(self, x: Term) -> bool:
-        if x in self.elements:
+        if x in self.elements or self.containment_cache.lookup(x):
             return True
         elif self._containment_function:
             res = self._containment_function(x)
-            self.elements.add(x) if res else None
+            journal_add(self.containment_cache, x) if res else None
             return res
         return False
 
@@ -619,6 +716,12 @@ See https://en.wikipedia.org/wiki/Axiom_schema_of_specification#In_Quine%27s_New
     def __copy__(self) -> "Set":
         return self.copy()
 
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        # containment functions and predicates are often lambdas
+        from pylogic.serialize import reduce_collection
+
+        return reduce_collection(self)
+
     def __hash__(self) -> int:
         return hash(("Set", self.name, self.containment_function))
 
@@ -1254,7 +1357,7 @@ class SeqSet(Set):
             **kwargs,
         )
         self.sequence: Sequence | Variable = sequence
-        self.knowledge_base.update(sequence.knowledge_base)
+        journal_update(self.knowledge_base, sequence.knowledge_base)
 
     def __eq__(self, other: SeqSet) -> bool:
         if not isinstance(other, SeqSet):
@@ -646,6 +646,12 @@ class Symbol:
             )
         )
 
+    def __reduce_ex__(self, protocol: int) -> tuple:
+        # the knowledge base refers back to this symbol, and hashes it
+        from pylogic.serialize import reduce_with_state
+
+        return reduce_with_state(self)
+
 
 def symbols(*args, **kwargs):
     return sp.symbols(*args, cls=Symbol, **kwargs)
@@ -0,0 +1,382 @@
+"""
+A memory-mapped, on-disk format for knowledge bases of named theorems.
+
+A knowledge base file holds
+
+- a header,
+- for each theorem, its status (axiom, todo, assumption) and the number of
+  its head symbol,
+- a string table: the names of the theorems, sorted, followed by the head
+  symbols, sorted,
+- an index from each head symbol to the theorems that have it,
+- the formulas of the theorems, as a `FormulaTable` whose roots are the
+  theorems, in the order of their names.
+
+`KnowledgeBaseFile` maps the file with `mmap` and reads the arrays in place.
+Opening a file only parses the header, so it takes the same time whatever
+the size of the library. Theorems are looked up by name (binary search in
+the string table) or by head symbol, and materialized on first access:
+only the nodes of the theorems a proof touches are decoded.
+
+The head symbol of a theorem is the relation that its conclusion is
+about, see `head_symbol`. Backward search for a goal only needs the
+theorems with the goal's head symbol.
+
+`save_theory_library` writes the theorems of the number sets (see
+`pylogic.theories.snapshot`) to a file. Their names are dotted paths such
+as `"Naturals.theorems.prime_theorems.prime_gt_1"`.
+
+Like the other formats of pylogic, the file stores the values in formula
+nodes as JSON, and decoding them only resolves names inside pylogic (see
+`pylogic.serialize`).
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from pylogic.formula_table import FormulaTable
+    from pylogic.proposition.proposition import Proposition
+
+MAGIC = b"PLKB"
+FORMAT_VERSION = 1
+# magic, version, byte order, number of theorems, head symbols, size of
+# the string blob, size of the formula table
+_HEADER = struct.Struct("<4sHHIIQQ")
+_BYTE_ORDER = 1 if sys.byteorder == "little" else 2
+
+STATUSES = (None, "axiom", "todo", "assumption")
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+def head_symbol(prop: Proposition) -> str:
+    """
+    The symbol a theorem concludes about: quantifiers and the antecedents
+    of implications are skipped, and the result is the name of an atomic
+    proposition or the class of another proposition (eg `"IsContainedIn"`,
+    `"Divides"`, `"And"`).
+    """
+    from pylogic.proposition.implies import Implies
+    from pylogic.proposition.not_ import Not
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.proposition.quantified.quantified import _Quantified
+    from pylogic.proposition.relation.relation import Relation
+
+    while True:
+        if isinstance(prop, _Quantified):
+            prop = prop.inner_proposition
+        elif isinstance(prop, Implies) and not isinstance(prop, Not):
+            prop = prop.consequent
+        else:
+            break
+    if prop.__class__ in (Proposition, Relation):
+        return prop.name
+    return prop.__class__.__name__
+
+
+def _align(data: bytes) -> bytes:
+    return data + bytes(-len(data) % 8)
+
+
+def pack_knowledge_base(theorems: Iterable[tuple[str, Proposition]]) -> bytes:
+    """
+    Pack named theorems into the format of a `KnowledgeBaseFile`.
+    """
+    from pylogic.formula_table import pack_nodes
+    from pylogic.serialize import FormulaEncoder
+    from pylogic.theories.snapshot import _status
+
+    entries = sorted(theorems, key=lambda entry: entry[0])
+    names = [name for name, _ in entries]
+    assert len(set(names)) == len(names), "Theorem names must be unique"
+    theorem_heads = [head_symbol(prop) for _, prop in entries]
+    heads = sorted(set(theorem_heads))
+    head_numbers = {head: k for k, head in enumerate(heads)}
+
+    encoder = FormulaEncoder()
+    roots = encoder.encode_all(prop for _, prop in entries)
+    table = pack_nodes(encoder.nodes, roots)
+
+    strings = [s.encode() for s in names + heads]
+    string_offsets = array("I", [0])
+    for s in strings:
+        string_offsets.append(string_offsets[-1] + len(s))
+    blob = b"".join(strings)
+
+    by_head: list[list[int]] = [[] for _ in heads]
+    for index, head in enumerate(theorem_heads):
+        by_head[head_numbers[head]].append(index)
+    head_offsets = array("I", [0])
+    head_theorems = array("I")
+    for indices in by_head:
+        head_theorems.extend(indices)
+        head_offsets.append(len(head_theorems))
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        _BYTE_ORDER,
+        len(entries),
+        len(heads),
+        len(blob),
+        len(table),
+    )
+    parts = [
+        header,
+        array("I", (head_numbers[h] for h in theorem_heads)).tobytes(),
+        bytes(_STATUS_CODES[_status(prop)] for _, prop in entries),
+        string_offsets.tobytes(),
+        blob,
+        head_offsets.tobytes(),
+        head_theorems.tobytes(),
+        table,
+    ]
+    return b"".join(map(_align, parts))
+
+
+class KnowledgeBaseFile:
+    """
+    A knowledge base file mapped into memory. See the module docstring.
+
+    Parameters
+    ----------
+    path: str
+        A file written by `KnowledgeBaseFile.write`.
+
+    Attributes
+    ----------
+    formulas: FormulaTable
+        The formulas of the theorems, in the order of their names.
+    """
+
+    def __init__(self, path: str) -> None:
+        import mmap
+
+        from pylogic.formula_table import FormulaTable
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        self._views: list[memoryview] = [view]
+        try:
+            magic, version, byte_order, count, heads, blob_size, table_size = (
+                _HEADER.unpack_from(view)
+            )
+        except struct.error:
+            raise ValueError(f"{path} is not a knowledge base file") from None
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a knowledge base file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported knowledge base version {version}")
+        if byte_order != _BYTE_ORDER:
+            raise ValueError("The knowledge base was written with another byte order")
+        self.path = path
+        self._count = count
+        self._head_count = heads
+        position = _HEADER.size + (-_HEADER.size % 8)
+
+        def take(fmt: str, size: int) -> memoryview:
+            nonlocal position
+            part = view[position : position + size]
+            if len(part) != size:
+                raise ValueError(f"{path} is truncated")
+            part = part.cast(fmt)
+            self._views.append(part)
+            position += size + (-size % 8)
+            return part
+
+        self._heads = take("I", 4 * count)
+        self._statuses = take("B", count)
+        self._string_offsets = take("I", 4 * (count + heads + 1))
+        self._strings = take("B", blob_size)
+        self._head_offsets = take("I", 4 * (heads + 1))
+        self._head_theorems = take("I", 4 * count)
+        self.formulas: FormulaTable = FormulaTable(take("B", table_size))
+        self._built: dict[int, Proposition] = {}
+
+    @staticmethod
+    def write(path: str, theorems: Iterable[tuple[str, Proposition]]) -> None:
+        """
+        Write named theorems to `path`, atomically.
+        """
+        data = pack_knowledge_base(theorems)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return (
+            f"KnowledgeBaseFile({self.path!r}, theorems={self._count}, "
+            f"heads={self._head_count}, materialized={len(self._built)})"
+        )
+
+    def __enter__(self) -> KnowledgeBaseFile:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self.index(name) is not None
+
+    def __getitem__(self, name: str) -> Proposition:
+        index = self.index(name)
+        if index is None:
+            raise KeyError(name)
+        return self.theorem(index)
+
+    def _string(self, index: int) -> str:
+        start, end = self._string_offsets[index], self._string_offsets[index + 1]
+        return self._strings[start:end].tobytes().decode()
+
+    def _search(self, value: str, lo: int, hi: int) -> int | None:
+        # the strings lo..hi-1 are sorted
+        strings = _Strings(self, lo)
+        i = bisect_left(strings, value, 0, hi - lo)
+        if i < hi - lo and strings[i] == value:
+            return i
+        return None
+
+    def name(self, index: int) -> str:
+        """
+        The name of theorem `index`.
+        """
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._string(index)
+
+    def names(self) -> Iterator[str]:
+        """
+        The names of the theorems, sorted.
+        """
+        return (self._string(i) for i in range(self._count))
+
+    def index(self, name: str) -> int | None:
+        """
+        The index of the theorem called `name`, or None.
+        """
+        return self._search(name, 0, self._count)
+
+    def status(self, index: int) -> str | None:
+        """
+        `"axiom"`, `"todo"`, `"assumption"` or None.
+        """
+        return STATUSES[self._statuses[index]]
+
+    def head(self, index: int) -> str:
+        """
+        The head symbol of theorem `index`.
+        """
+        return self._string(self._count + self._heads[index])
+
+    def heads(self) -> list[str]:
+        """
+        The head symbols of the theorems, sorted.
+        """
+        return [self._string(self._count + k) for k in range(self._head_count)]
+
+    def indices_with_head(self, symbol: str) -> list[int]:
+        """
+        The indices of the theorems whose head symbol is `symbol`.
+        """
+        k = self._search(symbol, self._count, self._count + self._head_count)
+        if k is None:
+            return []
+        return list(self._head_theorems[self._head_offsets[k] : self._head_offsets[k + 1]])
+
+    def with_head(self, symbol: str) -> list[Proposition]:
+        """
+        The theorems whose head symbol is `symbol`, materialized.
+        """
+        return [self.theorem(i) for i in self.indices_with_head(symbol)]
+
+    def theorem(self, index: int) -> Proposition:
+        """
+        Theorem `index`, decoded on first access with its status.
+        """
+        from pylogic.theories.snapshot import _set_status
+
+        prop = self._built.get(index)
+        if prop is None:
+            prop = self.formulas[index]
+            _set_status(prop, self.status(index))
+            self._built[index] = prop
+        return prop
+
+    @property
+    def materialized(self) -> int:
+        """
+        Number of theorems decoded so far.
+        """
+        return len(self._built)
+
+    def close(self) -> None:
+        """
+        Unmap the file. Materialized theorems stay valid.
+        """
+        self.formulas.close()
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+
+class _Strings:
+    """
+    The strings of a file from `start`, as a sequence for `bisect`.
+    """
+
+    def __init__(self, kb: KnowledgeBaseFile, start: int) -> None:
+        self.kb = kb
+        self.start = start
+
+    def __getitem__(self, index: int) -> str:
+        return self.kb._string(self.start + index)
+
+
+def theory_theorems() -> list[tuple[str, Proposition]]:
+    """
+    The theorems in the namespaces of the number sets (see
+    `pylogic.theories.snapshot.theory_sets`), with their dotted names.
+    """
+    import pylogic.theories.numbers  # noqa: F401
+    from pylogic.helpers import Namespace
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.serialize import resolve_name
+    from pylogic.theories.snapshot import namespace_attrs, theory_sets
+
+    theorems: list[tuple[str, Proposition]] = []
+
+    def collect(ns: Namespace, prefix: str) -> None:
+        for name, value in vars(ns).items():
+            if isinstance(value, Namespace):
+                collect(value, f"{prefix}.{name}")
+            elif isinstance(value, Proposition):
+                theorems.append((f"{prefix}.{name}", value))
+
+    for set_name, path in theory_sets.items():
+        set_ = resolve_name(path)
+        for attr in namespace_attrs:
+            ns = getattr(set_, attr, None)
+            if isinstance(ns, Namespace):
+                if hasattr(ns, "materialize"):
+                    ns.materialize()
+                collect(ns, f"{set_name}.{attr}")
+    return theorems
+
+
+def save_theory_library(path: str) -> None:
+    """
+    Write the theorems of the number sets to a knowledge base file.
+    """
+    KnowledgeBaseFile.write(path, theory_theorems())
@@ -19,6 +19,7 @@ from pylogic.proposition.quantified.forall import ForallInSet, ForallSubsets
 from pylogic.proposition.relation.equals import Equals
 from pylogic.structures.ordered_set import OrderedSet
 from pylogic.structures.ringlike.semiring import SemirIng
+from pylogic.session import journal_add, journal_discard
 from pylogic.structures.set_ import Set
 from pylogic.typing import Term, Unevaluated
 from pylogic.variable import Variable
@@ -588,9 +589,9 @@ class Prime(Proposition):
     def _set_is_inferred(self, value: bool) -> None:
         super()._set_is_inferred(value)
         if value:
-            self.n.knowledge_base.add(self)
+            journal_add(self.n.knowledge_base, self)
         else:
-            self.n.knowledge_base.discard(self)
+            journal_discard(self.n.knowledge_base, self)
         self._definition._set_is_inferred(value)
 
     def _set_is_proven(self, value: bool, **kwargs) -> None:
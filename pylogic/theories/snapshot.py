@@ -0,0 +1,332 @@
+"""
+Snapshots of the preloaded theory library.
+
+Importing `pylogic.theories.numbers` builds the theorems attached to
+`Naturals`, `Integers`, `Rationals` and `Reals` (their `theorems` and
+`subset_relations` namespaces). This is deterministic but slow, and every
+process that imports pylogic pays for it. A snapshot stores these theorems in
+a pickle-safe node table (see `pylogic.serialize`), with the number sets
+referenced by qualified name. Installing a snapshot replaces the theorem
+namespaces with lazy ones: a theorem is only rebuilt the first time it is
+accessed.
+
+Set the environment variable `PYLOGIC_THEORY_SNAPSHOT` to a file path to use
+a snapshot when importing pylogic. The file is written on the first import
+and reused afterwards, until `pylogic.theories.numbers` changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from typing import TYPE_CHECKING, Any, Callable
+
+from pylogic.helpers import Namespace
+
+if TYPE_CHECKING:
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.serialize import FormulaDecoder, FormulaEncoder
+    from pylogic.structures.set_ import Set
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_ENV_VAR = "PYLOGIC_THEORY_SNAPSHOT"
+
+# name of each theory set -> qualified name used to look it up
+theory_sets: dict[str, str] = {
+    "Naturals": "pylogic.theories.natural_numbers:Naturals",
+    "Integers": "pylogic.theories.integers:Integers",
+    "Rationals": "pylogic.theories.rational_numbers:Rationals",
+    "Reals": "pylogic.theories.real_numbers:Reals",
+}
+# namespaces of the theory sets that are stored in a snapshot
+namespace_attrs = ("theorems", "subset_relations")
+
+
+class LazyNamespace(Namespace):
+    """
+    A Namespace whose entries are built the first time they are accessed.
+    """
+
+    __slots__ = ("_pending",)
+
+    def __init__(self, dict_: dict[str, Any] | None = None, **kwargs: Any):
+        self._pending: dict[str, Callable[[], Any]] = {}
+        super().__init__(dict_, **kwargs)
+
+    def set_lazy(self, name: str, build: Callable[[], Any]) -> None:
+        """
+        Set the entry `name` to the result of `build()`, computed on first access.
+        """
+        self._pending[name] = build
+
+    def __getattr__(self, name: str) -> Any:
+        # only called when the attribute has not been set yet
+        if name == "_pending":
+            raise AttributeError(name)
+        try:
+            build = self._pending.pop(name)
+        except KeyError:
+            raise AttributeError(
+                f"{self.__class__.__name__!r} object has no attribute {name!r}"
+            ) from None
+        value = build()
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self) -> list[str]:
+        return sorted(set(super().__dir__()) | set(self._pending))
+
+    def materialize(self) -> None:
+        """
+        Build all pending entries.
+        """
+        for name in list(self._pending):
+            getattr(self, name)
+
+    def __str__(self) -> str:
+        self.materialize()
+        return super().__str__()
+
+
+def source_key() -> str:
+    """
+    A key that changes whenever the theorems in `pylogic.theories.numbers`
+    (or the snapshot format) change. Snapshots with another key are stale.
+    """
+    import pylogic.serialize
+    import pylogic.theories
+
+    digest = hashlib.sha256(str(SNAPSHOT_FORMAT).encode())
+    for path in (
+        os.path.join(os.path.dirname(pylogic.theories.__file__), "numbers.py"),
+        pylogic.serialize.__file__,
+    ):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _status(prop: Proposition) -> str | None:
+    if prop.is_axiom:
+        return "axiom"
+    if getattr(prop, "is_todo", False):
+        return "todo"
+    if prop.is_assumption:
+        return "assumption"
+    return None
+
+
+def _set_status(prop: Proposition, status: str | None) -> None:
+    # inverse of _status
+    if status == "axiom":
+        prop._set_is_axiom(True)
+    elif status == "todo":
+        prop.todo(_internal=True)
+    elif status == "assumption":
+        prop._set_is_assumption(True)
+
+
+def _encode_namespace(
+    ns: Namespace,
+    encoder: FormulaEncoder,
+    owner_attrs: dict[int, tuple[str, str]],
+    theorems: list[tuple[int, str | None]],
+    theorem_index: dict[int, int],
+) -> dict[str, tuple]:
+    from pylogic.proposition.proposition import Proposition
+
+    entries: dict[str, tuple] = {}
+    for name, value in vars(ns).items():
+        if isinstance(value, Namespace):
+            entries[name] = (
+                "ns",
+                _encode_namespace(value, encoder, owner_attrs, theorems, theorem_index),
+            )
+        elif id(value) in owner_attrs:
+            # eg Reals.theorems.completeness is Reals.bounded_above_has_lub
+            entries[name] = ("attr", *owner_attrs[id(value)])
+        elif isinstance(value, Proposition):
+            if id(value) not in theorem_index:
+                theorem_index[id(value)] = len(theorems)
+                theorems.append((encoder.encode(value), _status(value)))
+            entries[name] = ("thm", theorem_index[id(value)])
+        else:
+            raise TypeError(f"Cannot snapshot {name} = {value!r}")
+    return entries
+
+
+def build_snapshot() -> dict[str, Any]:
+    """
+    Build a snapshot of the theory library. Imports (and so builds)
+    `pylogic.theories.numbers` if needed.
+
+    Returns a dict made only of builtin types, suitable for `pickle`.
+    """
+    import pylogic.theories.numbers  # noqa: F401
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.serialize import FormulaEncoder, resolve_name
+
+    sets = {name: resolve_name(path) for name, path in theory_sets.items()}
+    owner_attrs: dict[int, tuple[str, str]] = {}
+    for set_name, set_ in sets.items():
+        for attr, value in vars(set_).items():
+            if isinstance(value, Proposition):
+                owner_attrs.setdefault(id(value), (set_name, attr))
+
+    encoder = FormulaEncoder()
+    theorems: list[tuple[int, str | None]] = []
+    theorem_index: dict[int, int] = {}
+    namespaces = {
+        set_name: {
+            attr: _encode_namespace(
+                getattr(set_, attr), encoder, owner_attrs, theorems, theorem_index
+            )
+            for attr in namespace_attrs
+            if isinstance(getattr(set_, attr, None), Namespace)
+        }
+        for set_name, set_ in sets.items()
+    }
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "key": source_key(),
+        "nodes": encoder.nodes,
+        "theorems": theorems,
+        "namespaces": namespaces,
+    }
+
+
+def save_snapshot(path: str, snapshot: dict[str, Any] | None = None) -> None:
+    """
+    Write a snapshot (by default, of the current theory library) to `path`.
+    """
+    if snapshot is None:
+        snapshot = build_snapshot()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    # atomic, so concurrent processes never read a partial file
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> dict[str, Any] | None:
+    """
+    Read a snapshot from `path`. Returns None if the file does not exist
+    or the snapshot is stale.
+    """
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    if (
+        not isinstance(snapshot, dict)
+        or snapshot.get("format") != SNAPSHOT_FORMAT
+        or snapshot.get("key") != source_key()
+    ):
+        return None
+    return snapshot
+
+
+class _TheoremLoader:
+    """
+    Rebuilds the theorems of a snapshot on demand. Each theorem is built at
+    most once, so a theorem shared by several namespaces stays one object.
+    """
+
+    def __init__(self, snapshot: dict[str, Any]) -> None:
+        from pylogic.serialize import FormulaDecoder
+
+        self.theorems: list[tuple[int, str | None]] = snapshot["theorems"]
+        self.decoder: FormulaDecoder = FormulaDecoder(snapshot["nodes"])
+        self._built: dict[int, Proposition] = {}
+
+    def theorem(self, index: int) -> Proposition:
+        prop = self._built.get(index)
+        if prop is not None:
+            return prop
+        node, status = self.theorems[index]
+        prop = self.decoder.decode(node)
+        _set_status(prop, status)
+        self._built[index] = prop
+        return prop
+
+    def thunk(self, entry: tuple, sets: dict[str, Set]) -> Callable[[], Any]:
+        kind = entry[0]
+        if kind == "thm":
+            return lambda: self.theorem(entry[1])
+        if kind == "attr":
+            return lambda: getattr(sets[entry[1]], entry[2])
+        raise ValueError(f"Unknown snapshot entry {entry!r}")
+
+    def fill(
+        self, ns: LazyNamespace, entries: dict[str, tuple], sets: dict[str, Set]
+    ) -> None:
+        for name, entry in entries.items():
+            if name in vars(ns):
+                # entries set while constructing the sets are kept
+                existing = getattr(ns, name)
+                if entry[0] == "ns" and isinstance(existing, LazyNamespace):
+                    self.fill(existing, entry[1], sets)
+                continue
+            if entry[0] == "ns":
+                child = LazyNamespace()
+                self.fill(child, entry[1], sets)
+                setattr(ns, name, child)
+            else:
+                ns.set_lazy(name, self.thunk(entry, sets))
+
+
+def install_snapshot(snapshot: dict[str, Any], lazy: bool = True) -> None:
+    """
+    Attach the theorems of `snapshot` to the theory sets.
+    If `lazy` is False, all theorems are built immediately.
+    """
+    from pylogic.serialize import resolve_name
+
+    loader = _TheoremLoader(snapshot)
+    sets = {name: resolve_name(path) for name, path in theory_sets.items()}
+    for set_name, attrs in snapshot["namespaces"].items():
+        set_ = sets[set_name]
+        for attr, entries in attrs.items():
+            current = getattr(set_, attr, None)
+            ns = LazyNamespace(dict(vars(current)) if current is not None else None)
+            loader.fill(ns, entries, sets)
+            setattr(set_, attr, ns)
+            # subset relations update the sets' knowledge bases when they
+            # are built, so they are not deferred
+            if not lazy or attr == "subset_relations":
+                _materialize(ns)
+
+
+def _materialize(ns: LazyNamespace) -> None:
+    ns.materialize()
+    for value in vars(ns).values():
+        if isinstance(value, LazyNamespace):
+            _materialize(value)
+
+
+def load_theory_library(path: str | None = None) -> bool:
+    """
+    Make the theory library available, using the snapshot at `path`
+    (default: the `PYLOGIC_THEORY_SNAPSHOT` environment variable) if there is
+    a valid one. Otherwise the library is built by importing
+    `pylogic.theories.numbers`, and the snapshot is written to `path` if one
+    was given.
+
+    Returns True if the library was loaded from a snapshot.
+    """
+    path = path or os.environ.get(SNAPSHOT_ENV_VAR)
+    if path:
+        snapshot = load_snapshot(path)
+        if snapshot is not None:
+            install_snapshot(snapshot)
+            return True
+    import pylogic.theories.numbers  # noqa: F401
+
+    if path:
+        try:
+            save_snapshot(path)
+        except OSError:
+            pass
+    return False
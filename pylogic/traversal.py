@@ -0,0 +1,351 @@
+"""
+Non-recursive traversal of formulas.
+
+Propositions and expressions are trees (or DAGs, when subformulas are
+shared). Walking them recursively hits Python's recursion limit on deep
+formulas, like long conjunctions built by `_build_proven` or the nested
+implications made by closing many assumptions contexts.
+
+This module provides
+
+- `children`, `walk` and `postorder`, which visit the subformulas and
+  subterms of a formula with an explicit stack, and
+- `bottom_up`, used by `Proposition` and `Expr` for the methods that
+  recurse into subformulas (`__str__`, `_latex`, `as_text`, `__eq__`,
+  `__hash__`, `replace`, `unify` and `has_as_subproposition`).
+
+`bottom_up` keeps each implementation as it is: a method computes its result
+from the results of the same method on its children. Formulas up to
+`RECURSION_DEPTH` levels deep are evaluated directly. Below that, the
+subformulas are first evaluated in post-order with an explicit stack and
+their results are memoized for the duration of the call, so when the method
+of a parent calls the method of a child, the result is returned without
+recursing. Calls that the memo cannot answer (eg with different arguments,
+or on a new object) are evaluated the same way, so they do not recurse
+either.
+"""
+
+from __future__ import annotations
+
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable, Iterator
+
+_NO_DEFAULT = inspect.Parameter.empty
+
+
+def _children_getter(cls: type) -> Callable[[Any], tuple]:
+    from pylogic.expressions.expr import Expr
+    from pylogic.proposition._junction import _Junction
+    from pylogic.proposition.iff import Iff
+    from pylogic.proposition.implies import Implies
+    from pylogic.proposition.not_ import Not
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.proposition.quantified.quantified import _Quantified
+
+    if issubclass(cls, Not):
+        return lambda obj: (obj.negated,)
+    if issubclass(cls, (Implies, Iff)):
+        return lambda obj: (obj.left, obj.right)
+    if issubclass(cls, _Junction):
+        return lambda obj: tuple(obj.propositions)
+    if issubclass(cls, _Quantified):
+
+        def quantified_children(obj: Any) -> tuple:
+            inner = getattr(obj, obj._innermost_prop_attr)
+            if obj._bin_symb is not None:
+                return (obj.variable, obj.set_, inner)
+            return (obj.variable, inner)
+
+        return quantified_children
+    if issubclass(cls, (Proposition, Expr)):
+        return lambda obj: tuple(obj.args)
+    return lambda obj: ()
+
+
+# class -> function returning the direct subformulas and subterms
+_children_getters: dict[type, Callable[[Any], tuple]] = {}
+
+
+def children(obj: Any) -> tuple:
+    """
+    The direct subformulas and subterms of `obj`: the operands of a
+    connective, the variable, set and inner proposition of a quantifier, and
+    the arguments of a relation or expression.
+    """
+    getter = _children_getters.get(obj.__class__)
+    if getter is None:
+        getter = _children_getters[obj.__class__] = _children_getter(obj.__class__)
+    return getter(obj)
+
+
+def walk(obj: Any) -> Iterator[Any]:
+    """
+    Iterate over `obj` and its subformulas and subterms in pre-order,
+    depth first. Shared subformulas are visited each time they occur.
+    """
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(children(current)))
+
+
+def postorder(obj: Any) -> Iterator[Any]:
+    """
+    Iterate over the distinct subformulas and subterms of `obj` (compared by
+    identity), children before parents.
+    """
+    seen: set[int] = set()
+    # kept alive so that ids are not reused during the walk
+    keep: list[Any] = []
+    stack: list[tuple[Any, bool]] = [(obj, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if expanded:
+            keep.append(current)
+            yield current
+            continue
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        stack.append((current, True))
+        stack.extend((c, False) for c in reversed(children(current)) if id(c) not in seen)
+
+
+# formulas nested deeper than this are evaluated with an explicit stack
+RECURSION_DEPTH = 64
+
+# how each method is evaluated; see bottom_up
+_PAIRED = {"__eq__", "unify"}
+_SYMMETRIC = {"__eq__"}
+_INDENTED = {"as_text"}
+# methods that do not change formulas: their results stay valid until the
+# outermost call of any of them returns
+_READ_ONLY = {
+    "__str__",
+    "_latex",
+    "as_text",
+    "__eq__",
+    "__hash__",
+    "unify",
+    "has_as_subproposition",
+}
+
+
+class _Memo:
+    """
+    Results of one method on the formulas visited during a call.
+    """
+
+    def __init__(self) -> None:
+        # key -> (objects kept alive so that ids are not reused, result, raised)
+        self.entries: dict[tuple, tuple[tuple, Any, bool]] = {}
+        self.in_progress: set[tuple] = set()
+
+
+class _State(threading.local):
+    def __init__(self) -> None:
+        # method name -> memo of the active call
+        self.memos: dict[str, _Memo] = {}
+        # number of active outermost calls of read-only methods
+        self.readers = 0
+        # number of nested calls evaluated directly
+        self.depth = 0
+
+
+_state = _State()
+
+
+def _bind(
+    params: tuple[tuple[str, Any], ...], positional: int, args: tuple, kwargs: dict
+) -> tuple | None:
+    """
+    The arguments of a call in the order of `params`, the first `positional`
+    of which can be given by position, with defaults filled in. None if
+    they cannot be bound.
+    """
+    if len(args) > positional or not kwargs.keys() <= {p for p, _ in params[len(args) :]}:
+        return None
+    values = list(args)
+    for name, default in params[len(args) :]:
+        value = kwargs.get(name, default)
+        if value is _NO_DEFAULT:
+            return None
+        values.append(value)
+    return tuple(values)
+
+
+def _token(value: Any) -> Any:
+    # small immutable arguments are compared by value, others by identity
+    if value is None or value.__class__ in (int, str, bool):
+        return value
+    return (id(value),)
+
+
+def bottom_up(func: Callable, family: str) -> Callable:
+    """
+    Wrap the method `func` of a class of `family` ("proposition" or
+    "expression") so that it is evaluated without recursion. See the
+    module docstring.
+    """
+    name = func.__name__
+    signature = list(inspect.signature(func).parameters.values())
+    if any(p.kind in (p.VAR_POSITIONAL, p.VAR_KEYWORD) for p in signature):
+        return func
+    paired = name in _PAIRED
+    symmetric = name in _SYMMETRIC
+    read_only = name in _READ_ONLY
+    signature = signature[2 if paired else 1 :]
+    params = tuple((p.name, p.default) for p in signature)
+    positional = sum(1 for p in signature if p.kind != p.KEYWORD_ONLY)
+    param_names = tuple(p for p, _ in params)
+    defaults = _bind(params, positional, (), {})
+    indent_index = param_names.index("_indent") if name in _INDENTED else None
+    # class -> whether its method is evaluated by bottom_up with this family
+    in_family: dict[type, bool] = {}
+
+    def same_family(obj: Any) -> bool:
+        cls = obj.__class__
+        result = in_family.get(cls)
+        if result is None:
+            method = getattr(cls, name, None)
+            result = in_family[cls] = (
+                getattr(method, "_bottom_up_family", None) == family
+            )
+        return result
+
+    def subformulas(obj: Any) -> list:
+        return [c for c in children(obj) if same_family(c)]
+
+    def child_pairs(obj: Any, other: Any) -> list[tuple[Any, Any]]:
+        if not paired:
+            return [(c, None) for c in subformulas(obj)]
+        if obj.__class__ is not other.__class__:
+            return []
+        mine, theirs = children(obj), children(other)
+        if len(mine) != len(theirs):
+            return []
+        return [(a, b) for a, b in zip(mine, theirs) if same_family(a) and same_family(b)]
+
+    def key(raw: Callable, obj: Any, other: Any, values: tuple) -> tuple:
+        return (id(raw), id(obj), id(other), *map(_token, values))
+
+    def call(raw: Callable, obj: Any, other: Any, values: tuple) -> Any:
+        kwargs = dict(zip(param_names, values))
+        return raw(obj, other, **kwargs) if paired else raw(obj, **kwargs)
+
+    def compute(
+        memo: _Memo, raw: Callable, obj: Any, other: Any, values: tuple, k: tuple
+    ) -> None:
+        memo.in_progress.add(k)
+        try:
+            result, raised = call(raw, obj, other, values), False
+        except Exception as e:
+            result, raised = e, True
+        finally:
+            memo.in_progress.discard(k)
+        memo.entries[k] = ((raw, obj, other, values), result, raised)
+        if symmetric and isinstance(result, bool) and other.__class__ is obj.__class__:
+            memo.entries[key(raw, other, obj, values)] = (
+                (raw, other, obj, values),
+                result,
+                False,
+            )
+
+    def evaluate(memo: _Memo, obj: Any, other: Any, values: tuple) -> Any:
+        entries = memo.entries
+        root = key(func, obj, other, values)
+        if root in memo.in_progress:
+            # eg the method of a subclass calling super() on the same formula
+            return call(func, obj, other, values)
+        if root not in entries:
+            # post-order: the children of a formula are computed before it
+            stack: list[tuple] = [(func, obj, other, values, None)]
+            while stack:
+                raw, a, b, v, k = stack.pop()
+                if k is not None:
+                    if k not in entries:
+                        compute(memo, raw, a, b, v, k)
+                    continue
+                k = key(raw, a, b, v)
+                if k in entries or k in memo.in_progress:
+                    continue
+                stack.append((raw, a, b, v, k))
+                if indent_index is not None:
+                    # subformulas are indented one more level
+                    v = v[:indent_index] + (v[indent_index] + 1,) + v[indent_index + 1 :]
+                for c, d in reversed(child_pairs(a, b)):
+                    child_raw = getattr(c.__class__, name)._bottom_up_raw
+                    if key(child_raw, c, d, v) not in entries:
+                        stack.append((child_raw, c, d, v, None))
+        _, result, raised = entries[root]
+        if raised:
+            raise result
+        return result
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        state = _state
+        memo = state.memos.get(name) if state.memos else None
+        depth = state.depth
+        if memo is None and depth < RECURSION_DEPTH:
+            # shallow formulas are evaluated directly, which is faster
+            state.depth = depth + 1
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                state.depth = depth
+        other = None
+        rest = args
+        if paired:
+            if not args:
+                return func(self, *args, **kwargs)
+            other, rest = args[0], args[1:]
+        values = _bind(params, positional, rest, kwargs) if rest or kwargs else defaults
+        if values is None:
+            return func(self, *args, **kwargs)
+        if memo is not None:
+            return evaluate(memo, self, other, values)
+        memo = state.memos[name] = _Memo()
+        if read_only:
+            state.readers += 1
+        try:
+            return evaluate(memo, self, other, values)
+        finally:
+            if not read_only:
+                del state.memos[name]
+            else:
+                state.readers -= 1
+                if state.readers == 0:
+                    for method in _READ_ONLY:
+                        state.memos.pop(method, None)
+
+    wrapper._bottom_up_raw = func  # type: ignore
+    wrapper._bottom_up_family = family  # type: ignore
+    return wrapper
+
+
+# the methods that recurse into subformulas
+TRAVERSAL_METHODS = (
+    "__str__",
+    "_latex",
+    "as_text",
+    "__eq__",
+    "__hash__",
+    "replace",
+    "unify",
+    "has_as_subproposition",
+)
+
+
+def wrap_traversal_methods(cls: type, family: str) -> None:
+    """
+    Wrap the traversal methods defined in the body of `cls` with
+    `bottom_up`.
+    """
+    for name in TRAVERSAL_METHODS:
+        method = cls.__dict__.get(name)
+        if inspect.isfunction(method) and not hasattr(method, "_bottom_up_raw"):
+            setattr(cls, name, bottom_up(method, family))
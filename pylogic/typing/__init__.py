@@ -8,13 +8,13 @@ if TYPE_CHECKING:
     from pylogic.structures.sequence import Sequence
     from pylogic.structures.set_ import Set
     from pylogic.symbol import Symbol
+    from pylogic.unification import Unification
     from pylogic.variable import Variable
 
     PythonNumeric = Fraction | int | float | complex | Decimal
     PBasic = Symbol | Sequence | Set
     Unevaluated = Symbol | Sequence | Set | Expr
     Term = Unevaluated
-    Unification = dict[Variable, Term]
 else:
     Term = Any
     PythonNumeric = Any
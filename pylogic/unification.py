@@ -0,0 +1,427 @@
+"""
+Unification of propositions and terms.
+
+`Unifier` solves equations between formulas, `a = b`, for their variables.
+Its substitution is triangular: a variable is bound to a term that may
+contain other bound variables, and bindings are only resolved when the
+result is read. Variables bound to each other are kept in a union-find
+forest, so chains of variable-variable bindings are never followed twice.
+Binding a variable to a term that contains it (`x = f(x)`) fails (occurs
+check).
+
+The variables of quantifiers are rigid: `forall x: A` and `forall y: B`
+unify if `A` and `B` unify with `x` and `y` standing for the same new
+symbol, and a free variable is never bound to a term that contains a bound
+variable.
+
+The result is a `Unification`: an idempotent substitution (no value
+contains a variable that is a key), so `replace` applies it in one pass.
+
+`match` is one-way unification: the variables are only instantiated in
+the pattern, and in the target they are symbols like any other. This is
+how a universal statement is instantiated: `P(x)` matches `P(x + 1)`.
+
+`pylogic.helpers.unify` and the `unify` methods of propositions and
+expressions use a `Unifier`.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+from typing import TYPE_CHECKING, Any, Container, Literal
+
+if TYPE_CHECKING:
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.typing import Term
+    from pylogic.variable import Variable
+
+
+_MISSING = object()
+
+
+class Unification(dict):
+    """
+    A substitution of terms for variables, the result of unification.
+    No variable is mapped to itself, and for `unify`, no value contains a
+    variable that is a key.
+
+    Examples
+    --------
+    >>> unif = unify(prop("P", x, y), prop("P", 1, x))
+    >>> unif
+    {Variable(x, deps=()): Constant(1, deps=()), Variable(y, deps=()): Constant(1, deps=())}
+    >>> unif.apply(prop("Q", y))
+    Proposition(Q, 1)
+    """
+
+    def apply(self, obj: Any) -> Any:
+        """
+        `obj` with the variables of this substitution replaced.
+        """
+        from pylogic.helpers import replace
+
+        if not self:
+            return obj
+        return replace(obj, self)
+
+    def compose(self, other: dict[Variable, Term]) -> Unification:
+        """
+        The substitution that applies `self`, then `other`.
+        """
+        from pylogic.helpers import replace
+
+        result = Unification()
+        for variable, term in self.items():
+            term = replace(term, other) if other else term
+            if term is not variable and not _same_variable(variable, term):
+                result[variable] = term
+        for variable, term in other.items():
+            if variable not in self:
+                result[variable] = term
+        return result
+
+
+def _same_variable(variable: Variable, term: Any) -> bool:
+    from pylogic.variable import Variable
+
+    return isinstance(term, Variable) and term == variable
+
+
+# the variables of the quantifiers around a subformula, innermost last
+Binders = tuple
+
+
+def _binder(binders: Binders, obj: Any) -> int | None:
+    # the depth of the quantifier that binds `obj` (0 for the innermost),
+    # or None if `obj` is not a bound variable
+    if binders and isinstance(obj, _types()[-1]):
+        for depth, variable in enumerate(reversed(binders)):
+            if variable == obj:
+                return depth
+    return None
+
+
+def _mentions(obj: Any, binders: Binders) -> bool:
+    # whether `obj` contains a variable bound by `binders`
+    from pylogic.helpers import get_vars
+
+    return bool(binders) and any(v in binders for v in get_vars(obj))
+
+
+def _push_children(
+    stack: list, a: Any, b: Any, a_binders: Binders, b_binders: Binders
+) -> bool:
+    # push the pairs of children of `a` and `b`, left to right; False if
+    # they cannot be equal
+    a_kind, a_children = _split(a)
+    b_kind, b_children = _split(b)
+    if a_kind is None or a_kind != b_kind:
+        return a_kind is None and b_kind is None and a == b
+    if isinstance(a, _types()[4]):
+        # the quantified variables stand for the same new symbol
+        a_binders = a_binders + (a.variable,)
+        b_binders = b_binders + (b.variable,)
+    stack.extend(
+        (x, y, a_binders, b_binders)
+        for x, y in reversed(list(zip(a_children, b_children)))
+    )
+    return True
+
+
+@cache
+def _types() -> tuple[type, ...]:
+    from pylogic.expressions.expr import CustomExpr, Expr
+    from pylogic.proposition._junction import _Junction
+    from pylogic.proposition.iff import Iff
+    from pylogic.proposition.implies import Implies
+    from pylogic.proposition.proposition import Proposition
+    from pylogic.proposition.quantified.quantified import _Quantified
+    from pylogic.variable import Variable
+
+    return (
+        Proposition,
+        Implies,
+        Iff,
+        _Junction,
+        _Quantified,
+        CustomExpr,
+        Expr,
+        Variable,
+    )
+
+
+def _split(obj: Any) -> tuple[tuple | None, tuple | list]:
+    # formulas with the same kind unify if their children unify;
+    # formulas without a kind (atoms) unify if they are equal
+    Proposition, Implies, Iff, _Junction, _Quantified, CustomExpr, Expr, _ = _types()
+    if isinstance(obj, Proposition):
+        if isinstance(obj, Implies):
+            # includes Not, an implication of a contradiction
+            return ("Implies",), (obj.antecedent, obj.consequent)
+        if isinstance(obj, Iff):
+            return ("Iff",), (obj.left, obj.right)
+        if isinstance(obj, _Junction):
+            return (obj.__class__, len(obj.propositions)), obj.propositions
+        if isinstance(obj, _Quantified):
+            return (obj.__class__,), (obj.inner_proposition,)
+        if obj.is_atomic:
+            return ("Proposition", obj.name, len(obj.args)), obj.args
+        return (obj.__class__,), ()
+    if isinstance(obj, CustomExpr):
+        return (obj.__class__, obj.name, len(obj.args)), obj.args
+    if isinstance(obj, Expr):
+        return (obj.__class__, len(obj.args)), obj.args
+    return None, ()
+
+
+class Unifier:
+    """
+    Solves equations between propositions and terms, see the module
+    docstring.
+
+    Parameters
+    ----------
+    variables: Container[Variable] | None
+        The variables that can be instantiated. By default, all of them.
+        Other variables are compared like symbols, so unifying a pattern
+        with `variables` set to the pattern's variables is matching.
+
+    Examples
+    --------
+    >>> unifier = Unifier()
+    >>> unifier.unify(prop("P", x, y), prop("P", y, 2))
+    True
+    >>> unifier.result()
+    {Variable(x, deps=()): Constant(2, deps=()), Variable(y, deps=()): Constant(2, deps=())}
+    """
+
+    def __init__(self, variables: Container[Variable] | None = None) -> None:
+        self.variables = variables
+        # union-find forest of variables bound to variables
+        self._parent: dict[Variable, Variable] = {}
+        # representative variable -> term, possibly with bound variables
+        self._bindings: dict[Variable, Any] = {}
+        # changes made by the current call to `unify`, undone if it fails
+        self._trail: list[tuple[dict, Any, Any]] | None = None
+
+    def _set(self, mapping: dict, key: Any, value: Any) -> None:
+        if self._trail is not None:
+            self._trail.append((mapping, key, mapping.get(key, _MISSING)))
+        mapping[key] = value
+
+    def _is_variable(self, obj: Any) -> bool:
+        return isinstance(obj, _types()[-1]) and (
+            self.variables is None or obj in self.variables
+        )
+
+    def find(self, variable: Variable) -> Variable:
+        """
+        The representative of the variables bound to `variable`.
+        """
+        parents = self._parent
+        if not parents:
+            return variable
+        root = variable
+        parent = parents.get(root)
+        while parent is not None:
+            root, parent = parent, parents.get(parent)
+        # path compression
+        parent = parents.get(variable)
+        while parent is not None and parent is not root:
+            self._set(parents, variable, root)
+            variable, parent = parent, parents.get(parent)
+        return root
+
+    def walk(self, obj: Any) -> Any:
+        """
+        `obj`, or the term its variable is bound to (not resolved further).
+        """
+        if self._is_variable(obj):
+            root = self.find(obj)
+            return self._bindings.get(root, root) if self._bindings else root
+        return obj
+
+    def occurs(self, variable: Variable, obj: Any) -> bool:
+        """
+        Whether `variable` occurs in `obj` once its bindings are followed.
+        """
+        root = self.find(variable)
+        stack = [obj]
+        while stack:
+            current = self.walk(stack.pop())
+            if self._is_variable(current):
+                if self.find(current) == root:
+                    return True
+                continue
+            stack.extend(_split(current)[1])
+        return False
+
+    def unify(self, a: Proposition | Term, b: Proposition | Term) -> bool:
+        """
+        Extend the substitution so that `a` and `b` become equal.
+        Returns False (and leaves the substitution unchanged) if they cannot.
+        """
+        self._trail = []
+        try:
+            if self._unify(a, b):
+                return True
+            for mapping, key, value in reversed(self._trail):
+                if value is _MISSING:
+                    del mapping[key]
+                else:
+                    mapping[key] = value
+            return False
+        finally:
+            self._trail = None
+
+    def _unify(self, a: Any, b: Any) -> bool:
+        from pylogic.proposition.proposition import Proposition
+
+        stack: list[tuple[Any, Any, Binders, Binders]] = [(a, b, (), ())]
+        while stack:
+            a, b, a_binders, b_binders = stack.pop()
+            a_depth, b_depth = _binder(a_binders, a), _binder(b_binders, b)
+            if a_depth is not None or b_depth is not None:
+                # bound variables only equal the variable of the same binder
+                if a_depth != b_depth:
+                    return False
+                continue
+            # bound terms come from outside the quantifiers
+            walked = self.walk(a)
+            if walked is not a:
+                a, a_binders = walked, ()
+            walked = self.walk(b)
+            if walked is not b:
+                b, b_binders = walked, ()
+            if a is b:
+                continue
+            a_var, b_var = self._is_variable(a), self._is_variable(b)
+            if a_var and b_var:
+                if a != b:
+                    self._set(self._parent, a, b)
+                continue
+            if b_var:
+                a, b, a_var, b_binders = b, a, True, a_binders
+            if a_var:
+                # a variable is never bound to a proposition
+                if (
+                    isinstance(b, Proposition)
+                    or _mentions(b, b_binders)
+                    or self.occurs(a, b)
+                ):
+                    return False
+                self._set(self._bindings, a, b)
+                continue
+            if not _push_children(stack, a, b, a_binders, b_binders):
+                return False
+        return True
+
+    def _variables_in(self, obj: Any) -> list[Variable]:
+        found = []
+        stack = [obj]
+        while stack:
+            current = stack.pop()
+            if self._is_variable(current):
+                found.append(current)
+            else:
+                stack.extend(_split(current)[1])
+        return found
+
+    def resolve(self, obj: Any) -> Any:
+        """
+        `obj` with all the bindings applied.
+        """
+        return self.result().apply(obj)
+
+    def result(self) -> Unification:
+        """
+        The substitution found so far, resolved: an idempotent `Unification`.
+        """
+        from pylogic.helpers import replace
+
+        resolved: dict[Variable, Any] = {}
+
+        def resolve_root(root: Variable) -> Any:
+            if root in resolved:
+                return resolved[root]
+            term = self._bindings.get(root, root)
+            if term is not root:
+                values = {}
+                for variable in self._variables_in(term):
+                    value = resolve_root(self.find(variable))
+                    if not _same_variable(variable, value):
+                        values[variable] = value
+                if values:
+                    term = replace(term, values)
+            resolved[root] = term
+            return term
+
+        result = Unification()
+        for variable in list(self._parent) + list(self._bindings):
+            value = resolve_root(self.find(variable))
+            if not _same_variable(variable, value):
+                result[variable] = value
+        return result
+
+
+def unify(
+    a: Proposition | Term,
+    b: Proposition | Term,
+    variables: Container[Variable] | None = None,
+) -> Unification | Literal[True] | None:
+    """
+    Unify `a` and `b`, instantiating only `variables` (by default, all
+    variables).
+
+    Returns the `Unification` that makes them equal, True if they are equal
+    already, or None if they do not unify.
+    """
+    unifier = Unifier(variables)
+    if not unifier.unify(a, b):
+        return None
+    return unifier.result() or True
+
+
+def match(
+    pattern: Proposition | Term,
+    target: Proposition | Term,
+    variables: Container[Variable],
+) -> Unification | None:
+    """
+    Values for `variables` that make `pattern` equal to `target`, or None.
+
+    Only the occurrences of `variables` in `pattern` are instantiated; in
+    `target` they are symbols, so no occurs check is needed.
+
+    Examples
+    --------
+    >>> match(prop("P", x), prop("P", x + 1), [x])
+    {Variable(x, deps=()): Add(Variable(x, deps=()), Constant(1, deps=()))}
+    """
+    from pylogic.proposition.proposition import Proposition
+
+    values: dict[Variable, Any] = {}
+    stack: list[tuple[Any, Any, Binders, Binders]] = [(pattern, target, (), ())]
+    while stack:
+        a, b, a_binders, b_binders = stack.pop()
+        a_depth, b_depth = _binder(a_binders, a), _binder(b_binders, b)
+        if a_depth is not None or b_depth is not None:
+            if a_depth != b_depth:
+                return None
+            continue
+        if isinstance(a, _types()[-1]) and a in variables:
+            if isinstance(b, Proposition) or _mentions(b, b_binders):
+                return None
+            value = values.get(a, _MISSING)
+            if value is _MISSING:
+                values[a] = b
+            elif value is not b and match(value, b, ()) is None:
+                return None
+            continue
+        if not _push_children(stack, a, b, a_binders, b_binders):
+            return None
+    return Unification(
+        (variable, value)
+        for variable, value in values.items()
+        if not _same_variable(variable, value)
+    )
@@ -42,13 +42,14 @@ class Variable(Symbol):
             import pylogic.assumptions_context as ac
             from pylogic.proposition.quantified.forall import Forall
 
-            if isinstance(ac._target_to_prove, Forall):
+            target = ac._target.get()
+            if isinstance(target, Forall):
                 try:
                     # do a basic version of in_particular since variable does
                     # not have __hash__ yet
                     name = args[0]
-                    if name == ac._target_to_prove.variable.name:
-                        ac._target_to_prove = ac._target_to_prove.inner_proposition
+                    if name == target.variable.name:
+                        ac._target.set(target.inner_proposition)
                 except (AssertionError, TypeError, ValueError):
                     pass
 
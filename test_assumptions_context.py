@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+from pylogic import *
+from pylogic.assumptions_context import current_context, to_prove
+
+
+def test_close_context():
+    P, Q = propositions("P", "Q")
+    pq = P.implies(Q).assume()
+    with AssumptionsContext() as ctx:
+        q = P.assume().modus_ponens(pq)
+        conclude(q)
+    (proven,) = ctx.get_proven()
+    assert proven == P.implies(Q) and proven.is_proven
+    assert current_context() is None
+
+
+def test_each_thread_has_its_own_contexts():
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def worker(n):
+        A = Proposition(f"A{n}")
+        to_prove(A.implies(A))
+        with AssumptionsContext() as ctx:
+            barrier.wait()
+            a = A.assume()
+            barrier.wait()
+            assert current_context() is ctx
+            target = to_prove()
+            conclude(a)
+        results[n] = (ctx.get_proven(), target)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for n in range(2):
+        A = Proposition(f"A{n}")
+        # assuming the antecedent leaves the consequent to prove
+        assert results[n] == ([A.implies(A)], A)
+    assert current_context() is None
+
+
+def test_each_task_has_its_own_contexts():
+    async def task(n):
+        C = Proposition(f"C{n}")
+        with AssumptionsContext() as ctx:
+            c = C.assume()
+            await asyncio.sleep(0.01)
+            assert current_context() is ctx
+            conclude(c)
+        return ctx.get_proven()
+
+    async def main():
+        return await asyncio.gather(*(task(n) for n in range(3)))
+
+    for n, proven in enumerate(asyncio.run(main())):
+        C = Proposition(f"C{n}")
+        assert proven == [C.implies(C)]
+
+
+
+def test_close_large_context():
+    props = [Proposition(f"P{i}") for i in range(2000)]
+    with AssumptionsContext() as ctx:
+        assumed = [p.assume() for p in props]
+        conclude(assumed[0])
+    assert not any(p.is_assumption for p in assumed)
+    (proven,) = ctx.get_proven()
+    assert proven.is_proven
+    assert proven.antecedent == And(*props)
+
+
+def test_close_nested_contexts():
+    P, Q = propositions("P", "Q")
+    with AssumptionsContext() as outer:
+        p = P.assume()
+        with AssumptionsContext() as inner:
+            q = Q.assume()
+            conclude(q)
+            conclude(p)
+        assert inner.assumptions == [q]
+        assert p.is_assumption and not q.is_assumption
+    assert outer.get_first_proven() is not None
@@ -0,0 +1,89 @@
+from pylogic import *
+from pylogic.inference import Inference
+from pylogic.proofs.archive import AXIOM, encode_proof
+from pylogic.proofs.checker import check_proof
+
+
+def test_modus_ponens_is_checked():
+    P, Q = propositions("P", "Q")
+    pq = P.implies(Q).assume()
+    proof = P.assume().modus_ponens(pq)
+    result = check_proof(proof)
+    assert result.ok
+    assert not result.unchecked
+
+
+def test_unchecked_rule_without_premises():
+    P = Proposition(
+        "P",
+        _is_proven=True,
+        _assumptions=set(),
+        _inference=Inference(None, rule="de_morgan"),
+    )
+    result = check_proof(P)
+    assert not result.ok
+    assert "no premises" in result.errors[0]
+
+
+def test_definition_without_premises():
+    P = Proposition(
+        "P",
+        _is_proven=True,
+        _assumptions=set(),
+        _inference=Inference(None, rule="by_definition"),
+    )
+    result = check_proof(P)
+    assert result.ok
+    assert result.unchecked == {"by_definition": 1}
+
+
+def test_assumption_is_not_a_proof():
+    P, Q = propositions("P", "Q")
+    p = P.assume()
+    archive = encode_proof(p)
+    result = check_proof(archive)
+    assert not result.ok
+    assert archive.roots[0] in result.errors
+    # an assumption used as a premise is fine
+    assert check_proof(p.modus_ponens(P.implies(Q).assume())).ok
+
+
+def test_transitive_needs_a_transitive_conclusion():
+    a, b, c = constants("a", "b", "c")
+    A, B = Set("A"), Set("B")
+    ab = Equals(a, b).assume()
+    bc = Equals(b, c).assume()
+    AB = Equals(A, B).assume()
+    assert check_proof(ab.transitive(bc), strict=True).ok
+    for forged, premises in [(IsContainedIn(A, B), [AB]), (LessThan(a, c), [ab, bc])]:
+        forged = forged.__class__(
+            *forged.args,
+            _is_proven=True,
+            _assumptions=set(premises),
+            _inference=Inference(*premises, rule="transitive"),
+        )
+        assert not check_proof(forged, strict=True).ok
+
+
+def test_axioms_are_listed():
+    P, Q = propositions("P", "Q")
+    p = P.assume()
+    p._set_is_axiom(True)
+    archive = encode_proof(p.modus_ponens(P.implies(Q).assume()))
+    result = check_proof(archive, strict=True)
+    assert result.ok
+    axioms = [i for i, step in enumerate(archive.steps) if step[5] & AXIOM]
+    assert result.axioms == axioms and len(axioms) == 1
+
+
+def test_unchecked_rule_with_unproven_premises():
+    P, Q = propositions("P", "Q")
+    forged = Q.__class__(
+        "Q",
+        _is_proven=True,
+        _assumptions=set(),
+        _inference=Inference(P, rule="de_morgan"),
+    )
+    result = check_proof(forged)
+    assert not result.ok
+    assert "none of its premises" in result.errors[len(encode_proof(forged).steps) - 1]
@@ -0,0 +1,52 @@
+from pylogic import *
+from pylogic.session import ProofSession
+from pylogic.structures.set_ import Set
+from pylogic.theories.natural_numbers import Naturals
+
+
+def test_containment_results_are_cached():
+    S = Set(
+        "S",
+        containment_function=lambda x: getattr(x, "value", None) == 1,
+        containment_cache_size=2,
+    )
+    assert S.containment_function(Constant(1))
+    assert S.containment_function(Constant(1))
+    assert not S.containment_function(Constant(2))
+    assert S.containment_cache.hits == 1
+    assert not S.elements
+
+
+def test_proven_memberships_are_bounded():
+    S = Set("S", containment_cache_size=4)
+    n0 = len(Naturals.elements)
+    xs = [Variable(f"x{i}") for i in range(20)]
+    ns = [Variable(f"n{i}") for i in range(20)]
+    for x, n in zip(xs, ns):
+        x.is_in(S).assume()
+        n.is_in(Naturals).assume()
+    assert not S.elements
+    assert len(Naturals.elements) == n0
+    assert len(S.containment_cache) == 4
+    # evicted memberships are still known from the terms
+    assert xs[0].is_in(S).by_inspection().is_proven
+    assert ns[0].is_natural
+
+
+def test_proven_memberships_are_rolled_back():
+    S = Set("S")
+    x = Variable("x")
+    with ProofSession(discard=True):
+        x.is_in(S).assume()
+        assert S.containment_function(x)
+    assert not S.containment_function(x)
+    assert S not in x.sets_contained_in
+
+
+def test_subset_proofs_do_not_grow_elements():
+    B = Set("B", containment_cache_size=4)
+    subsets = [Set(f"A{i}") for i in range(20)]
+    for A in subsets:
+        A.is_subset_of(B).assume()
+    assert not B.elements
+    assert len(B.containment_cache) == 4
@@ -0,0 +1,70 @@
+from pylogic import *
+from pylogic.discrimination_tree import DiscriminationTree, LemmaIndex, term_keys
+from pylogic.proposition.proof_search import proof_search
+
+x, y, z = variables("x", "y", "z")
+a, b = constants("a", "b")
+P, Q, R = predicates("P", "Q", "R")
+
+
+def _tree():
+    tree = DiscriminationTree()
+    for formula, name in [
+        (P(x, a), "Pxa"),
+        (P(a, b), "Pab"),
+        (P(x + 1, y), "P(x+1)y"),
+        (Q(x), "Qx"),
+        (P(x, y), "Pxy"),
+    ]:
+        tree.insert(formula, name)
+    return tree
+
+
+def test_keys_are_preorder():
+    assert len(term_keys(P(x + 1, y))) == 5
+    assert term_keys(P(x, y)) == term_keys(P(y, z))
+
+
+def test_retrieval():
+    tree = _tree()
+    assert sorted(tree.generalizations(P(a, b))) == ["Pab", "Pxy"]
+    assert sorted(tree.generalizations(P(a + 1, a))) == ["P(x+1)y", "Pxa", "Pxy"]
+    assert sorted(tree.instances(P(z, b))) == ["Pab"]
+    assert sorted(tree.unifiable(P(z, b))) == ["P(x+1)y", "Pab", "Pxy"]
+    assert sorted(tree.unifiable(Q(a + b))) == ["Qx"]
+
+
+def test_remove_prunes():
+    tree = _tree()
+    tree.remove(P(a, b), "Pab")
+    assert tree.instances(P(z, b)) == []
+    assert sorted(tree.unifiable(P(z, b))) == ["P(x+1)y", "Pxy"]
+    assert len(tree) == 4
+    try:
+        tree.remove(P(a, b), "Pab")
+    except KeyError:
+        pass
+    else:
+        assert False, "Pab was already removed"
+
+
+def test_lemma_index():
+    lemma = Forall(x, Forall(y, R(x, y).implies(Q(x, y)))).assume()
+    index = LemmaIndex([lemma])
+    assert lemma in index
+    ((found, values, hypothesis),) = index.candidates(Q(a, b))
+    assert found is lemma and hypothesis
+    assert values == {x: a, y: b}
+    assert not list(index.candidates(P(a)))
+
+
+def test_backward_search_uses_lemmas():
+    lemma = Forall(x, Forall(y, R(x, y).implies(Q(x, y)))).assume()
+    rab = R(a, b).assume()
+    assert proof_search([lemma, rab], Q(a, b)).is_proven
+    try:
+        proof_search([lemma, rab], Q(b, a))
+    except ValueError:
+        pass
+    else:
+        assert False, "Q(b, a) does not follow"
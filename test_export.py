@@ -0,0 +1,74 @@
+import io
+
+from pylogic import *
+from pylogic.export import (
+    SMTLIBExporter,
+    TPTPExporter,
+    _Exporter,
+    export_lines,
+    write_problem,
+)
+
+x = Variable("x", real=True)
+c = Constant(2)
+S = Set("S")
+P = predicate("P")
+f = ForallInSet(x, S, LessThan(x, c))
+
+
+def test_tptp_formula():
+    assert (
+        TPTPExporter().formula(f)
+        == "(! [X0_x] : (in(X0_x, 'S') => less(X0_x, \"2\")))"
+    )
+
+
+def test_smtlib_declares_each_symbol_once():
+    e = SMTLIBExporter()
+    assert e.formula(f) == (
+        "(forall ((|x!0| U)) (=> (|in| |x!0| |S|) (|less| |x!0| |2|)))"
+    )
+    assert list(e.declarations()) == [
+        "(declare-fun |in| (U U) Bool)",
+        "(declare-fun |S| () U)",
+        "(declare-fun |less| (U U) Bool)",
+        "(declare-fun |2| () U)",
+    ]
+    e.formula(f)
+    assert list(e.declarations()) == []
+
+
+def test_write_problem():
+    buf = io.StringIO()
+    assert write_problem(buf, [f, P(c)], P(c), "smtlib") == 12
+    lines = buf.getvalue().splitlines()
+    assert lines[-2] == "(assert (! (not (|P| |2|)) :named goal))"
+    assert lines.count("(declare-fun |P| (U) Bool)") == 1
+    buf = io.StringIO()
+    assert write_problem(buf, [f], P(c)) == 3
+    assert buf.getvalue().splitlines()[-1] == "fof(goal, conjecture, 'P'(\"2\"))."
+    try:
+        export_lines([f], None, "cnf")
+    except ValueError:
+        pass
+    else:
+        assert False, "cnf is not a supported format"
+
+
+def test_numbers_are_distinct():
+    buf = io.StringIO()
+    write_problem(buf, [P(Constant(1)), P(c)], None, "smtlib")
+    assert buf.getvalue().splitlines()[-2] == "(assert (distinct |1| |2|))"
+
+
+def test_exporters_must_define_the_syntax():
+    class Partial(_Exporter):
+        def number(self, value):
+            return str(value)
+
+    try:
+        Partial()
+    except TypeError:
+        pass
+    else:
+        assert False, "Partial does not define the syntax"
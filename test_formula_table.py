@@ -0,0 +1,57 @@
+from multiprocessing import get_context
+
+from pylogic import *
+from pylogic.formula_table import (
+    FormulaTable,
+    SharedFormulaTable,
+    init_worker,
+    pack_formulas,
+    worker_table,
+)
+
+
+def _formulas():
+    x = Variable("x")
+    P, Q = predicates("P", "Q")
+    return [
+        Forall(x, P(x).implies(Q(x + 1))),
+        P(1).and_(Q(2)),
+        ForallInSet(x, Naturals, P(x)),
+    ]
+
+
+def _worker_formula(index):
+    return str(worker_table()[index])
+
+
+def test_round_trip():
+    formulas = _formulas()
+    with FormulaTable(pack_formulas(formulas)) as table:
+        assert list(table) == formulas
+        root = table.roots[0]
+        assert isinstance(table.children(root), tuple)
+        assert table.node(root)[0] == table.kind(root)
+
+
+def test_close_after_reading_children():
+    table = SharedFormulaTable.create(_formulas())
+    name = table.name
+    children = table.children(table.roots[0])
+    table.close()
+    assert len(children) > 0
+    try:
+        SharedFormulaTable.attach(name)
+    except FileNotFoundError:
+        pass
+    else:
+        assert False, "the shared memory was not unlinked"
+
+
+def test_workers():
+    formulas = _formulas()
+    with SharedFormulaTable.create(formulas) as table:
+        ctx = get_context("spawn")
+        with ctx.Pool(2, initializer=init_worker, initargs=(table.name,)) as pool:
+            assert pool.map(_worker_formula, range(len(formulas))) == list(
+                map(str, formulas)
+            )
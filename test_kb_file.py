@@ -0,0 +1,57 @@
+import os
+import tempfile
+
+from pylogic import *
+from pylogic.theories.kb_file import KnowledgeBaseFile, head_symbol
+
+
+def _theorems():
+    x = Variable("x")
+    P = lambda t: Proposition("P", args=[t])
+    Q = lambda t: Proposition("Q", args=[t])
+    return [
+        ("lemmas.p_all", Forall(x, P(x)).assume()),
+        ("lemmas.q_from_p", Forall(x, P(x).implies(Q(x))).assume()),
+        ("axioms.nat", Constant(1).is_in(Naturals).assume()),
+        ("todo.q", Q(Constant(2)).todo()),
+    ]
+
+
+def test_round_trip():
+    theorems = _theorems()
+    with tempfile.TemporaryDirectory() as path:
+        path = os.path.join(path, "lib.plkb")
+        KnowledgeBaseFile.write(path, theorems)
+        with KnowledgeBaseFile(path) as kb:
+            assert len(kb) == 4 and kb.materialized == 0
+            assert list(kb.names()) == sorted(name for name, _ in theorems)
+            for name, prop in theorems:
+                assert kb[name] == prop
+                assert kb.head(kb.index(name)) == head_symbol(prop)
+            assert kb["todo.q"].is_todo
+            assert kb.status(kb.index("lemmas.p_all")) == "assumption"
+            assert "nope" not in kb
+
+
+def test_lookup_by_head_symbol():
+    with tempfile.TemporaryDirectory() as path:
+        path = os.path.join(path, "lib.plkb")
+        KnowledgeBaseFile.write(path, _theorems())
+        with KnowledgeBaseFile(path) as kb:
+            assert kb.heads() == ["IsContainedIn", "P", "Q"]
+            assert len(kb.with_head("Q")) == 2
+            # only the theorems with that head are decoded
+            assert kb.materialized == 2
+            assert kb.indices_with_head("R") == []
+
+
+def test_rejects_other_files():
+    with tempfile.NamedTemporaryFile(suffix=".plkb") as f:
+        f.write(b"not a knowledge base")
+        f.flush()
+        try:
+            KnowledgeBaseFile(f.name)
+        except ValueError:
+            pass
+        else:
+            assert False, "expected ValueError"
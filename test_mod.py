@@ -0,0 +1,35 @@
+from pylogic import *
+from pylogic.expressions.gcd import Gcd
+from pylogic.expressions.mod import Mod
+
+x, y = variables("x", "y", integer=True)
+n, m = variables("n", "m", natural=True, positive=True)
+
+
+def test_numbers():
+    assert Mod(Constant(17), Constant(5)).evaluate() == 2
+    assert Mod(Constant(-7), Constant(5)).evaluate() == 3
+    assert Gcd(Constant(12), Constant(18)).evaluate() == 6
+
+
+def test_multiples_of_the_modulus_are_dropped():
+    assert Mod(x * 5 + 3, Constant(5)).evaluate() == 3
+    assert Mod(2 * x + 7, Constant(2)).evaluate() == 1
+    assert Mod(n**3 + x, n).evaluate() == Mod(x, n)
+    assert Mod(Mod(x + 7, Constant(5)) + 3, Constant(5)).evaluate() == Mod(x, 5)
+    assert Mod(n * m * 2, n * m).evaluate() == 0
+
+
+def test_unknown_remainders_are_kept():
+    assert Mod(x, Constant(5)).evaluate() == Mod(x, 5)
+    assert Mod(n**2, m).evaluate() == Mod(n**2, m)
+    assert Gcd(Constant(6), x).evaluate() == Gcd(6, x)
+
+
+def test_results_follow_the_knowledge_base():
+    k, p = variables("k", "p", natural=True, positive=True)
+    assert Mod(k, p).evaluate() == Mod(k, p)
+    with AssumptionsContext():
+        LessThan(k, p).assume()
+        assert Mod(k, p).evaluate() == k
+    assert Mod(k, p).evaluate() == Mod(k, p)
@@ -0,0 +1,27 @@
+from pylogic.number_theory import SIEVE_LIMIT, divides, divisors, factorize, is_prime
+
+
+def test_is_prime():
+    from sympy import isprime
+
+    assert all(is_prime(n) == isprime(n) for n in range(-5, 2 * SIEVE_LIMIT, 7))
+    assert is_prime(SIEVE_LIMIT + 1)  # 65537
+    assert is_prime(2**61 - 1)
+    assert not is_prime((2**31 - 1) * (2**61 - 1))
+    # strong pseudoprime to the bases 2, 3, 5 and 7
+    assert not is_prime(3215031751)
+
+
+def test_divides():
+    assert divides(3, 12)
+    assert not divides(5, 12)
+    assert divides(0, 0)
+    assert not divides(0, 4)
+
+
+def test_factorize():
+    from sympy import factorint
+
+    for n in [1, 2, 12, -360, 65537 * 65539, (2**31 - 1) * (2**61 - 1), 2**64 - 1]:
+        assert factorize(n) == factorint(n)
+    assert divisors(12) == [1, 2, 3, 4, 6, 12]
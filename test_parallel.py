@@ -0,0 +1,47 @@
+from pylogic import *
+from pylogic.proofs.archive import ProofArchive, encode_proof
+from pylogic.proofs.checker import check_proof
+from pylogic.proofs.parallel import check_archive_parallel, partition
+
+
+def _chain(n):
+    ps = propositions(*[f"P{i}" for i in range(n + 1)])
+    proof = ps[0].assume()
+    for i in range(n):
+        proof = proof.modus_ponens(ps[i].implies(ps[i + 1]).assume())
+    return encode_proof(proof)
+
+
+def _same(a, b):
+    return (a.errors, a.invalid, a.unchecked, sorted(a.todo), a.assumptions) == (
+        b.errors,
+        b.invalid,
+        b.unchecked,
+        sorted(b.todo),
+        b.assumptions,
+    )
+
+
+def test_partition_covers_every_step():
+    archive = _chain(50)
+    chunks = partition(archive, 16)
+    steps = sorted(step for chunk in chunks for step in chunk)
+    assert steps == list(range(len(archive.steps)))
+
+
+def test_parallel_check_agrees_with_check_proof():
+    archive = _chain(300)
+    result = check_archive_parallel(archive, processes=2, chunk_size=100)
+    assert result.ok
+    assert _same(result, check_proof(archive))
+
+
+def test_parallel_check_finds_errors():
+    archive = _chain(300)
+    steps = list(archive.steps)
+    i = next(k for k, step in enumerate(steps) if step[1] == "modus_ponens")
+    steps[i] = (steps[0][0],) + steps[i][1:]
+    bad = ProofArchive(archive.nodes, steps, archive.contexts, archive.roots)
+    result = check_archive_parallel(bad, processes=2, chunk_size=100)
+    assert not result.ok and i in result.errors
+    assert _same(result, check_proof(bad))
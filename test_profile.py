@@ -0,0 +1,27 @@
+import threading
+
+from pylogic import *
+from pylogic.proofs.profile import record_timings
+
+
+def _modus_ponens():
+    P, Q = propositions("P", "Q")
+    return P.assume().modus_ponens(P.implies(Q).assume())
+
+
+def test_timings_are_recorded_in_the_block():
+    with record_timings():
+        timed = _modus_ponens()
+    assert timed.deduced_from.duration is not None
+    assert _modus_ponens().deduced_from.duration is None
+
+
+def test_timings_stay_in_their_thread():
+    untimed = []
+    with record_timings():
+        thread = threading.Thread(target=lambda: untimed.append(_modus_ponens()))
+        thread.start()
+        thread.join()
+        timed = _modus_ponens()
+    assert untimed[0].deduced_from.duration is None
+    assert timed.deduced_from.duration is not None
@@ -0,0 +1,49 @@
+from pylogic import *
+from pylogic.assumptions_context import AssumptionsContext, conclude
+from pylogic.proofs.archive import ProofArchive, decode_proof, encode_proof
+from pylogic.proofs.checker import check_proof
+from pylogic.proofs.dedup import dedupe_archive
+from pylogic.proofs.minimize import minimize_archive
+from pylogic.serialize import dumps_data
+
+
+def _two_conclusions():
+    P, Q, R = propositions("P", "Q", "R")
+    pq = P.implies(Q).assume()
+    qr = Q.implies(R).assume()
+    with AssumptionsContext() as ctx:
+        p = P.assume()
+        q = p.modus_ponens(pq)
+        conclude(q)
+        conclude(q.modus_ponens(qr))
+    first, second = ctx.get_proven()
+    return first.and_(second)
+
+
+def test_round_trip():
+    proof = _two_conclusions()
+    archive = encode_proof(proof)
+    assert ProofArchive.loads(archive.dumps()) == archive
+    (decoded,) = decode_proof(archive)
+    assert decoded == proof
+    assert decoded.is_proven
+    assert encode_proof(decoded) == archive
+
+
+def test_dedup_and_minimize_keep_context_conclusions():
+    archive = encode_proof(_two_conclusions())
+    for result, _ in (dedupe_archive(archive), minimize_archive(archive)):
+        assert result.contexts[0][3] == archive.contexts[0][3]
+        assert check_proof(result).ok
+
+
+def test_loads_rejects_names_outside_pylogic():
+    data = encode_proof(_two_conclusions()).to_dict()
+    for node in (("name", "os:system"), ("expr", "builtins:eval", (), ())):
+        forged = dict(data, nodes=data["nodes"] + [node])
+        try:
+            ProofArchive.loads(dumps_data(forged))
+        except ValueError:
+            pass
+        else:
+            assert False, f"{node!r} was loaded"
@@ -0,0 +1,35 @@
+import tempfile
+
+from pylogic import *
+from pylogic.assumptions_context import AssumptionsContext
+from pylogic.proofs.cache import ProofCache, cached_proof
+
+
+def _kb():
+    P, Q, R = propositions("P", "Q", "R")
+    return [P.assume(), P.implies(Q).assume(), Q.implies(R).assume()], R
+
+
+def test_explicit_empty_cache_is_used():
+    with tempfile.TemporaryDirectory() as path:
+        cache = ProofCache(path)
+        assert len(cache) == 0
+        kb, target = _kb()
+        proof = cached_proof(target, kb, cache)
+        assert proof.is_proven
+        assert len(cache) == 1
+        assert cache.misses == 1
+
+
+def test_cache_hit_is_registered_in_context():
+    with tempfile.TemporaryDirectory() as path:
+        cache = ProofCache(path)
+        for run in range(2):
+            kb, target = _kb()
+            with AssumptionsContext() as ctx:
+                cached_proof(target, kb, cache)
+            first = ctx.get_first_proven()
+            assert first is not None, run
+            assert first.is_proven
+            assert first == target
+        assert cache.hits == 1
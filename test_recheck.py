@@ -0,0 +1,59 @@
+import os
+import tempfile
+
+from pylogic import *
+from pylogic.assumptions_context import AssumptionsContext
+from pylogic.proofs.archive import decode_proof, encode_proof
+from pylogic.proofs.cache import ProofCache
+from pylogic.proofs.checker import check_proof
+from pylogic.recheck import recheck
+
+SCRIPT = """
+from pylogic import *
+from pylogic.assumptions_context import AssumptionsContext
+
+P, Q, R = propositions("P", "Q", "R")
+pq = P.implies(Q).assume()
+qr = Q.implies(R).assume()
+with AssumptionsContext() as ctx:
+    p = P.assume()
+    r = p.modus_ponens(pq).modus_ponens(qr)
+pr = ctx.get_first_proven()
+"""
+
+
+def _context_proof():
+    P, Q, R = propositions("P", "Q", "R")
+    pq = P.implies(Q).assume()
+    qr = Q.implies(R).assume()
+    with AssumptionsContext() as ctx:
+        p = P.assume()
+        p.modus_ponens(pq).modus_ponens(qr)
+    return ctx.get_first_proven()
+
+
+def test_decoded_context_proven_propositions_are_steps():
+    pr = _context_proof()
+    (decoded,) = decode_proof(encode_proof(pr))
+    (ctx,) = decoded.deduced_from.inner_contexts
+    assert ctx.get_first_proven() is decoded
+    assert decoded.is_proven
+    assert check_proof(decoded).ok
+
+
+def test_restored_context_keeps_its_proof():
+    with tempfile.TemporaryDirectory() as path:
+        script = os.path.join(path, "script.py")
+        with open(script, "w") as f:
+            f.write(SCRIPT)
+        cache = ProofCache(os.path.join(path, "cache"))
+        assert len(cache) == 0
+        recheck(script, cache)
+        assert len(cache) == 1
+        report = recheck(script, cache)
+        assert len(report.restored) > 0
+        ctx = report.namespace["ctx"]
+        first = ctx.get_first_proven()
+        assert first.is_proven
+        assert first is report.namespace["pr"]
+        assert check_proof(first).ok
@@ -0,0 +1,23 @@
+from pylogic import *
+from pylogic.structures.sequence import Sequence, TermCache
+
+
+def test_recursive_sequence():
+    a = Sequence(
+        "a",
+        [0, 1],
+        nth_term=lambda n: a[n - 1] + a[n - 2],
+        recursive=True,
+        integer=True,
+    )
+    assert a[30].evaluate() == 832040
+    assert a.terms_range(8, 11) == [21, 34, 55]
+
+
+def test_term_cache_is_bounded():
+    cache = TermCache(prefix_size=4, max_size=2)
+    for i in (0, 1, 2, 3, 4, 10, 11, 12):
+        cache[i] = i
+    assert cache.prefix == [0, 1, 2, 3]
+    assert 4 not in cache and 10 not in cache
+    assert 11 in cache and 12 in cache
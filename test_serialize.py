@@ -0,0 +1,62 @@
+import pickle
+
+from pylogic import *
+from pylogic.constant import Constant
+from pylogic.serialize import FormulaDecoder
+from pylogic.structures.sequence import Sequence
+
+
+def _round_trip(obj):
+    return pickle.loads(pickle.dumps(obj))
+
+
+def test_number_sets_are_pickled_by_name():
+    assert _round_trip(Naturals) is Naturals
+    assert _round_trip(Reals) is Reals
+
+
+def test_sequence_with_lambda():
+    a = Sequence("a", nth_term=lambda n: 2 * n + 1)
+    b = _round_trip(a)
+    assert b == a
+    assert b.term(3) == a.term(3)
+    # pickled again after decoding
+    assert _round_trip(b).term(4) == a.term(4)
+
+
+def test_set_with_lambda_predicate():
+    S = Set("S", predicate=lambda t: t.is_in(Naturals).and_(GreaterThan(t, 2)))
+    x = Variable("x")
+    formula = ForallInSet(x, S, LessThan(x, 100))
+    assert _round_trip(formula) == formula
+    assert _round_trip(S).predicate(Constant(5)) == S.predicate(Constant(5))
+
+
+def test_opaque_functions_are_not_pickled():
+    T = Set("T", containment_function=lambda t: t == 3)
+    c = Sequence(
+        "c", nth_term=lambda n: c[n - 1] + c[n - 2], initial_terms=[1, 1], recursive=True
+    )
+    for obj in (T, c):
+        try:
+            pickle.dumps(obj)
+        except pickle.PicklingError:
+            pass
+        else:
+            assert False, f"{obj!r} was pickled"
+
+
+def test_decoder_only_resolves_pylogic_names():
+    for node in (
+        ("name", "os:system"),
+        ("name", "pylogic.variable:Variable"),
+        ("expr", "builtins:eval", (), ()),
+        ("sym", "pylogic.expressions.expr:Expr", "x", (), (), ()),
+        ("var", "pylogic.variable:Variable", "x", (), (("__class__", 1),), ()),
+    ):
+        try:
+            FormulaDecoder([node]).decode(0)
+        except ValueError:
+            pass
+        else:
+            assert False, f"{node!r} was decoded"
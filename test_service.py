@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from pylogic import *
+from pylogic.proofs.service import (
+    ProverPool,
+    check_async,
+    handle_request,
+    prove_async,
+    prove_request,
+)
+
+
+def _kb():
+    B, C, F, G = propositions("B", "C", "F", "G")
+    kb = [C.implies(G).assume(), B.implies(F).assume(), B.or_(C).assume()]
+    return kb, F.or_(C)
+
+
+def test_prove_and_check_in_a_thread():
+    async def main():
+        kb, target = _kb()
+        proof = await prove_async(kb, target)
+        return proof, await check_async(proof)
+
+    proof, result = asyncio.run(main())
+    assert proof.is_proven and result.ok
+
+
+def test_requests_on_a_pool():
+    async def main():
+        async with ProverPool(processes=1) as pool:
+            kb, target = _kb()
+            request = json.loads(json.dumps(prove_request(kb, target, id=7)))
+            proved = await handle_request(pool, request)
+            checked = await handle_request(
+                pool, {"id": 8, "op": "check", "proof": proved["proof"]}
+            )
+            bad = dict(request, nodes=request["nodes"] + [["name", "os:system"]])
+            rejected = await handle_request(pool, bad)
+            unknown = await handle_request(pool, {"id": 9, "op": "nope"})
+            return proved, checked, rejected, unknown
+
+    proved, checked, rejected, unknown = asyncio.run(main())
+    assert proved["id"] == 7 and proved["ok"]
+    assert checked["ok"] and checked["valid"] and checked["axioms"] == []
+    # the proof rests on some of the premises
+    ((root, assumptions),) = checked["assumptions"].items()
+    assert 0 < len(assumptions) <= 3
+    assert not rejected["ok"] and rejected["type"] == "ValueError"
+    assert not unknown["ok"] and unknown["id"] == 9
@@ -0,0 +1,80 @@
+from pylogic import *
+from pylogic.assumptions_context import current_context
+from pylogic.expressions.mod import Mod, _mod_cache
+from pylogic.session import ProofSession
+from pylogic.structures.grouplike.magma import Magma
+from pylogic.theories.natural_numbers import Naturals
+
+
+def test_discarded_session_undoes_a_membership():
+    x = Variable("x")
+    knowledge_base = set(x.knowledge_base)
+    membership = x.is_in(Naturals)
+    with ProofSession(discard=True) as session:
+        membership.assume()
+        assert x.is_natural and session.changes > 0
+    assert not membership.is_assumption
+    assert x.is_natural is None
+    assert x.knowledge_base == knowledge_base
+    assert Naturals not in x.sets_contained_in
+    assert x not in Naturals.containment_cache
+
+
+def test_rollback_to_snapshot_restores_contexts():
+    P, Q = propositions("P", "Q")
+    with ProofSession() as session:
+        with AssumptionsContext() as ctx:
+            p = P.assume()
+            snapshot = session.snapshot()
+            q = Q.assume()
+            assert session.rollback(snapshot) > 0
+            assert ctx.assumptions == [p]
+            assert not q.is_assumption
+            assert p.is_assumption
+        session.rollback()
+        assert not p.is_assumption
+        assert current_context() is None
+
+
+def test_nested_session_changes_go_to_the_outer_one():
+    with ProofSession() as outer:
+        with ProofSession() as inner:
+            r = Proposition("R").assume()
+        assert inner.changes == 0 and outer.changes > 0
+        outer.rollback()
+    assert not r.is_assumption
+
+
+def test_rollback_undoes_a_magma_operation():
+    M = Magma("M", operation=lambda a, b: a + b)
+    a, b = variables("a", "b")
+    members = list(M.containment_cache)
+    with ProofSession(discard=True):
+        r = M.op(a, b)
+        assert M.containment_function(r)
+    assert not r.knowledge_base
+    assert not M.elements and list(M.containment_cache) == members
+
+
+def test_rollback_undoes_an_exists_witness():
+    x = Variable("x")
+    S = Set("S")
+    P = predicate("P")
+    exists = Exists(x, x.is_in(S).and_(P(x))).assume()
+    with ProofSession(discard=True):
+        c, inner = exists.extract()
+        assert S.containment_function(c) and len(c.knowledge_base) == 2
+    assert not c.knowledge_base
+    assert not inner.is_proven
+    assert not S.containment_function(c)
+
+
+def test_rollback_forgets_cached_terms():
+    s = Sequence("s", nth_term=lambda n: n * 2, integer=True)
+    k, p = variables("k", "p", natural=True, positive=True)
+    cached = len(_mod_cache)
+    with ProofSession(discard=True):
+        s.term(5)
+        Mod(k * p + 3, p).evaluate()
+        assert 5 in s.terms and len(_mod_cache) == cached + 1
+    assert 5 not in s.terms and len(_mod_cache) == cached
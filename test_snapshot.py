@@ -0,0 +1,48 @@
+import os
+import pickle
+import tempfile
+
+from pylogic import *
+from pylogic.theories.snapshot import (
+    LazyNamespace,
+    _TheoremLoader,
+    build_snapshot,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+def test_theorems_round_trip():
+    snapshot = build_snapshot()
+    loader = _TheoremLoader(snapshot)
+    entries = snapshot["namespaces"]["Naturals"]["theorems"]
+    ns = LazyNamespace()
+    loader.fill(ns, entries, {})
+    ns.materialize()
+    prime = Naturals.theorems.prime_theorems
+    rebuilt = ns.prime_theorems
+    assert isinstance(rebuilt, LazyNamespace)
+    for name, value in vars(prime).items():
+        assert getattr(rebuilt, name) == value
+        assert getattr(rebuilt, name).is_axiom == value.is_axiom
+
+
+def test_stale_snapshots_are_ignored():
+    with tempfile.TemporaryDirectory() as path:
+        path = os.path.join(path, "theories.pkl")
+        assert load_snapshot(path) is None
+        snapshot = build_snapshot()
+        save_snapshot(path, snapshot)
+        assert load_snapshot(path)["key"] == snapshot["key"]
+        with open(path, "wb") as f:
+            pickle.dump({**snapshot, "key": "old"}, f)
+        assert load_snapshot(path) is None
+
+
+def test_lazy_namespace():
+    built = []
+    ns = LazyNamespace(a=1)
+    ns.set_lazy("b", lambda: built.append("b") or 2)
+    assert "b" in dir(ns) and not built
+    assert ns.b == 2 and ns.b == 2
+    assert built == ["b"]
@@ -0,0 +1,21 @@
+from pylogic import *
+from pylogic.expressions.prod import Prod
+from pylogic.expressions.sum import Sum
+from pylogic.structures.sequence import FiniteSequence
+
+
+def test_closed_form_and_folding():
+    squares = FiniteSequence("s", length=10, nth_term=lambda n: n**2, real=True)
+    assert Sum(squares).evaluate() == 285
+    inverses = FiniteSequence(
+        "t", length=3, nth_term=lambda n: (n + 1) ** -2, real=True
+    )
+    assert Sum(inverses).evaluate() == Rational(49, 36)
+    assert Prod(inverses).evaluate() == Rational(1, 36)
+
+
+def test_undefined_term_is_not_evaluated():
+    # the term at n = 1 is 0**-2
+    s = FiniteSequence("s", length=3, nth_term=lambda n: (n - 1) ** -2, real=True)
+    assert isinstance(Sum(s).evaluate(), Sum)
+    assert isinstance(Prod(s).evaluate(), Prod)
@@ -0,0 +1,38 @@
+from pylogic import *
+from pylogic.traversal import postorder, walk
+
+
+def _deep(n):
+    ps = [Proposition(f"P{i}") for i in range(n + 1)]
+    f = ps[n]
+    for i in range(n - 1, -1, -1):
+        f = Implies(ps[i], f) if i % 2 else And(ps[i], f)
+    return ps, f
+
+
+def test_walk_and_postorder():
+    P, Q, R = propositions("P", "Q", "R")
+    f = P.and_(Q.implies(R))
+    assert list(walk(f))[0] is f
+    assert list(postorder(f))[-1] is f
+    assert len(list(walk(f))) == len(list(postorder(f))) == 5
+
+
+def test_deep_formulas_do_not_recurse():
+    ps, f = _deep(5000)
+    g = f.copy()
+    assert str(f).count("P") == 5001
+    assert hash(f) == hash(g) and f == g
+    assert f.has_as_subproposition(ps[-1])
+    assert f._latex()
+
+
+def test_deep_replace():
+    x, y = variables("x", "y")
+    A = predicate("A")
+    f = A(x)
+    for i in range(3000):
+        f = And(A(x), f) if i % 2 else Implies(A(y), f)
+    g = f.replace({x: y})
+    assert not g.has_as_subproposition(A(x))
+    assert g.has_as_subproposition(A(y))
@@ -0,0 +1,56 @@
+from pylogic import *
+from pylogic.infix.by import by_forall
+from pylogic.proposition.proof_search import proof_search
+from pylogic.unification import Unification, match, unify
+
+x, y, z = variables("x", "y", "z")
+P, Q = predicates("P", "Q")
+
+
+def test_unify():
+    assert unify(P(x, y), P(1, x)) == {x: 1, y: 1}
+    assert unify(P(x, x), P(1, 2)) is None
+    assert unify(P(x), P(x)) is True
+    # occurs check
+    assert unify(P(x), P(x + 1)) is None
+
+
+def test_compose():
+    assert Unification({x: y}).compose({y: 5}) == {x: 5, y: 5}
+
+
+def test_match_variables_in_target_are_symbols():
+    assert match(P(x), P(x + 1), [x]) == {x: x + 1}
+    assert match(P(x, x), P(1, 2), [x]) is None
+    assert match(P(x), P(x), [x]) == {}
+    assert match(P(1), P(x), [y]) is None
+
+
+def test_instantiate_forall_with_its_own_variable():
+    all_p = Forall(x, P(x)).assume()
+    assert by_forall(P(x + 1), all_p).is_proven
+    assert P(x + 1).is_special_case_of(all_p).is_proven
+    lemma = Forall(x, P(x).implies(Q(x))).assume()
+    assert proof_search([lemma, P(x + 1).assume()], Q(x + 1)).is_proven
+    assert proof_search([lemma, P(x).assume()], Q(x)).is_proven
+
+
+def test_only_quantified_variables_are_instantiated():
+    all_p1 = Forall(y, P(1)).assume()
+    try:
+        by_forall(P(x), all_p1)
+    except ValueError:
+        pass
+    else:
+        assert False, "P(x) does not follow from forall y: P(1)"
+
+
+def test_bound_variables_are_rigid():
+    assert unify(Forall(x, P(x)), Forall(y, P(y))) is True
+    assert unify(Forall(x, P(x)), Forall(y, P(1))) is None
+    assert unify(Forall(x, P(x, z)), Forall(y, P(y, 2))) == {z: 2}
+    # z would capture the bound y
+    assert unify(Forall(x, P(x, z)), Forall(y, P(y, y))) is None
+    assert unify(Forall(x, Forall(y, P(x, y))), Forall(y, Forall(x, P(y, x)))) is True
+    assert unify(Forall(x, Forall(y, P(x, y))), Forall(y, Forall(x, P(x, y)))) is None
+    assert match(Forall(y, P(x, y)), Forall(z, P(z, z)), [x]) is None